@@ -9,5 +9,10 @@ A production-ready automation service that replaces n8n for:
 - Slack/Discord notifications
 """
 
+import time
+
+# Start of the boot clock for the startup report (app/utils/startup.py)
+IMPORT_STARTED = time.perf_counter()
+
 __version__ = "1.0.0"
 __author__ = "Are You Human?"
@@ -2,5 +2,8 @@
 
 from .webhooks import router as webhooks_router
 from .health import router as health_router
+from .jobs import router as jobs_router
+from .metrics import router as metrics_router
+from .admin import router as admin_router
 
-__all__ = ["webhooks_router", "health_router"]
+__all__ = ["webhooks_router", "health_router", "jobs_router", "metrics_router", "admin_router"]
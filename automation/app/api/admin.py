@@ -0,0 +1,73 @@
+"""Operator endpoints, authenticated with ADMIN_TOKEN."""
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+
+from ..config import settings
+from ..utils.profiler import ProfilerBusy, loop_profiler
+from ..utils.security import verify_bearer_token
+
+
+async def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Reject requests without the admin bearer token; hide the routes if none is set."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not verify_bearer_token(authorization, settings.admin_token):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    include_in_schema=False,
+)
+
+
+@router.get("/profile")
+async def profile_event_loop(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=100),
+    format: Literal["json", "collapsed"] = "json",
+    include_idle: bool = False,
+):
+    """
+    Sample the live event loop for ``seconds`` and report where it spent its time.
+
+    ``format=collapsed`` returns the folded stacks as a text file for
+    flamegraph.pl or speedscope, with lag percentiles in the
+    ``X-Event-Loop-Lag-*`` headers. The default JSON response includes the
+    same stacks along with lag statistics and the hottest functions.
+    """
+    if seconds > settings.profile_max_seconds:
+        raise HTTPException(
+            status_code=422,
+            detail=f"seconds must be at most {settings.profile_max_seconds}",
+        )
+
+    try:
+        result = await loop_profiler.profile(seconds, interval_ms / 1000, include_idle)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "collapsed":
+        lag = result.lag
+        return Response(
+            result.collapsed(),
+            media_type="text/plain",
+            headers={
+                "Content-Disposition": 'attachment; filename="event-loop.folded"',
+                "X-Profile-Samples": str(result.samples),
+                "X-Profile-Idle-Samples": str(result.idle_samples),
+                "X-Event-Loop-Lag-P50-Ms": str(lag.get("p50_ms", 0)),
+                "X-Event-Loop-Lag-P99-Ms": str(lag.get("p99_ms", 0)),
+                "X-Event-Loop-Lag-Max-Ms": str(lag.get("max_ms", 0)),
+            },
+        )
+
+    return {**result.summary(), "collapsed": result.collapsed()}
@@ -5,6 +5,18 @@ from datetime import datetime
 from fastapi import APIRouter
 
 from ..config import settings
+from ..services.openai_guard import openai_guard
+from ..services.outbox import outbox_dispatcher
+from ..services.pdf_cache import pdf_cache
+from ..services.pdf_renderer import pdf_renderer
+from ..services.scoring_cache import scoring_cache
+from ..services.slack_dispatcher import slack_dispatcher
+from ..utils.db import get_db
+from ..utils.http import http_clients
+from ..utils.startup import startup_timer
+from ..utils.log_pipeline import log_pipeline
+from ..utils.loop_monitor import loop_monitor
+from ..utils.tracing import span_exporter
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -16,6 +28,7 @@ async def health_check():
         "status": "healthy",
         "service": settings.app_name,
         "version": settings.app_version,
+        "openai_breaker": openai_guard.breaker.state.value,
         "timestamp": datetime.utcnow().isoformat(),
     }
 
@@ -23,13 +36,26 @@ async def health_check():
 @router.get("/ready")
 async def readiness_check():
     """Readiness check with dependency status."""
+    db = get_db() if settings.is_database_configured else None
     return {
         "status": "ready",
         "dependencies": {
-            "supabase": settings.is_supabase_configured,
+            "database": settings.is_database_configured,
             "openai": settings.is_openai_configured,
             "resend": settings.is_resend_configured,
             "slack": settings.is_slack_configured,
         },
+        "database_pool": db.pool.stats() if db and db.pool else None,
+        "scoring_cache": scoring_cache.stats(),
+        "openai_guard": openai_guard.stats(),
+        "pdf_renderer": pdf_renderer.stats(),
+        "pdf_cache": pdf_cache.stats(),
+        "outbox": outbox_dispatcher.stats(),
+        "slack_queue": slack_dispatcher.stats(),
+        "http_clients": http_clients.stats(),
+        "startup": startup_timer.report(),
+        "tracing": span_exporter.stats(),
+        "event_loop": loop_monitor.stats(),
+        "logging": log_pipeline.stats(),
         "timestamp": datetime.utcnow().isoformat(),
     }
@@ -0,0 +1,24 @@
+"""Background job status endpoints, authenticated with ADMIN_TOKEN."""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from ..models.job import Job
+from ..services.job_queue import job_queue
+from .admin import require_admin
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], dependencies=[Depends(require_admin)])
+
+
+@router.get("")
+async def job_stats():
+    """Queue depth and worker counters."""
+    return job_queue.stats()
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """Status of a queued, running, or recently finished job."""
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -3,37 +3,108 @@ Webhook API endpoints
 Handles incoming webhooks from Supabase and other services
 """
 
+import asyncio
+import weakref
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 import structlog
-from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi import APIRouter, Header, HTTPException, Request, Response
 
 from ..config import settings
-from ..models.lead import Lead, LeadStatus
+from ..models.job import Job, JobStatus
+from ..models.lead import Lead, LeadQuality, LeadScore, LeadStatus
 from ..models.quote import Quote, QuoteStatus
 from ..models.webhook import WebhookPayload, WebhookEvent, WebhookResponse
 from ..services.lead_processor import LeadProcessor
 from ..services.email_service import EmailService
 from ..services.quote_generator import QuoteGenerator
 from ..services.notification_service import NotificationService
+from ..services.job_queue import JobHandler, JobQueueFull, job_queue
+from ..services.outbox import EMAIL, SLACK, OutboxMessage, enqueue, outbox_dispatcher, withdraw
+from ..services.slack_dispatcher import slack_dispatcher
+from ..utils.fanout import fan_out
+from ..utils.idempotency import idempotency_key, idempotency_store
 from ..utils.security import verify_signature
-from ..utils.db import get_db, get_quote_with_lead, update_quote_status, update_lead_status, update_conversation_status
+from ..utils.tracing import span
+from ..utils.db import Transaction, get_db, get_quote_with_lead, update_quote_status, update_lead_status, update_conversation_status
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
-# Service instances
-lead_processor = LeadProcessor()
-email_service = EmailService()
-quote_generator = QuoteGenerator()
-notification_service = NotificationService()
+# Service instances, built on first use (or by warm_up) rather than at import
+
+
+@lru_cache(maxsize=None)
+def get_lead_processor() -> LeadProcessor:
+    return LeadProcessor()
+
+
+@lru_cache(maxsize=None)
+def get_email_service() -> EmailService:
+    return EmailService()
+
+
+@lru_cache(maxsize=None)
+def get_quote_generator() -> QuoteGenerator:
+    return QuoteGenerator()
+
+
+@lru_cache(maxsize=None)
+def get_notification_service() -> NotificationService:
+    return NotificationService()
+
+
+def build_services() -> None:
+    """Create the services now, so the HTTP clients they register open with the rest."""
+    get_lead_processor()
+    get_email_service()
+    get_quote_generator()
+    get_notification_service()
+
+
+async def drain_services() -> None:
+    """Wait for background work of the services that were created."""
+    if get_lead_processor.cache_info().currsize:
+        await get_lead_processor().drain()
+
+
+async def _deliver_email(params: dict) -> None:
+    await get_email_service().deliver(params)
+
+
+async def _post_slack(payload: dict) -> None:
+    await get_notification_service().deliver(payload)
+
+
+outbox_dispatcher.register(EMAIL, _deliver_email)
+slack_dispatcher.bind(_post_slack)
+outbox_dispatcher.register(SLACK, slack_dispatcher.send, max_duration=slack_dispatcher.max_wait)
+
+# Outbox names of the notifications sent for a high-quality lead
+QUALIFIED_LEAD_MESSAGES = ["slack", "team_email"]
+
+# Per-lead locks ordering a lead's routing before any deferred re-score of it
+_lead_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# Quote generations in flight, by lead, so a downgrade can cancel them
+_quote_tasks: dict[str, asyncio.Task] = {}
+
+
+def _lead_lock(lead_id: str) -> asyncio.Lock:
+    lock = _lead_locks.get(lead_id)
+    if lock is None:
+        lock = _lead_locks[lead_id] = asyncio.Lock()
+    return lock
 
 
 @router.post("/lead", response_model=WebhookResponse)
 async def handle_lead_webhook(
     request: Request,
+    response: Response,
     x_webhook_signature: Optional[str] = Header(None),
+    x_webhook_delivery_id: Optional[str] = Header(None),
 ):
     """
     Handle lead-related webhooks from Supabase.
@@ -47,39 +118,41 @@ async def handle_lead_webhook(
     body_str = raw_body.decode("utf-8")
 
     # Verify signature if secret is configured
-    if settings.webhook_secret:
-        if not verify_signature(body_str, x_webhook_signature, settings.webhook_secret):
-            logger.warning("Invalid webhook signature")
-            raise HTTPException(status_code=401, detail="Invalid signature")
+    with span("webhook.verify_signature"):
+        if settings.webhook_secret:
+            if not verify_signature(body_str, x_webhook_signature, settings.webhook_secret):
+                logger.warning("Invalid webhook signature")
+                raise HTTPException(status_code=401, detail="Invalid signature")
 
     # Parse payload
-    try:
-        payload = WebhookPayload.model_validate_json(raw_body)
-    except Exception as e:
-        logger.error("Invalid webhook payload", error=str(e))
-        raise HTTPException(status_code=400, detail="Invalid payload")
+    with span("webhook.validate_payload"):
+        try:
+            payload = WebhookPayload.model_validate_json(raw_body)
+        except Exception as e:
+            logger.error("Invalid webhook payload", error=str(e))
+            raise HTTPException(status_code=400, detail="Invalid payload")
+    request.state.event_type = payload.event.value  # Metrics label
 
-    logger.info("Lead webhook received", event=payload.event)
+    logger.info("Lead webhook received", event_type=payload.event)
 
-    try:
-        if payload.event == WebhookEvent.LEAD_CREATED:
-            await _handle_lead_created(payload.data)
-        elif payload.event == WebhookEvent.LEAD_UPDATED:
-            await _handle_lead_updated(payload.data)
-        else:
-            logger.warning("Unknown event type", event=payload.event)
+    if payload.event == WebhookEvent.LEAD_CREATED:
+        handler = _handle_lead_created
+    elif payload.event == WebhookEvent.LEAD_UPDATED:
+        handler = _handle_lead_updated
+    else:
+        logger.warning("Unknown event type", event_type=payload.event)
+        handler = None
 
-        return WebhookResponse(success=True, event=payload.event)
-
-    except Exception as e:
-        logger.error("Webhook processing failed", error=str(e))
-        return WebhookResponse(success=False, error=str(e))
+    key = idempotency_key("lead", raw_body, x_webhook_delivery_id)
+    return await _dispatch(payload, handler, response, "Webhook processing failed", key)
 
 
 @router.post("/quote", response_model=WebhookResponse)
 async def handle_quote_webhook(
     request: Request,
+    response: Response,
     x_webhook_signature: Optional[str] = Header(None),
+    x_webhook_delivery_id: Optional[str] = Header(None),
 ):
     """
     Handle quote-related webhooks.
@@ -91,34 +164,36 @@ async def handle_quote_webhook(
     raw_body = await request.body()
     body_str = raw_body.decode("utf-8")
 
-    if settings.webhook_secret:
-        if not verify_signature(body_str, x_webhook_signature, settings.webhook_secret):
-            raise HTTPException(status_code=401, detail="Invalid signature")
-
-    try:
-        payload = WebhookPayload.model_validate_json(raw_body)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="Invalid payload")
+    with span("webhook.verify_signature"):
+        if settings.webhook_secret:
+            if not verify_signature(body_str, x_webhook_signature, settings.webhook_secret):
+                raise HTTPException(status_code=401, detail="Invalid signature")
 
-    logger.info("Quote webhook received", event=payload.event)
+    with span("webhook.validate_payload"):
+        try:
+            payload = WebhookPayload.model_validate_json(raw_body)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail="Invalid payload")
+    request.state.event_type = payload.event.value  # Metrics label
 
-    try:
-        if payload.event == WebhookEvent.QUOTE_ACCEPTED:
-            await _handle_quote_accepted(payload.data)
-        elif payload.event == WebhookEvent.QUOTE_DECLINED:
-            await _handle_quote_declined(payload.data)
+    logger.info("Quote webhook received", event_type=payload.event)
 
-        return WebhookResponse(success=True, event=payload.event)
+    handler = None
+    if payload.event == WebhookEvent.QUOTE_ACCEPTED:
+        handler = _handle_quote_accepted
+    elif payload.event == WebhookEvent.QUOTE_DECLINED:
+        handler = _handle_quote_declined
 
-    except Exception as e:
-        logger.error("Quote webhook failed", error=str(e))
-        return WebhookResponse(success=False, error=str(e))
+    key = idempotency_key("quote", raw_body, x_webhook_delivery_id)
+    return await _dispatch(payload, handler, response, "Quote webhook failed", key)
 
 
 @router.post("/conversation", response_model=WebhookResponse)
 async def handle_conversation_webhook(
     request: Request,
+    response: Response,
     x_webhook_signature: Optional[str] = Header(None),
+    x_webhook_delivery_id: Optional[str] = Header(None),
 ):
     """
     Handle conversation-related webhooks.
@@ -129,25 +204,113 @@ async def handle_conversation_webhook(
     raw_body = await request.body()
     body_str = raw_body.decode("utf-8")
 
-    if settings.webhook_secret:
-        if not verify_signature(body_str, x_webhook_signature, settings.webhook_secret):
-            raise HTTPException(status_code=401, detail="Invalid signature")
+    with span("webhook.verify_signature"):
+        if settings.webhook_secret:
+            if not verify_signature(body_str, x_webhook_signature, settings.webhook_secret):
+                raise HTTPException(status_code=401, detail="Invalid signature")
 
-    try:
-        payload = WebhookPayload.model_validate_json(raw_body)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="Invalid payload")
+    with span("webhook.validate_payload"):
+        try:
+            payload = WebhookPayload.model_validate_json(raw_body)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail="Invalid payload")
+    request.state.event_type = payload.event.value  # Metrics label
+
+    logger.info("Conversation webhook received", event_type=payload.event)
+
+    handler = None
+    if payload.event == WebhookEvent.CONVERSATION_COMPLETED:
+        handler = _handle_conversation_completed
 
-    logger.info("Conversation webhook received", event=payload.event)
+    key = idempotency_key("conversation", raw_body, x_webhook_delivery_id)
+    return await _dispatch(payload, handler, response, "Conversation webhook failed", key)
 
+
+async def _dispatch(
+    payload: WebhookPayload,
+    handler: Optional[JobHandler],
+    response: Response,
+    failure_message: str,
+    key: str,
+) -> WebhookResponse:
+    """
+    Hand an event to its handler, replaying the stored response for
+    duplicate deliveries.
+    """
+    if not settings.idempotency_enabled:
+        return await _run_handler(payload, handler, response, failure_message)
+
+    replay = await idempotency_store.claim(key)
+    if replay is not None:
+        logger.info("Duplicate webhook delivery", event_type=payload.event, key=key[:48])
+        response.status_code = replay["status_code"]
+        response.headers["X-Idempotent-Replay"] = "true"
+        return WebhookResponse(**replay["body"])
+
+    result: Optional[WebhookResponse] = None
+    queued = False
     try:
-        if payload.event == WebhookEvent.CONVERSATION_COMPLETED:
-            await _handle_conversation_completed(payload.data)
+        result = await _run_handler(payload, handler, response, failure_message, key)
+        queued = result.job_id is not None
+        return result
+    finally:
+        status_code = response.status_code or 200
+        if queued:
+            # Stored for good only once the job succeeds (see _job_done)
+            idempotency_store.hold(key, status_code, result.model_dump(mode="json"))
+        else:
+            await idempotency_store.complete(
+                key, status_code, result.model_dump(mode="json") if result else None
+            )
+
+
+def _job_done(key: Optional[str]) -> Optional[Callable[[Job], Awaitable[None]]]:
+    """Job callback settling the idempotency record held for a queued delivery."""
+    if key is None or not settings.idempotency_enabled:
+        return None
+
+    async def done(job: Job) -> None:
+        await idempotency_store.settle(key, job.status == JobStatus.SUCCEEDED)
+
+    return done
+
+
+async def _run_handler(
+    payload: WebhookPayload,
+    handler: Optional[JobHandler],
+    response: Response,
+    failure_message: str,
+    key: Optional[str] = None,
+) -> WebhookResponse:
+    """
+    Run or enqueue the handler for an event.
+
+    With the job engine running, the event is queued and the endpoint
+    answers 202 with the job id. Otherwise the handler runs inline.
+    """
+    if handler is None:
+        return WebhookResponse(success=True, event=payload.event)
+
+    if job_queue.is_running:
+        try:
+            job = job_queue.submit(payload.event.value, handler, payload.data, _job_done(key))
+        except JobQueueFull:
+            raise HTTPException(status_code=503, detail="Job queue full, retry later")
+
+        response.status_code = 202
+        return WebhookResponse(
+            success=True,
+            message="Accepted for processing",
+            event=payload.event,
+            job_id=job.id,
+        )
 
+    try:
+        await handler(payload.data)
         return WebhookResponse(success=True, event=payload.event)
 
     except Exception as e:
-        logger.error("Conversation webhook failed", error=str(e))
+        logger.error(failure_message, error=str(e))
         return WebhookResponse(success=False, error=str(e))
 
 
@@ -181,48 +344,171 @@ async def _handle_lead_created(data: dict):
         created_at=datetime.utcnow(),
     )
 
-    # Score the lead
-    score = await lead_processor.score_lead(lead)
-    logger.info("Lead scored", lead_id=lead.id, score=score.total, quality=score.quality.value)
-
-    # Route based on score
-    workflow = await lead_processor.route_lead(lead, score)
-
-    # Send welcome email
-    if lead.email and lead.name:
-        await email_service.send_welcome(
-            to=lead.email,
-            name=lead.name,
-            company=lead.company,
-            automation_area=lead.automation_area,
-            problem_text=lead.problem_text,
-        )
+    quote = None
+    # A deferred re-score of this lead waits for the lock, i.e. until the
+    # provisional routing and its notifications have committed
+    async with _lead_lock(lead.id):
+        score = await get_lead_processor().score_lead(lead, on_rescore=_handle_lead_rescored)
+        logger.info("Lead scored", lead_id=lead.id, score=score.total, quality=score.quality.value)
+
+        messages = []
+        if lead.email and lead.name:
+            messages.append(
+                OutboxMessage(
+                    EMAIL,
+                    get_email_service().welcome_message(
+                        to=lead.email,
+                        name=lead.name,
+                        company=lead.company,
+                        automation_area=lead.automation_area,
+                        problem_text=lead.problem_text,
+                    ),
+                    name="welcome_email",
+                    lead_id=lead.id or None,
+                )
+            )
+
+        # Notify team for qualified leads
+        if score.quality.value == "high":
+            messages.extend(_qualified_lead_messages(lead, score))
+
+        # Generate quote for high-quality leads, alongside the routing write
+        if score.quality.value == "high" and lead.is_qualified:
+            quote = _start_quote(lead)
+
+        # Route based on score; the status change and notifications commit together
+        try:
+            workflow = await _transition(
+                lambda tx: get_lead_processor().route_lead(lead, score, tx=tx), messages, lead_id=lead.id
+            )
+        except BaseException:
+            # No quote for a lead whose routing never committed
+            if quote is not None:
+                quote.cancel()
+            raise
+
+    if quote is not None:
+        # Cancelled if a deferred re-score downgraded the lead meanwhile
+        await asyncio.gather(quote, return_exceptions=True)
+
+    logger.info("Lead processing complete", lead_id=lead.id, workflow=workflow)
 
-    # Notify team for qualified leads
-    if score.quality.value == "high":
-        await notification_service.notify_new_lead(
-            lead_name=lead.name or "Unknown",
-            lead_email=lead.email or "",
-            company=lead.company,
-            lead_score=score.total,
-            automation_area=lead.automation_area,
-        )
 
-        # Send team email
-        await email_service.send_team_notification(
-            lead_name=lead.name or "Unknown",
-            lead_email=lead.email or "",
-            company=lead.company,
-            project_summary=lead.problem_text,
-            lead_score=score.total,
+def _qualified_lead_messages(lead: Lead, score: LeadScore) -> list[OutboxMessage]:
+    """Team notifications for a high-quality lead."""
+    messages = [
+        OutboxMessage(
+            SLACK,
+            get_notification_service().new_lead_message(
+                lead_name=lead.name or "Unknown",
+                lead_email=lead.email or "",
+                company=lead.company,
+                lead_score=score.total,
+                automation_area=lead.automation_area,
+            ),
+            name="slack",
+            lead_id=lead.id or None,
+        )
+    ]
+
+    team_email = get_email_service().team_notification_message(
+        lead_name=lead.name or "Unknown",
+        lead_email=lead.email or "",
+        company=lead.company,
+        project_summary=lead.problem_text,
+        lead_score=score.total,
+    )
+    if team_email:
+        messages.append(
+            OutboxMessage(EMAIL, team_email, name="team_email", lead_id=lead.id or None)
         )
 
-        # Generate quote for high-quality leads
-        if lead.is_qualified:
-            quote_data = await quote_generator.generate_quote(lead)
-            logger.info("Quote generated for qualified lead", lead_id=lead.id)
+    return messages
 
-    logger.info("Lead processing complete", lead_id=lead.id, workflow=workflow)
+
+def _start_quote(lead: Lead) -> asyncio.Task:
+    """Generate a lead's quote in the background, cancellable via ``_quote_tasks``."""
+    task = asyncio.create_task(_generate_quote(lead))
+    _quote_tasks[lead.id] = task
+    task.add_done_callback(
+        lambda t: _quote_tasks.pop(lead.id, None) if _quote_tasks.get(lead.id) is t else None
+    )
+    return task
+
+
+async def _generate_quote(lead: Lead) -> None:
+    """Generate a quote without letting a failure abort the caller; never raises."""
+    results = await fan_out(
+        {"quote": get_quote_generator().generate_quote(lead)},
+        timeout=settings.fanout_branch_timeout,
+        lead_id=lead.id,
+    )
+    if results["quote"].ok:
+        logger.info("Quote generated for qualified lead", lead_id=lead.id)
+
+
+async def _transition(
+    change: Optional[Callable[[Optional[Transaction]], Awaitable]],
+    messages: list[OutboxMessage],
+    **log_context,
+):
+    """
+    Apply a status change and publish the notifications it triggers.
+
+    With the outbox enabled both commit in one transaction and the
+    dispatcher delivers the messages. Otherwise the change runs on its own
+    and the messages are sent concurrently right away.
+    """
+    db = get_db() if outbox_dispatcher.enabled else None
+
+    if db:
+        async with db.transaction() as tx:
+            result = await change(tx) if change else None
+            for message in messages:
+                await enqueue(tx, message)
+        outbox_dispatcher.wake()
+        return result
+
+    result = await change(None) if change else None
+    await fan_out(
+        {m.name or f"{m.kind}_{i}": outbox_dispatcher.deliver_now(m) for i, m in enumerate(messages)},
+        timeout=settings.fanout_branch_timeout,
+        **log_context,
+    )
+    return result
+
+
+async def _handle_lead_rescored(lead: Lead, provisional: LeadScore, score: LeadScore):
+    """
+    A deferred AI score moved the lead into a different quality bucket.
+
+    An upgrade to high sends the qualified-lead notifications and starts a
+    quote. A downgrade from high withdraws whatever of those hasn't gone
+    out yet and cancels the quote if it is still being generated.
+    """
+    async with _lead_lock(lead.id):
+        if score.quality == LeadQuality.HIGH:
+            quote = _start_quote(lead) if lead.is_qualified else None
+            try:
+                await _transition(None, _qualified_lead_messages(lead, score), lead_id=lead.id)
+            except BaseException:
+                if quote is not None:
+                    quote.cancel()
+                raise
+        elif provisional.quality == LeadQuality.HIGH:
+            quote = _quote_tasks.pop(lead.id, None)
+            if quote is not None:
+                quote.cancel()
+            withdrawn = 0
+            if outbox_dispatcher.enabled and lead.id:
+                withdrawn = await withdraw(lead.id, QUALIFIED_LEAD_MESSAGES)
+            logger.info(
+                "Lead downgraded after AI score",
+                lead_id=lead.id,
+                quality=score.quality.value,
+                quote_cancelled=quote is not None,
+                messages_withdrawn=withdrawn,
+            )
 
 
 async def _handle_lead_updated(data: dict):
@@ -242,21 +528,21 @@ async def _handle_quote_accepted(data: dict):
         logger.error("Quote not found", quote_id=quote_id)
         return
 
-    # Update quote status
-    await update_quote_status(quote_id, "accepted")
-
-    # Update lead status
     lead_id = quote_data.get("lead_id")
-    if lead_id:
-        await update_lead_status(lead_id, "converted")
 
-    # Send notification
-    await notification_service.notify_quote_accepted(
+    async def change(tx: Optional[Transaction]) -> None:
+        await update_quote_status(quote_id, "accepted", tx=tx)
+        if lead_id:
+            await update_lead_status(lead_id, "converted", tx=tx)
+
+    # Update quote and lead status, and notify the team
+    notification = get_notification_service().quote_accepted_message(
         lead_name=quote_data.get("lead_name", "Unknown"),
         company=quote_data.get("lead_company"),
         project_title=quote_data.get("project_title", "Project"),
         amount=quote_data.get("total_amount", 0),
     )
+    await _transition(change, [OutboxMessage(SLACK, notification, name="slack")], quote_id=quote_id)
 
 
 async def _handle_quote_declined(data: dict):
@@ -271,21 +557,21 @@ async def _handle_quote_declined(data: dict):
         logger.error("Quote not found", quote_id=quote_id)
         return
 
-    # Update quote status
-    await update_quote_status(quote_id, "declined", reason)
-
-    # Update lead status
     lead_id = quote_data.get("lead_id")
-    if lead_id:
-        await update_lead_status(lead_id, "nurture")
 
-    # Notify team
-    await notification_service.notify_quote_declined(
+    async def change(tx: Optional[Transaction]) -> None:
+        await update_quote_status(quote_id, "declined", reason, tx=tx)
+        if lead_id:
+            await update_lead_status(lead_id, "nurture", tx=tx)
+
+    # Update quote and lead status, and notify the team
+    notification = get_notification_service().quote_declined_message(
         lead_name=quote_data.get("lead_name", "Unknown"),
         company=quote_data.get("lead_company"),
         project_title=quote_data.get("project_title", "Project"),
         reason=reason,
     )
+    await _transition(change, [OutboxMessage(SLACK, notification, name="slack")], quote_id=quote_id)
 
 
 async def _handle_conversation_completed(data: dict):
@@ -0,0 +1,340 @@
+"""
+Command-line tools for the automation service
+
+Usage:
+    python -m app.cli rescore [--chunk-size N] [--dry-run]
+    python -m app.cli score [--status STATUS] [--batch-size N] [--concurrency N]
+                            [--max-wait SECONDS] [--dry-run]
+    python -m app.cli email --template NAME --subject TEXT [--status STATUS]
+                            [--batch-size N] [--concurrency N] [--dry-run]
+    python -m app.cli startup [--top N] [--imports-only]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import structlog
+
+from .config import settings
+from .utils.db import close_db, get_db
+
+logger = structlog.get_logger()
+
+
+async def rescore(chunk_size: int, dry_run: bool) -> int:
+    """
+    Recompute rule-based scores for leads without an AI score and write
+    changed ones back.
+
+    Leads with ``scored_at`` set keep their AI score; the UPDATE repeats
+    the check so a score written mid-run is not overwritten. Rows are read
+    with keyset pagination and each chunk is written with a single
+    UPDATE ... FROM unnest(...) statement.
+    """
+    from .services.bulk_scoring import SCORING_COLUMNS, score_records
+
+    db = get_db()
+    if not db:
+        print("Database not configured (set DATABASE_URL)", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    scanned = changed = 0
+    last_id = None
+
+    try:
+        while True:
+            rows = await db.select(
+                "leads",
+                columns="id, lead_score, " + ", ".join(SCORING_COLUMNS),
+                where="scored_at IS NULL" + (" AND id > %s" if last_id else ""),
+                where_params=(last_id,) if last_id else None,
+                order_by="id",
+                limit=chunk_size,
+            )
+            if not rows:
+                break
+
+            totals = score_records(rows)["total"].tolist()
+            updates = [
+                (row["id"], total)
+                for row, total in zip(rows, totals)
+                if row["lead_score"] != total
+            ]
+
+            if updates and not dry_run:
+                await db.execute(
+                    """
+                    UPDATE leads AS l
+                    SET lead_score = v.lead_score
+                    FROM unnest(%s::uuid[], %s::int[]) AS v(id, lead_score)
+                    WHERE l.id = v.id AND l.scored_at IS NULL
+                    """,
+                    ([u[0] for u in updates], [u[1] for u in updates]),
+                )
+
+            scanned += len(rows)
+            changed += len(updates)
+            last_id = rows[-1]["id"]
+    finally:
+        await close_db()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Rescored {scanned} leads in {elapsed:.2f}s: "
+        f"{changed} {'would change' if dry_run else 'updated'}"
+    )
+    return 0
+
+
+async def score(
+    status: str,
+    batch_size: int,
+    concurrency: int,
+    max_wait: float,
+    dry_run: bool,
+) -> int:
+    """
+    AI-score every lead with a given status and write the scores back.
+
+    Leads are streamed from the database through ``score_leads_bulk``, which
+    paces batches on the OpenAI rate limits; scores are written in chunks
+    with one UPDATE ... FROM unnest(...) each. Statuses are left as they are.
+    """
+    import math
+
+    from pydantic import ValidationError
+
+    from .models.lead import Lead
+    from .services.lead_processor import LeadProcessor
+    from .utils.db import iter_leads
+
+    db = get_db()
+    if not db:
+        print("Database not configured (set DATABASE_URL)", file=sys.stderr)
+        return 1
+    if not settings.is_openai_configured:
+        print("OpenAI not configured (set OPENAI_API_KEY)", file=sys.stderr)
+        return 1
+
+    skipped = 0
+
+    async def leads():
+        nonlocal skipped
+        async for row in iter_leads(status=status or None):
+            try:
+                yield Lead(**{**row, "id": str(row["id"])})
+            except ValidationError as e:
+                skipped += 1
+                logger.warning("Lead skipped", lead_id=str(row["id"]), error=str(e))
+
+    async def write(updates: list[tuple[str, int]]) -> None:
+        await db.execute(
+            """
+            UPDATE leads AS l
+            SET lead_score = v.lead_score, scored_at = NOW()
+            FROM unnest(%s::uuid[], %s::int[]) AS v(id, lead_score)
+            WHERE l.id = v.id
+            """,
+            ([u[0] for u in updates], [u[1] for u in updates]),
+        )
+
+    started = time.perf_counter()
+    scored = changed = 0
+    updates: list[tuple[str, int]] = []
+
+    try:
+        async for lead, result in LeadProcessor().score_leads_bulk(
+            leads(), batch_size, concurrency, max_wait or math.inf
+        ):
+            scored += 1
+            if lead.lead_score != result.total:
+                changed += 1
+                updates.append((lead.id, result.total))
+            if len(updates) >= 500 and not dry_run:
+                await write(updates)
+                updates = []
+        if updates and not dry_run:
+            await write(updates)
+    finally:
+        await close_db()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Scored {scored} leads in {elapsed:.2f}s: "
+        f"{changed} {'would change' if dry_run else 'updated'}"
+        + (f", {skipped} skipped" if skipped else "")
+    )
+    return 0
+
+
+async def email(
+    template: str,
+    subject: str,
+    status: str,
+    batch_size: int,
+    concurrency: int,
+    dry_run: bool,
+) -> int:
+    """
+    Email every lead with a given status, rendering ``template`` per lead.
+
+    Leads are streamed from the database and sent in provider batches as
+    they arrive, so the full recipient list is never held in memory.
+    """
+    from .services.email_service import EmailService
+    from .utils.db import iter_leads
+    from .utils.templates import render_template
+
+    if not get_db():
+        print("Database not configured (set DATABASE_URL)", file=sys.stderr)
+        return 1
+
+    email_service = EmailService()
+
+    async def messages():
+        async for lead in iter_leads(status=status or None):
+            if not lead.get("email"):
+                continue
+            yield email_service.build_params(
+                to=lead["email"],
+                subject=subject,
+                html=render_template(template, **{**lead, "name": lead.get("name") or "there"}),
+            )
+
+    started = time.perf_counter()
+    sent = failed = 0
+
+    try:
+        if dry_run:
+            async for _ in messages():
+                sent += 1
+        else:
+            async for result in email_service.send_stream(messages(), batch_size, concurrency):
+                if result.ok:
+                    sent += 1
+                else:
+                    failed += 1
+                    logger.warning("Email not sent", to=result.to, error=result.error)
+    finally:
+        await email_service.aclose()
+        await close_db()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{'Would send' if dry_run else 'Sent'} {sent} emails in {elapsed:.2f}s"
+        + ("" if dry_run else f", {failed} failed")
+    )
+    return 1 if failed else 0
+
+
+async def startup(top: int, imports_only: bool) -> int:
+    """
+    Report import cost per module and the time each lifespan phase takes.
+
+    Imports are measured in a fresh interpreter; the lifespan is then run
+    in this process with the current settings (so LAZY_INIT applies).
+    """
+    from .utils.startup import import_report, startup_timer
+
+    report = await asyncio.to_thread(import_report, "app.main", top)
+    print(f"Import app.main: {report['total_ms']:.0f} ms")
+    print("\nSlowest app modules (cumulative ms):")
+    for name, ms in report["app_modules"]:
+        print(f"  {ms:8.1f}  {name}")
+    print("\nThird-party packages (own ms):")
+    for name, ms in report["packages"]:
+        print(f"  {ms:8.1f}  {name}")
+
+    if imports_only:
+        return 0
+
+    startup_timer.started = time.perf_counter()
+    from .main import app, lifespan, warm_up
+
+    # Run the deferred work in the foreground so its phases are timed on their own
+    settings.startup_warmup = False
+    async with lifespan(app):
+        ready_ms = startup_timer.report()["ready_ms"]
+        if settings.lazy_init:
+            await warm_up()
+
+    print(f"\nLifespan startup (lazy_init={settings.lazy_init}):")
+    for name, ms in startup_timer.phases.items():
+        print(f"  {ms:8.1f}  {name}")
+    print(f"Ready after {ready_ms:.0f} ms (import app.main + lifespan)")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=settings.app_name)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rescore_cmd = commands.add_parser(
+        "rescore",
+        help="Recompute rule-based scores for leads without an AI score",
+    )
+    rescore_cmd.add_argument("--chunk-size", type=int, default=10000)
+    rescore_cmd.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+
+    score_cmd = commands.add_parser(
+        "score",
+        help="AI-score leads in batches, paced on the OpenAI rate limits",
+    )
+    score_cmd.add_argument("--status", default="", help="Only leads with this status (default: all)")
+    score_cmd.add_argument("--batch-size", type=int, default=settings.scoring_batch_size)
+    score_cmd.add_argument("--concurrency", type=int, default=settings.scoring_batch_concurrency)
+    score_cmd.add_argument(
+        "--max-wait",
+        type=float,
+        default=settings.scoring_bulk_max_wait,
+        help="Seconds a batch may wait for OpenAI capacity (0 = no limit)",
+    )
+    score_cmd.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+
+    email_cmd = commands.add_parser(
+        "email",
+        help="Send a templated email to every lead with a given status",
+    )
+    email_cmd.add_argument("--template", required=True, help="Template name, e.g. email/welcome.html")
+    email_cmd.add_argument("--subject", required=True)
+    email_cmd.add_argument("--status", default="", help="Only leads with this status (default: all)")
+    email_cmd.add_argument("--batch-size", type=int, default=settings.email_batch_size)
+    email_cmd.add_argument("--concurrency", type=int, default=settings.email_batch_concurrency)
+    email_cmd.add_argument("--dry-run", action="store_true", help="Render messages without sending")
+
+    startup_cmd = commands.add_parser(
+        "startup",
+        help="Report import and initialization cost per module",
+    )
+    startup_cmd.add_argument("--top", type=int, default=15, help="Rows per table")
+    startup_cmd.add_argument("--imports-only", action="store_true", help="Skip running the lifespan")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "rescore":
+        return asyncio.run(rescore(args.chunk_size, args.dry_run))
+    if args.command == "score":
+        return asyncio.run(
+            score(args.status, args.batch_size, args.concurrency, args.max_wait, args.dry_run)
+        )
+    if args.command == "email":
+        return asyncio.run(
+            email(
+                args.template,
+                args.subject,
+                args.status,
+                args.batch_size,
+                args.concurrency,
+                args.dry_run,
+            )
+        )
+    if args.command == "startup":
+        return asyncio.run(startup(args.top, args.imports_only))
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
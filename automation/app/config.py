@@ -6,6 +6,7 @@ Updated: Now uses Neon PostgreSQL instead of Supabase
 """
 
 from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 from pydantic import Field
@@ -34,10 +35,25 @@ class Settings(BaseSettings):
 
     # Database (Neon PostgreSQL)
     database_url: str = Field(default="", alias="DATABASE_URL")
+    db_pool_enabled: bool = True
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    db_pool_timeout: float = 10.0  # Seconds to wait for a free connection
+    db_pool_max_uses: int = 1000  # Recycle a connection after this many checkouts
+    db_pool_check_on_checkout: bool = True
+    db_pool_check_after_idle: float = 10.0  # Only ping connections idle this long
 
     # OpenAI
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
     openai_model: str = "gpt-4o-mini"
+    openai_timeout: float = 30.0
+    openai_max_retries: int = 0  # Retries are left to the guard's fallback path
+    openai_rpm_limit: int = 500  # Requests per minute (0 disables)
+    openai_tpm_limit: int = 200000  # Tokens per minute (0 disables)
+    openai_max_in_flight: int = 8
+    openai_max_wait: float = 5.0  # Max seconds to wait for capacity before falling back
+    openai_breaker_failure_threshold: int = 5
+    openai_breaker_reset_seconds: float = 30.0
 
     # Email (Resend)
     resend_api_key: str = Field(default="", alias="RESEND_API_KEY")
@@ -45,21 +61,113 @@ class Settings(BaseSettings):
     team_notification_email: Optional[str] = Field(
         default=None, alias="TEAM_NOTIFICATION_EMAIL"
     )
+    resend_base_url: str = "https://api.resend.com"  # Point at a local fake server in tests
+    email_timeout: float = 10.0
+    email_connect_timeout: float = 5.0
+    email_max_connections: int = 10
+    email_max_keepalive_connections: int = 5
+    email_keepalive_expiry: float = 30.0  # Seconds an idle connection stays pooled
+    email_batch_size: int = 100  # Messages per batch request (provider max 100)
+    email_batch_concurrency: int = 2  # Batch requests in flight
+
+    # Logging
+    log_level: str = "INFO"
+    log_queue_enabled: bool = True  # Render and write logs on a listener thread, off the event loop
+    log_queue_size: int = 10000  # Records buffered; further records are dropped and counted
+    log_lean_records: bool = True  # Skip caller/thread/process lookups on every record, process-wide
+    log_sample_rate: float = 1.0  # Share of the events below kept at info level (warnings always kept)
+    log_sampled_events: list[str] = [
+        "Lead webhook received",
+        "Quote webhook received",
+        "Conversation webhook received",
+        "Lead score cache hit",
+        "PDF served from cache",
+    ]
+
+    # Metrics
+    metrics_enabled: bool = True  # Prometheus histograms and the /metrics endpoint
+    tracing_enabled: bool = True  # Per-request spans; trace ids are added to every log line
+    tracing_exporter: str = ""  # "file", "otlp", or empty to keep spans in logs only
+    tracing_file: str = ".cache/traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_flush_interval: float = 2.0  # Seconds between exporter batches
+    loop_monitor_enabled: bool = False  # Event-loop lag histogram and blocked-callback warnings
+    loop_monitor_interval: float = 0.1  # Seconds between lag probes
+    loop_slow_callback_ms: float = 100.0  # Log the stack of anything holding the loop longer
+
+    # Startup (scale-to-zero deployments)
+    lazy_init: bool = False  # Accept requests before pools, SDKs and PDF workers are ready
+    startup_warmup: bool = True  # With lazy_init, warm those up in the background after boot
+
+    # Outbound HTTP (defaults for every upstream; Resend uses the email_* pool settings)
+    http_timeout: float = 10.0
+    http_connect_timeout: float = 5.0
+    http_max_connections: int = 20  # Per upstream host
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0  # Seconds an idle connection stays pooled
+    http2_enabled: bool = False  # Needs the h2 package (httpx[http2])
 
     # Webhooks
     webhook_secret: str = Field(default="", alias="WEBHOOK_SECRET")
     astro_webhook_url: str = Field(default="", alias="ASTRO_WEBHOOK_URL")
+    idempotency_enabled: bool = True
+    idempotency_ttl_seconds: int = 86400
+    idempotency_memory_size: int = 10000
+
+    # Admin endpoints (disabled unless a token is set)
+    admin_token: str = Field(default="", alias="ADMIN_TOKEN")
+    profile_max_seconds: float = 60.0  # Longest event-loop profile one request may run
+
+    # Background jobs
+    jobs_enabled: bool = True
+    job_workers: int = 4
+    job_queue_max_size: int = 1000
+    job_timeout: float = 120.0  # Seconds before a running job is cancelled
+    job_history_size: int = 1000  # Finished jobs kept for status lookups
+    fanout_branch_timeout: float = 30.0  # Seconds per concurrent side effect
+
+    # Outbox (durable email/Slack delivery; needs the database)
+    outbox_enabled: bool = True
+    outbox_concurrency: int = 2  # Dispatcher workers
+    outbox_batch_size: int = 10  # Rows claimed per worker round
+    outbox_poll_interval: float = 1.0
+    outbox_max_attempts: int = 8  # Then the message is dead-lettered
+    outbox_backoff_base: float = 2.0  # Seconds; doubled per attempt, full jitter
+    outbox_backoff_max: float = 600.0
+    outbox_lease_seconds: float = 60.0  # Claimed rows become due again after this; raised to cover slow handlers
 
     # Slack
     slack_webhook_url: Optional[str] = Field(default=None, alias="SLACK_WEBHOOK_URL")
     slack_channel: str = "#leads"
+    slack_queue_enabled: bool = True  # Pace and coalesce posts through per-channel queues
+    slack_min_interval: float = 1.0  # Seconds between posts per channel (webhook limit ~1/s)
+    slack_coalesce_window: float = 0.0  # Seconds to gather a burst into one digest (0 disables)
+    slack_max_digest: int = 20  # Messages merged into one digest at most
+    slack_queue_size: int = 100  # Per channel; further messages are rejected
+    slack_max_retries: int = 3  # Retries after a 429 before giving up
+    slack_max_wait: float = 60.0  # Seconds a message may wait to be posted before it's withdrawn
 
     # Lead Scoring
     qualified_lead_threshold: int = 70
     nurture_lead_threshold: int = 40
+    scoring_cache_size: int = 5000
+    scoring_cache_ttl_seconds: int = 604800  # 7 days
+    scoring_cache_persistent: bool = False  # Also cache in lead_score_cache table
+    scoring_batch_size: int = 20  # Leads per batched chat completion
+    scoring_batch_concurrency: int = 4  # Batch requests in flight
+    scoring_bulk_max_wait: float = 600.0  # Seconds a bulk batch may wait for OpenAI capacity (0 = no limit)
+    scoring_latency_budget_ms: int = 0  # 0 waits for the model; >0 falls back to rules after N ms
 
     # PDF Generation
-    pdf_template_dir: str = "templates"
+    pdf_template_dir: str = str(Path(__file__).parent / "templates")  # Quote and email templates
+    template_cache_dir: str = ".cache/jinja"  # Compiled template bytecode ("" disables)
+    pdf_render_workers: int = 1  # Worker processes; 0 renders in a thread instead
+    pdf_render_queue_size: int = 8  # Renders allowed to wait for a worker
+    pdf_render_timeout: float = 60.0  # Seconds before a render is cancelled
+    pdf_cache_enabled: bool = True
+    pdf_cache_dir: str = ".cache/pdf"
+    pdf_cache_max_mb: int = 256  # Disk budget; least recently used PDFs are evicted
+    pdf_cache_memory_items: int = 32  # Hot PDFs kept in memory
 
     @property
     def is_database_configured(self) -> bool:
@@ -10,36 +10,79 @@ Replaces n8n with a production-ready Python service for:
 - Webhook handling
 """
 
+import asyncio
+import importlib
 import structlog
 from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
-from .api import webhooks_router, health_router
+from .api import webhooks_router, health_router, jobs_router, metrics_router, admin_router
+from .api.webhooks import build_services, drain_services, get_lead_processor
+from .services.job_queue import job_queue
+from .services.outbox import outbox_dispatcher
+from .services.pdf_renderer import pdf_renderer
+from .services.slack_dispatcher import slack_dispatcher
+from .utils.db import get_db, close_db
+from .utils.http import http_clients
+from .utils.log_pipeline import log_pipeline
+from .utils.loop_monitor import loop_monitor
+from .utils.metrics import MetricsMiddleware
+from .utils.startup import startup_timer
+from .utils.tracing import TracingMiddleware, span_exporter
+from .utils.templates import preload_templates
 
 # Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer() if not settings.debug else structlog.dev.ConsoleRenderer(),
-    ],
-    wrapper_class=structlog.stdlib.BoundLogger,
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+log_pipeline.configure()
 
 logger = structlog.get_logger()
 
 
+async def warm_up() -> None:
+    """Open pools and load heavy dependencies before traffic needs them."""
+    # Warm up the database pool so the first webhook doesn't pay for it
+    db = get_db()
+    if db:
+        with startup_timer.phase("database"):
+            try:
+                await db.open()
+            except Exception as e:
+                logger.error("Database pool warm-up failed", error=str(e))
+
+    # Services register their upstream clients when created
+    with startup_timer.phase("services"):
+        build_services()
+
+    # One pooled client per upstream (OpenAI, Resend, Slack), shared app-wide
+    with startup_timer.phase("http_clients"):
+        http_clients.open()
+
+    # The OpenAI SDK is the slowest import; load it off the event loop
+    if settings.is_openai_configured:
+        with startup_timer.phase("openai_sdk"):
+            await asyncio.to_thread(importlib.import_module, "openai")
+            get_lead_processor().warm_client()
+
+    # Compile quote and email templates before the first request needs them
+    with startup_timer.phase("templates"):
+        await asyncio.to_thread(preload_templates)
+
+    # Spawn PDF workers up front so the first quote doesn't import WeasyPrint
+    with startup_timer.phase("pdf_workers"):
+        await pdf_renderer.start()
+
+
+def _warm_up_done(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    if task.exception():
+        logger.error("Background warm-up failed", error=str(task.exception()))
+        return
+    logger.info("Warm-up complete", **startup_timer.report())
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
@@ -48,6 +91,7 @@ async def lifespan(app: FastAPI):
         "Starting automation service",
         version=settings.app_version,
         environment=settings.environment,
+        lazy_init=settings.lazy_init,
     )
 
     # Log configuration status
@@ -59,10 +103,48 @@ async def lifespan(app: FastAPI):
         slack=settings.is_slack_configured,
     )
 
+    await span_exporter.start()
+    if settings.loop_monitor_enabled:
+        await loop_monitor.start()
+
+    warming: Optional[asyncio.Task] = None
+    if not settings.lazy_init:
+        await warm_up()
+    elif settings.startup_warmup:
+        # Open the port first; everything warm_up() skips is also built on first use
+        warming = asyncio.create_task(warm_up(), name="warm-up")
+        warming.add_done_callback(_warm_up_done)
+
+    if settings.jobs_enabled:
+        with startup_timer.phase("job_queue"):
+            await job_queue.start()
+
+    # Pace and coalesce Slack posts per channel
+    if settings.slack_queue_enabled:
+        await slack_dispatcher.start()
+
+    # Deliver queued emails and Slack messages, including any left from before a restart
+    with startup_timer.phase("outbox"):
+        await outbox_dispatcher.start()
+
+    startup_timer.ready()
+
     yield
 
     # Shutdown
     logger.info("Shutting down automation service")
+    if warming and not warming.done():
+        warming.cancel()
+        await asyncio.gather(warming, return_exceptions=True)
+    await job_queue.stop()
+    await outbox_dispatcher.stop()
+    await slack_dispatcher.stop()
+    await drain_services()
+    await pdf_renderer.stop()
+    await span_exporter.stop()
+    await loop_monitor.stop()
+    await http_clients.aclose()
+    await close_db()
 
 
 # Create FastAPI app
@@ -84,9 +166,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(health_router)
 app.include_router(webhooks_router)
+app.include_router(jobs_router)
+app.include_router(admin_router)
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -3,6 +3,7 @@
 from .lead import Lead, LeadCreate, LeadUpdate, LeadScore, LeadQuality
 from .quote import Quote, QuoteCreate, QuoteItem
 from .webhook import WebhookPayload, WebhookEvent
+from .job import Job, JobStatus
 
 __all__ = [
     "Lead",
@@ -15,4 +16,6 @@ __all__ = [
     "QuoteItem",
     "WebhookPayload",
     "WebhookEvent",
+    "Job",
+    "JobStatus",
 ]
@@ -0,0 +1,32 @@
+"""Background job models."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class JobStatus(str, Enum):
+    """Background job lifecycle status."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """A unit of webhook work processed by the job engine."""
+
+    id: str
+    event: str
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in [JobStatus.SUCCEEDED, JobStatus.FAILED]
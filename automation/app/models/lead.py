@@ -38,6 +38,8 @@ class LeadScore(BaseModel):
     problem_clarity: int = Field(ge=0, le=20)
     decision_authority: int = Field(ge=0, le=15)
     tech_readiness: int = Field(ge=0, le=10)
+    # A stand-in while the AI score is still pending; see LeadProcessor.score_lead
+    provisional: bool = Field(default=False, exclude=True)
 
     @property
     def quality(self) -> LeadQuality:
@@ -30,4 +30,5 @@ class WebhookResponse(BaseModel):
     success: bool
     message: Optional[str] = None
     event: Optional[str] = None
+    job_id: Optional[str] = None
     error: Optional[str] = None
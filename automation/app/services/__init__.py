@@ -3,11 +3,31 @@
 from .lead_processor import LeadProcessor
 from .quote_generator import QuoteGenerator
 from .email_service import EmailService
+from .email_transport import EmailDeliveryError, ResendTransport, email_transport
 from .notification_service import NotificationService
+from .job_queue import JobQueue, job_queue
+from .pdf_renderer import PdfRenderer, pdf_renderer
+from .pdf_cache import PdfCache, pdf_cache
+from .outbox import OutboxDispatcher, OutboxMessage, outbox_dispatcher
+from .slack_dispatcher import SlackDispatcher, slack_dispatcher
 
 __all__ = [
     "LeadProcessor",
     "QuoteGenerator",
     "EmailService",
+    "EmailDeliveryError",
+    "ResendTransport",
+    "email_transport",
     "NotificationService",
+    "JobQueue",
+    "job_queue",
+    "PdfRenderer",
+    "pdf_renderer",
+    "PdfCache",
+    "pdf_cache",
+    "OutboxDispatcher",
+    "OutboxMessage",
+    "outbox_dispatcher",
+    "SlackDispatcher",
+    "slack_dispatcher",
 ]
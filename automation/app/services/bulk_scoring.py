@@ -0,0 +1,157 @@
+"""
+Bulk Rule-Based Scoring
+Columnar, NumPy-backed version of LeadProcessor._rule_based_score for
+rescoring whole tables at once
+"""
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from ..models.lead import Lead, LeadScore
+from ..utils.keywords import KEYWORD_RULES
+
+# Columns the rule-based scorer reads
+SCORING_COLUMNS = (
+    "interest_level",
+    "budget_range",
+    "urgency",
+    "timeline",
+    "problem_text",
+    "role",
+    "tools_used",
+)
+
+
+# Appended to every value: NumPy's fixed-width str dtype drops trailing
+# "\x00", which would make a NUL-only field look empty. No keyword contains
+# this character, so it never creates or hides a match.
+_END = "\uffff"
+
+
+def _lowered(values: Sequence[Optional[str]]) -> np.ndarray:
+    # Lowercase in Python so multi-character case mappings match str.lower()
+    return np.array([(v or "").lower() + _END for v in values], dtype=str)
+
+
+def _empty(text: np.ndarray) -> np.ndarray:
+    return text == _END
+
+
+def _contains_any(text: np.ndarray, needles: Sequence[str]) -> np.ndarray:
+    found = np.zeros(text.shape, dtype=bool)
+    for needle in needles:
+        found |= np.char.find(text, needle) >= 0
+    return found
+
+
+def score_columns(
+    interest_level: Sequence[Optional[int]],
+    budget_range: Sequence[Optional[str]],
+    urgency: Sequence[Optional[str]],
+    timeline: Sequence[Optional[str]],
+    problem_text: Sequence[Optional[str]],
+    role: Sequence[Optional[str]],
+    tools_used: Sequence[Optional[Sequence[str]]],
+) -> dict[str, np.ndarray]:
+    """
+    Score many leads in one pass.
+
+    Each argument is one column, aligned by position. Produces exactly the
+    same numbers as ``LeadProcessor._rule_based_score`` for every row.
+
+    Returns:
+        Mapping of dimension name (plus ``total``) to an int array
+    """
+    n = len(interest_level)
+
+    # Interest level
+    interest = np.array([v or 0 for v in interest_level], dtype=np.int64)
+    interest_score = np.minimum(20, interest * 2)
+
+    # Budget clarity
+    budget = _lowered(budget_range)
+    budget_score = np.select(
+        [
+            _empty(budget),
+            _contains_any(budget, KEYWORD_RULES["budget"]["amount"]),
+            _contains_any(budget, KEYWORD_RULES["budget"]["flexible"]),
+        ],
+        [0, 15, 10],
+        default=5,
+    )
+
+    # Urgency (falls back to timeline when urgency is empty)
+    urgency_text = _lowered([u or t for u, t in zip(urgency, timeline)])
+    urgency_score = np.select(
+        [
+            _empty(urgency_text),
+            _contains_any(urgency_text, KEYWORD_RULES["urgency"]["immediate"]),
+            _contains_any(urgency_text, KEYWORD_RULES["urgency"]["soon"]),
+        ],
+        [0, 15, 10],
+        default=5,
+    )
+
+    # Problem clarity
+    problem_len = np.array([len(p) if p else 0 for p in problem_text], dtype=np.int64)
+    problem_score = np.select(
+        [problem_len == 0, problem_len > 100, problem_len > 50, problem_len > 20],
+        [0, 18, 12, 8],
+        default=4,
+    )
+
+    # Decision authority
+    roles = _lowered(role)
+    authority_score = np.select(
+        [
+            _empty(roles),
+            _contains_any(roles, KEYWORD_RULES["role"]["executive"]),
+            _contains_any(roles, KEYWORD_RULES["role"]["manager"]),
+        ],
+        [0, 15, 10],
+        default=5,
+    )
+
+    # Tech readiness
+    tool_counts = np.array([len(t) if t else 0 for t in tools_used], dtype=np.int64)
+    tech_score = np.minimum(10, tool_counts * 3)
+
+    scores = {
+        "interest_level": interest_score,
+        "budget_clarity": budget_score,
+        "urgency": urgency_score,
+        "problem_clarity": problem_score,
+        "decision_authority": authority_score,
+        "tech_readiness": tech_score,
+    }
+    scores = {k: v.astype(np.int64).reshape(n) for k, v in scores.items()}
+    scores["total"] = sum(scores.values())
+    return scores
+
+
+def score_records(records: Sequence[Any]) -> dict[str, np.ndarray]:
+    """Score Lead models or row dicts (e.g. from ``DatabaseClient.select``)."""
+
+    def column(name: str) -> list:
+        if records and isinstance(records[0], dict):
+            return [r.get(name) for r in records]
+        return [getattr(r, name) for r in records]
+
+    return score_columns(**{name: column(name) for name in SCORING_COLUMNS})
+
+
+def to_lead_scores(scores: dict[str, np.ndarray]) -> list[LeadScore]:
+    """Materialize columnar scores as LeadScore models."""
+    columns = {k: v.tolist() for k, v in scores.items()}
+    return [
+        LeadScore(**{k: columns[k][i] for k in columns})
+        for i in range(len(columns["total"]))
+    ]
+
+
+def score_leads(leads: Sequence[Lead]) -> list[LeadScore]:
+    """Rule-based scores for a list of leads, computed columnar."""
+    if not leads:
+        return []
+    return to_lead_scores(score_records(leads))
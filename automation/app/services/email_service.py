@@ -3,22 +3,79 @@ Email Service
 Handles all email sending via Resend
 """
 
-from typing import List, Optional
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Union
 
-import resend
 import structlog
 
 from ..config import settings
+from ..utils.fanout import stream_batches
+from ..utils.templates import render_template
+from .email_transport import BATCH_LIMIT, ResendTransport, email_transport
 
 logger = structlog.get_logger()
 
 
+@dataclass
+class SendResult:
+    """Outcome of one message in a batch send."""
+
+    to: list[str]
+    ok: bool
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
 class EmailService:
     """Sends emails via Resend API."""
 
-    def __init__(self):
-        if settings.is_resend_configured:
-            resend.api_key = settings.resend_api_key
+    def __init__(self, transport: Optional[ResendTransport] = None):
+        self.transport = transport or email_transport
+
+    def build_params(
+        self,
+        to: str,
+        subject: str,
+        html: str,
+        text: Optional[str] = None,
+        attachments: Optional[List[dict]] = None,
+        reply_to: Optional[str] = None,
+    ) -> dict:
+        """Build a Resend email object."""
+        params = {
+            "from": settings.from_email,
+            "to": [to],
+            "subject": subject,
+            "html": html,
+        }
+
+        if text:
+            params["text"] = text
+
+        if reply_to:
+            params["reply_to"] = reply_to
+
+        if attachments:
+            params["attachments"] = attachments
+
+        return params
+
+    async def deliver(self, params: dict) -> None:
+        """
+        Send a prepared message.
+
+        Raises:
+            EmailDeliveryError: If the provider rejects it or can't be reached
+        """
+        if not settings.is_resend_configured:
+            logger.warning("Resend not configured, skipping email", to=params.get("to"))
+            return
+
+        result = await self.transport.send(params)
+        logger.info(
+            "Email sent", to=params.get("to"), subject=params.get("subject"), id=result.get("id")
+        )
 
     async def send(
         self,
@@ -43,34 +100,117 @@ class EmailService:
         Returns:
             bool: True if sent successfully
         """
+        return await self.send_params(
+            self.build_params(to, subject, html, text, attachments, reply_to)
+        )
+
+    async def send_params(self, params: dict) -> bool:
+        """Send a prepared message, logging instead of raising."""
         if not settings.is_resend_configured:
-            logger.warning("Resend not configured, skipping email", to=to, subject=subject)
+            logger.warning(
+                "Resend not configured, skipping email",
+                to=params.get("to"),
+                subject=params.get("subject"),
+            )
             return False
 
         try:
-            params = {
-                "from": settings.from_email,
-                "to": [to],
-                "subject": subject,
-                "html": html,
-            }
+            await self.deliver(params)
+            return True
+
+        except Exception as e:
+            logger.error(
+                "Failed to send email",
+                to=params.get("to"),
+                subject=params.get("subject"),
+                error=str(e),
+            )
+            return False
 
-            if text:
-                params["text"] = text
+    async def send_batch(
+        self,
+        messages: List[dict],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> List[SendResult]:
+        """
+        Send many prepared messages with as few requests as possible.
 
-            if reply_to:
-                params["reply_to"] = reply_to
+        Messages are grouped into provider batch requests of up to
+        ``batch_size`` (capped at the provider limit), with at most
+        ``concurrency`` requests in flight. Messages with attachments are
+        sent one by one, since the batch endpoint doesn't accept them.
 
-            if attachments:
-                params["attachments"] = attachments
+        Returns:
+            One SendResult per message, in input order
+        """
+        batch_size = min(batch_size or settings.email_batch_size, BATCH_LIMIT)
+        semaphore = asyncio.Semaphore(concurrency or settings.email_batch_concurrency)
 
-            result = resend.Emails.send(params)
-            logger.info("Email sent", to=to, subject=subject, id=result.get("id"))
-            return True
+        async def send_chunk(chunk: List[dict]) -> List[SendResult]:
+            async with semaphore:
+                return await self._send_chunk(chunk)
 
-        except Exception as e:
-            logger.error("Failed to send email", to=to, subject=subject, error=str(e))
-            return False
+        chunks = [messages[i : i + batch_size] for i in range(0, len(messages), batch_size)]
+        results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    async def send_stream(
+        self,
+        messages: Union[Iterable[dict], AsyncIterable[dict]],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[SendResult]:
+        """
+        Send an arbitrarily large stream of prepared messages.
+
+        Messages are pulled lazily and grouped into batches, with at most
+        ``concurrency`` batch requests in flight, so memory stays bounded.
+        Results are yielded in input order (see ``stream_batches``).
+        """
+        results = stream_batches(
+            messages,
+            self._send_chunk,
+            min(batch_size or settings.email_batch_size, BATCH_LIMIT),
+            concurrency or settings.email_batch_concurrency,
+        )
+        async for result in results:
+            yield result
+
+    async def _send_chunk(self, chunk: List[dict]) -> List[SendResult]:
+        """Send one provider batch; never raises."""
+        if not settings.is_resend_configured:
+            return [SendResult(m["to"], False, error="Resend not configured") for m in chunk]
+
+        results: List[Optional[SendResult]] = [None] * len(chunk)
+        batchable = [i for i, m in enumerate(chunk) if not m.get("attachments")]
+
+        for i, message in enumerate(chunk):
+            if message.get("attachments"):
+                try:
+                    sent = await self.transport.send(message)
+                    results[i] = SendResult(message["to"], True, id=sent.get("id"))
+                except Exception as e:
+                    results[i] = SendResult(message["to"], False, error=str(e))
+
+        if batchable:
+            try:
+                outcomes = await self.transport.send_batch([chunk[i] for i in batchable])
+            except Exception as e:
+                outcomes = [{"error": str(e)}] * len(batchable)
+
+            for i, outcome in zip(batchable, outcomes):
+                results[i] = SendResult(
+                    chunk[i]["to"], "id" in outcome, id=outcome.get("id"), error=outcome.get("error")
+                )
+
+        sent = sum(r.ok for r in results)
+        logger.info("Email batch sent", messages=len(chunk), sent=sent, failed=len(chunk) - sent)
+        return results
+
+    async def aclose(self) -> None:
+        """Close the transport's pooled connections."""
+        await self.transport.aclose()
 
     async def send_welcome(
         self,
@@ -81,8 +221,21 @@ class EmailService:
         problem_text: Optional[str] = None,
     ) -> bool:
         """Send welcome email to new lead."""
+        return await self.send_params(
+            self.welcome_message(to, name, company, automation_area, problem_text)
+        )
+
+    def welcome_message(
+        self,
+        to: str,
+        name: str,
+        company: Optional[str] = None,
+        automation_area: Optional[str] = None,
+        problem_text: Optional[str] = None,
+    ) -> dict:
+        """Resend email object for the welcome email."""
         html = self._generate_welcome_html(name, company, automation_area, problem_text)
-        return await self.send(
+        return self.build_params(
             to=to,
             subject="🤖 Your Automation Project - Next Steps",
             html=html,
@@ -124,15 +277,31 @@ class EmailService:
         lead_score: Optional[int] = None,
     ) -> bool:
         """Send notification to team about new qualified lead."""
+        params = self.team_notification_message(
+            lead_name, lead_email, company, project_summary, lead_score
+        )
+        if params is None:
+            return False
+        return await self.send_params(params)
+
+    def team_notification_message(
+        self,
+        lead_name: str,
+        lead_email: str,
+        company: Optional[str] = None,
+        project_summary: Optional[str] = None,
+        lead_score: Optional[int] = None,
+    ) -> Optional[dict]:
+        """Resend email object for the team, or None if no team address is set."""
         if not settings.team_notification_email:
             logger.info("Team notification email not configured, skipping")
-            return False
+            return None
 
         html = self._generate_team_notification_html(
             lead_name, lead_email, company, project_summary, lead_score
         )
 
-        return await self.send(
+        return self.build_params(
             to=settings.team_notification_email,
             subject=f"🎯 New Lead: {lead_name} from {company or 'Unknown'}",
             html=html,
@@ -146,89 +315,24 @@ class EmailService:
         problem_text: Optional[str],
     ) -> str:
         """Generate welcome email HTML."""
-        problem_section = ""
-        if problem_text:
-            problem_section = f"""
-            <div style="background: #fff7ed; border-left: 4px solid #fb6400; padding: 16px; margin: 16px 0;">
-                <p><strong>Your Challenge:</strong><br>
-                <em>"{problem_text}"</em></p>
-            </div>
-            """
-
-        return f"""<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: -apple-system, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: linear-gradient(135deg, #fb6400 0%, #ff7a1a 100%); color: white; padding: 30px; text-align: center; border-radius: 8px; }}
-        .content {{ background: #f8fafc; padding: 30px; border-radius: 8px; margin-top: 20px; }}
-        .footer {{ text-align: center; color: #64748b; font-size: 14px; margin-top: 30px; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🎉 Thanks for Connecting!</h1>
-    </div>
-    <div class="content">
-        <p>Hi {name},</p>
-        <p>Thanks for chatting with Telos! I've passed your project details to our team, and they're already analyzing how we can help you with <strong>{automation_area or 'your automation needs'}</strong>.</p>
-        <p><strong>What happens next?</strong></p>
-        <ul>
-            <li>📊 We're analyzing your requirements</li>
-            <li>💰 Calculating ROI and pricing</li>
-            <li>📝 Preparing a custom proposal</li>
-        </ul>
-        {problem_section}
-        <p>You'll receive a detailed proposal within 24 hours!</p>
-        <p>Best,<br><strong>The Are You Human? Team</strong></p>
-    </div>
-    <div class="footer">
-        <p>Are You Human? | AI-Powered Automation</p>
-    </div>
-</body>
-</html>"""
+        return render_template(
+            "email/welcome.html",
+            name=name,
+            company=company,
+            automation_area=automation_area,
+            problem_text=problem_text,
+        )
 
     def _generate_quote_html(
         self, name: str, project_title: str, quote_url: Optional[str]
     ) -> str:
         """Generate quote email HTML."""
-        cta = ""
-        if quote_url:
-            cta = f"""
-            <p style="text-align: center;">
-                <a href="{quote_url}" style="display: inline-block; background: #fb6400; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; font-weight: 600;">View Your Quote</a>
-            </p>
-            """
-
-        return f"""<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: -apple-system, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%); color: white; padding: 30px; text-align: center; border-radius: 8px; }}
-        .content {{ background: #f8fafc; padding: 30px; border-radius: 8px; margin-top: 20px; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📋 Your Quote is Ready!</h1>
-    </div>
-    <div class="content">
-        <p>Hi {name},</p>
-        <p>Your quote for <strong>{project_title}</strong> is ready.</p>
-        {cta}
-        <p>This quote includes:</p>
-        <ul>
-            <li>📋 Detailed project scope</li>
-            <li>⏱️ Timeline estimates</li>
-            <li>💰 Investment breakdown</li>
-            <li>🚀 Next steps</li>
-        </ul>
-        <p>Reply to this email with any questions!</p>
-        <p>Best,<br><strong>The Are You Human? Team</strong></p>
-    </div>
-</body>
-</html>"""
+        return render_template(
+            "email/quote.html",
+            name=name,
+            project_title=project_title,
+            quote_url=quote_url,
+        )
 
     def _generate_team_notification_html(
         self,
@@ -239,30 +343,11 @@ class EmailService:
         lead_score: Optional[int],
     ) -> str:
         """Generate team notification HTML."""
-        return f"""<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: -apple-system, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: white; padding: 30px; text-align: center; border-radius: 8px; }}
-        .content {{ background: #f0fdf4; padding: 30px; border-radius: 8px; margin-top: 20px; }}
-        table {{ width: 100%; border-collapse: collapse; }}
-        td {{ padding: 8px; border-bottom: 1px solid #e0e0e0; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🎯 New Qualified Lead</h1>
-    </div>
-    <div class="content">
-        <table>
-            <tr><td><strong>Name:</strong></td><td>{lead_name}</td></tr>
-            <tr><td><strong>Email:</strong></td><td><a href="mailto:{lead_email}">{lead_email}</a></td></tr>
-            <tr><td><strong>Company:</strong></td><td>{company or 'Not provided'}</td></tr>
-            <tr><td><strong>Lead Score:</strong></td><td>{lead_score or 'N/A'}/100</td></tr>
-        </table>
-        {f'<div style="background: #fff7ed; border-left: 4px solid #fb6400; padding: 16px; margin-top: 16px;"><p><strong>Project:</strong></p><p>{project_summary}</p></div>' if project_summary else ''}
-        <p style="margin-top: 16px;"><strong>Action Required:</strong> Review and respond within 24 hours.</p>
-    </div>
-</body>
-</html>"""
+        return render_template(
+            "email/team_notification.html",
+            lead_name=lead_name,
+            lead_email=lead_email,
+            company=company,
+            project_summary=project_summary,
+            lead_score=lead_score,
+        )
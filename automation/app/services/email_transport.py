@@ -0,0 +1,169 @@
+"""
+Email Transport
+Async delivery to the Resend HTTP API over a shared keep-alive connection pool
+"""
+
+import base64
+from typing import Any, Optional
+
+import httpx
+import structlog
+
+from ..config import settings
+from ..utils.http import HttpClientRegistry, http_clients
+from ..utils.metrics import EMAIL_SEND_SECONDS, timed
+from ..utils.tracing import span
+
+logger = structlog.get_logger()
+
+# Resend accepts at most this many messages per /emails/batch request
+BATCH_LIMIT = 100
+
+
+class EmailDeliveryError(Exception):
+    """Raised when the provider rejects a message or can't be reached."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        """Network errors, throttling and provider-side failures are worth retrying."""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+def _encode_attachments(attachments: list[dict]) -> list[dict]:
+    """Resend expects attachment content as base64 in JSON bodies."""
+    encoded = []
+    for attachment in attachments:
+        content = attachment.get("content")
+        if isinstance(content, (bytes, bytearray)):
+            attachment = {**attachment, "content": base64.b64encode(content).decode("ascii")}
+        encoded.append(attachment)
+    return encoded
+
+
+class ResendTransport:
+    """
+    Sends email through ``POST {base_url}/emails``.
+
+    The pooled client comes from the shared HTTP client registry under
+    ``client_name``, so TLS handshakes are paid once per pooled connection
+    and the client is closed with the app. Point ``base_url`` at a local
+    fake server, or pass an ``httpx`` transport (e.g. ``httpx.MockTransport``)
+    and a client name of its own, to run without the real provider.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.resend.com",
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 30.0,
+        http_transport: Optional[httpx.AsyncBaseTransport] = None,
+        client_name: str = "resend",
+        clients: HttpClientRegistry = http_clients,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.client_name = client_name
+        self.clients = clients
+        clients.register(
+            client_name,
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            connect_timeout=connect_timeout,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            transport=http_transport,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.clients.get(self.client_name)
+
+    async def _post(self, path: str, payload: Any, headers: Optional[dict] = None) -> Any:
+        with timed(EMAIL_SEND_SECONDS, operation=path), span(f"resend {path}"):
+            try:
+                response = await self.client.post(path, json=payload, headers=headers)
+            except httpx.HTTPError as e:
+                raise EmailDeliveryError(f"{type(e).__name__}: {e}") from e
+
+            if response.status_code >= 400:
+                raise EmailDeliveryError(
+                    f"Resend returned {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code,
+                )
+            return response.json()
+
+    async def send(self, params: dict) -> dict:
+        """
+        Deliver one message.
+
+        Args:
+            params: Resend email object (from, to, subject, html, ...)
+
+        Returns:
+            dict: Provider response, including the message ``id``
+
+        Raises:
+            EmailDeliveryError: On transport errors or a 4xx/5xx response
+        """
+        if params.get("attachments"):
+            params = {**params, "attachments": _encode_attachments(params["attachments"])}
+        return await self._post("/emails", params)
+
+    async def send_batch(self, messages: list[dict]) -> list[dict]:
+        """
+        Deliver up to ``BATCH_LIMIT`` messages in one request.
+
+        Uses permissive validation, so one invalid message doesn't reject
+        the rest. The batch endpoint doesn't take attachments.
+
+        Returns:
+            list[dict]: Per message, in order, ``{"id": ...}`` or ``{"error": ...}``
+
+        Raises:
+            EmailDeliveryError: If the request as a whole fails
+        """
+        if len(messages) > BATCH_LIMIT:
+            raise ValueError(f"At most {BATCH_LIMIT} messages per batch")
+
+        body = await self._post(
+            "/emails/batch", messages, headers={"x-batch-validation": "permissive"}
+        )
+        errors = {e.get("index"): e.get("message", "rejected") for e in body.get("errors") or []}
+        created = iter(body.get("data") or [])
+
+        # Accepted messages are listed in order, skipping rejected indexes
+        results = []
+        for index in range(len(messages)):
+            if index in errors:
+                results.append({"error": errors[index]})
+            else:
+                results.append(next(created, {"error": "missing from batch response"}))
+        return results
+
+    async def aclose(self) -> None:
+        await self.clients.close(self.client_name)
+
+
+# =============================================================================
+# TRANSPORT SINGLETON
+# =============================================================================
+
+email_transport = ResendTransport(
+    api_key=settings.resend_api_key,
+    base_url=settings.resend_base_url,
+    timeout=settings.email_timeout,
+    connect_timeout=settings.email_connect_timeout,
+    max_connections=settings.email_max_connections,
+    max_keepalive_connections=settings.email_max_keepalive_connections,
+    keepalive_expiry=settings.email_keepalive_expiry,
+)
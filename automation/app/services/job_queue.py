@@ -0,0 +1,231 @@
+"""
+Background Job Engine
+Lets webhook endpoints acknowledge immediately while a bounded pool of
+async workers processes the event
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+from ..config import settings
+from ..models.job import Job, JobStatus
+from ..utils.metrics import JOB_QUEUE_DEPTH, JOBS_REJECTED, WEBHOOK_JOB_SECONDS
+from ..utils.tracing import current_span, span
+
+logger = structlog.get_logger()
+
+JobHandler = Callable[[dict], Awaitable[Any]]
+JobCallback = Callable[[Job], Awaitable[None]]
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue has no room for another job."""
+
+
+class JobQueue:
+    """In-process job queue drained by a fixed number of async workers."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_size: int = 1000,
+        job_timeout: float = 120.0,
+        history_size: int = 1000,
+    ):
+        self.workers = workers
+        self.max_size = max_size
+        self.job_timeout = job_timeout
+        self.history_size = history_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._running = 0
+
+        # Counters
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Spawn the worker tasks."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info("Job workers started", workers=self.workers, max_size=self.max_size)
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """
+        Let queued jobs finish (up to ``drain_timeout``), then stop workers.
+        Jobs still queued after that are failed, and their callbacks run.
+        """
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Job queue not drained before shutdown", queued=self._queue.qsize())
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        dropped = 0
+        while not self._queue.empty():
+            job, _, _, on_done, _, _ = self._queue.get_nowait()
+            self._queue.task_done()
+            job.status = JobStatus.FAILED
+            job.error = "Not started before shutdown"
+            job.finished_at = datetime.utcnow()
+            self.failed += 1
+            dropped += 1
+            if on_done is not None:
+                await self._notify(on_done, job)
+        JOB_QUEUE_DEPTH.set(0)
+        logger.info("Job workers stopped", dropped=dropped)
+
+    def submit(
+        self,
+        event: str,
+        handler: JobHandler,
+        data: dict,
+        on_done: Optional[JobCallback] = None,
+    ) -> Job:
+        """
+        Queue a job without waiting for it to run. ``on_done`` is awaited
+        with the job once it has succeeded or failed.
+
+        Raises:
+            JobQueueFull: If the queue is at capacity
+            RuntimeError: If the workers have not been started
+        """
+        if not self._tasks:
+            raise RuntimeError("Job queue is not running")
+
+        job = Job(id=uuid.uuid4().hex, event=event, created_at=datetime.utcnow())
+
+        try:
+            # The request's span goes along so the job joins the same trace
+            self._queue.put_nowait(
+                (job, handler, data, on_done, time.monotonic(), current_span())
+            )
+        except asyncio.QueueFull:
+            self.rejected += 1
+            JOBS_REJECTED.inc()
+            logger.warning("Job queue full, rejecting job", event_type=event)
+            raise JobQueueFull(f"Job queue is full ({self.max_size} jobs)")
+
+        self.submitted += 1
+        JOB_QUEUE_DEPTH.set(self._queue.qsize())
+        self._remember(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a queued, running, or recently finished job."""
+        return self._jobs.get(job_id)
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history_size:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.is_finished:
+                break
+            self._jobs.pop(oldest_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job, handler, data, on_done, enqueued_at, parent = await self._queue.get()
+            JOB_QUEUE_DEPTH.set(self._queue.qsize())
+            started = time.monotonic()
+            self._wait_seconds += started - enqueued_at
+            self._running += 1
+
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.utcnow()
+
+            try:
+                with span(f"job {job.event}", parent=parent, job_id=job.id):
+                    await asyncio.wait_for(handler(data), self.job_timeout)
+                job.status = JobStatus.SUCCEEDED
+                self.succeeded += 1
+            except asyncio.CancelledError:
+                job.status = JobStatus.FAILED
+                job.error = "Cancelled"
+                self.failed += 1
+                raise
+            except asyncio.TimeoutError:
+                job.status = JobStatus.FAILED
+                job.error = f"Timed out after {self.job_timeout}s"
+                self.failed += 1
+                logger.error("Job timed out", job_id=job.id, event_type=job.event)
+            except Exception as e:
+                # The job is readable over the API; details stay in the log
+                job.status = JobStatus.FAILED
+                job.error = "Handler failed"
+                self.failed += 1
+                logger.error("Job failed", job_id=job.id, event_type=job.event, error=str(e))
+            finally:
+                job.finished_at = datetime.utcnow()
+                elapsed = time.monotonic() - started
+                self._run_seconds += elapsed
+                WEBHOOK_JOB_SECONDS.labels(
+                    event=job.event,
+                    outcome="ok" if job.status == JobStatus.SUCCEEDED else "error",
+                ).observe(elapsed)
+                self._running -= 1
+                self._queue.task_done()
+                if on_done is not None:
+                    await self._notify(on_done, job)
+
+    async def _notify(self, on_done: JobCallback, job: Job) -> None:
+        try:
+            await on_done(job)
+        except Exception as e:
+            logger.error("Job completion callback failed", job_id=job.id, error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and throughput counters."""
+        finished = self.succeeded + self.failed
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "running": self._running,
+            "workers": len(self._tasks),
+            "max_size": self.max_size,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self._wait_seconds / finished * 1000, 1) if finished else 0.0,
+            "avg_run_ms": round(self._run_seconds / finished * 1000, 1) if finished else 0.0,
+        }
+
+
+# =============================================================================
+# QUEUE SINGLETON
+# =============================================================================
+
+job_queue = JobQueue(
+    workers=settings.job_workers,
+    max_size=settings.job_queue_max_size,
+    job_timeout=settings.job_timeout,
+    history_size=settings.job_history_size,
+)
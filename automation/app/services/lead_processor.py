@@ -3,27 +3,103 @@ Lead Processing Service
 Handles lead scoring, qualification, and routing
 """
 
+import asyncio
 import json
+import math
 import structlog
-from typing import Optional
-
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Optional, Union
 
 from ..config import settings
 from ..models.lead import Lead, LeadScore, LeadQuality, LeadStatus
-from ..utils.db import get_db
+from ..utils.db import Transaction, get_db
+from ..utils.fanout import stream_batches
+from ..utils.http import http_clients
+from ..utils.metrics import SCORING_FALLBACKS
+from ..utils.keywords import match_keywords
+from ..utils.tracing import traced
+from .openai_guard import GuardRejected, estimate_tokens, openai_guard
+from .scoring_cache import scoring_cache, scoring_fingerprint
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 logger = structlog.get_logger()
 
+# Part of the scoring cache key; bump whenever the prompt changes
+PROMPT_VERSION = "1"
+
+SCORING_SYSTEM_PROMPT = (
+    "You are a lead scoring expert. Analyze leads objectively and return JSON scores."
+)
+
+# Dimension -> maximum points
+SCORE_DIMENSIONS = {
+    "interest_level": 20,
+    "budget_clarity": 20,
+    "urgency": 15,
+    "problem_clarity": 20,
+    "decision_authority": 15,
+    "tech_readiness": 10,
+}
+
+SCORING_RUBRIC = """Score each dimension (be strict but fair):
+
+1. interest_level (0-20): Based on engagement, specificity of questions, follow-through
+2. budget_clarity (0-20): Clear budget = 20, vague = 5-10, no budget = 0-5
+3. urgency (0-15): "ASAP"/"urgent" = 15, specific date = 10-12, "flexible" = 5
+4. problem_clarity (0-20): Detailed problem = 20, generic = 5-10, none = 0
+5. decision_authority (0-15): Owner/C-level = 15, Manager = 10, Employee = 5
+6. tech_readiness (0-10): Uses modern tools = 10, basic = 5, none mentioned = 2"""
+
+# Completion tokens budgeted per lead in a batch request
+BATCH_TOKENS_PER_LEAD = 60
+
+# (lead, provisional score, AI score) -> awaitable
+RescoreCallback = Callable[[Lead, LeadScore, LeadScore], Awaitable[None]]
+
 
 class LeadProcessor:
     """Processes and scores leads using AI analysis."""
 
     def __init__(self):
-        self.openai = AsyncOpenAI(api_key=settings.openai_api_key)
+        # Pool sized to the guard's in-flight cap; the SDK passes its own timeouts
+        http_clients.register("openai", max_connections=settings.openai_max_in_flight)
+        self._openai: Optional["AsyncOpenAI"] = None
+        self._openai_http = None
         self.db = get_db()
-
-    async def score_lead(self, lead: Lead) -> LeadScore:
+        self._background: set[asyncio.Task] = set()
+
+    @property
+    def openai(self) -> "AsyncOpenAI":
+        """OpenAI client on the shared connection pool, rebuilt if the pool was closed."""
+        return self._client()
+
+    def warm_client(self) -> None:
+        """Build the OpenAI client now so the first scoring call doesn't."""
+        self._client()
+
+    def _client(self) -> "AsyncOpenAI":
+        http_client = http_clients.get("openai")
+        if self._openai is None or self._openai_http is not http_client:
+            # Imported here: the SDK is most of the service's import time
+            from openai import AsyncOpenAI
+
+            self._openai = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                timeout=settings.openai_timeout,
+                max_retries=settings.openai_max_retries,
+                http_client=http_client,
+            )
+            self._openai_http = http_client
+        return self._openai
+
+    @traced("score_lead")
+    async def score_lead(
+        self,
+        lead: Lead,
+        budget_ms: Optional[float] = None,
+        on_rescore: Optional[RescoreCallback] = None,
+    ) -> LeadScore:
         """
         Analyze and score a lead using GPT-4.
 
@@ -34,15 +110,324 @@ class LeadProcessor:
         - Problem Clarity (0-20): Well-defined problem vs vague
         - Decision Authority (0-15): Can they make decisions?
         - Tech Readiness (0-10): Technical sophistication
+
+        Args:
+            lead: Lead to score
+            budget_ms: Latency budget (defaults to ``scoring_latency_budget_ms``).
+                If the model hasn't answered in time, the rule-based score is
+                returned and the AI score is applied in the background.
+            on_rescore: Awaited with ``(lead, provisional, ai_score)`` when a
+                deferred AI score changes the lead's quality bucket
+
+        A provisional score is flagged ``provisional``: ``route_lead`` only
+        writes it while the lead has no final score, so it can never
+        overwrite the AI score whichever lands first.
         """
         if not settings.is_openai_configured:
             logger.warning("OpenAI not configured, using rule-based scoring")
+            SCORING_FALLBACKS.labels(reason="unconfigured").inc()
             return self._rule_based_score(lead)
 
-        prompt = f"""Analyze this lead and provide a JSON score.
+        cache_key = scoring_fingerprint(lead, settings.openai_model, PROMPT_VERSION)
+        cached = await scoring_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Lead score cache hit", lead_id=lead.id)
+            return cached
+
+        if budget_ms is None:
+            budget_ms = settings.scoring_latency_budget_ms
+        if not budget_ms:
+            return await self._ai_score(lead, cache_key) or self._rule_based_score(lead)
+
+        ai_task = asyncio.create_task(self._ai_score(lead, cache_key))
+        done, _ = await asyncio.wait({ai_task}, timeout=budget_ms / 1000)
+        if done:
+            return ai_task.result() or self._rule_based_score(lead)
+
+        provisional = self._rule_based_score(lead)
+        provisional.provisional = True
+        SCORING_FALLBACKS.labels(reason="budget").inc()
+        logger.info(
+            "AI scoring over latency budget, using rule-based score",
+            lead_id=lead.id,
+            budget_ms=budget_ms,
+            score=provisional.total,
+        )
+        self._spawn(self._apply_deferred_score(lead, provisional, ai_task, on_rescore))
+        return provisional
 
-Lead Information:
-- Name: {lead.name}
+    async def _ai_score(self, lead: Lead, cache_key: str) -> Optional[LeadScore]:
+        """Score with the model; None if the call is refused or fails."""
+        prompt = self._build_prompt(lead)
+
+        try:
+            response = await openai_guard.run(
+                lambda: self.openai.chat.completions.create(
+                    model=settings.openai_model,
+                    messages=[
+                        {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.3,
+                    max_tokens=200,
+                ),
+                estimated_tokens=estimate_tokens(prompt, 200),
+                operation="score",
+            )
+
+            scores = self._extract_json(response.choices[0].message.content or "{}")
+            score = self._score_from_dict(scores)
+
+        except GuardRejected as e:
+            logger.warning("AI scoring skipped", reason=str(e))
+            SCORING_FALLBACKS.labels(reason="rejected").inc()
+            return None
+
+        except Exception as e:
+            logger.error("AI scoring failed", error=str(e))
+            SCORING_FALLBACKS.labels(reason="error").inc()
+            return None
+
+        await scoring_cache.set(cache_key, score)
+        return score
+
+    async def _apply_deferred_score(
+        self,
+        lead: Lead,
+        provisional: LeadScore,
+        ai_task: "asyncio.Task[Optional[LeadScore]]",
+        on_rescore: Optional[RescoreCallback],
+    ) -> None:
+        """Write a late AI score and re-route if the quality bucket changed."""
+        score = await ai_task
+        if score is None:
+            return
+
+        logger.info(
+            "Deferred AI score ready",
+            lead_id=lead.id,
+            provisional=provisional.total,
+            score=score.total,
+        )
+
+        if score.quality == provisional.quality:
+            if self.db:
+                await self._update_lead_score(lead.id, score)
+            return
+
+        logger.info(
+            "Lead re-routed after AI score",
+            lead_id=lead.id,
+            old_quality=provisional.quality.value,
+            new_quality=score.quality.value,
+        )
+        await self.route_lead(lead, score)
+        if on_rescore:
+            await on_rescore(lead, provisional, score)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        """Run a coroutine in the background, keeping a reference to it."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Deferred scoring failed", error=str(task.exception()))
+
+    async def drain(self, timeout: float = 10.0) -> None:
+        """Wait for deferred AI scores to land (used on shutdown)."""
+        if self._background:
+            await asyncio.wait(set(self._background), timeout=timeout)
+
+    async def score_leads(
+        self, leads: list[Lead], max_wait: Optional[float] = None
+    ) -> list[LeadScore]:
+        """
+        Score many leads with one chat completion per batch.
+
+        Leads are packed into requests of ``scoring_batch_size``. Each
+        per-lead result is validated on its own; a missing or malformed
+        result falls back to rule-based scoring for that lead only.
+        Cached scores are reused and never sent to the model. ``max_wait``
+        is how long each batch may queue for OpenAI capacity (the guard's
+        default when None) before the whole batch falls back.
+
+        Returns:
+            Scores in the same order as ``leads``
+        """
+        if not leads:
+            return []
+
+        if not settings.is_openai_configured:
+            return [self._rule_based_score(lead) for lead in leads]
+
+        results: list[Optional[LeadScore]] = [None] * len(leads)
+        keys = [
+            scoring_fingerprint(lead, settings.openai_model, PROMPT_VERSION)
+            for lead in leads
+        ]
+
+        pending: list[int] = []
+        for i, key in enumerate(keys):
+            results[i] = await scoring_cache.get(key)
+            if results[i] is None:
+                pending.append(i)
+
+        batch_size = max(1, settings.scoring_batch_size)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start : start + batch_size]
+            scores = await self._score_batch([leads[i] for i in chunk], max_wait)
+
+            fallbacks = 0
+            for i, score in zip(chunk, scores):
+                if score is None:
+                    results[i] = self._rule_based_score(leads[i])
+                    fallbacks += 1
+                else:
+                    results[i] = score
+                    await scoring_cache.set(keys[i], score)
+
+            if fallbacks:
+                logger.warning(
+                    "Batch scoring fell back to rules",
+                    batch_size=len(chunk),
+                    fallbacks=fallbacks,
+                )
+
+        return results
+
+    async def score_leads_bulk(
+        self,
+        leads: Union[Iterable[Lead], AsyncIterable[Lead]],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_wait: Optional[float] = None,
+    ) -> AsyncIterator[tuple[Lead, LeadScore]]:
+        """
+        Score an arbitrarily large stream of leads.
+
+        Leads are pulled lazily, grouped into batches and scored with at
+        most ``concurrency`` batch requests in flight, so memory stays
+        bounded and throughput stays steady. Results are yielded in input
+        order (see ``stream_batches``).
+
+        Batches wait up to ``max_wait`` (``scoring_bulk_max_wait``, 0 for
+        no limit) for rate-limit capacity, so a large run is paced by the
+        OpenAI guard's buckets instead of falling back to rule-based
+        scores whenever it outruns them.
+        """
+        if max_wait is None:
+            max_wait = settings.scoring_bulk_max_wait or math.inf
+
+        async def score_batch(batch: list[Lead]) -> list[tuple[Lead, LeadScore]]:
+            return list(zip(batch, await self.score_leads(batch, max_wait)))
+
+        results = stream_batches(
+            leads,
+            score_batch,
+            batch_size or settings.scoring_batch_size,
+            concurrency or settings.scoring_batch_concurrency,
+        )
+        async for result in results:
+            yield result
+
+    async def _score_batch(
+        self, leads: list[Lead], max_wait: Optional[float] = None
+    ) -> list[Optional[LeadScore]]:
+        """Score one batch with a single request; None marks an invalid result."""
+        sections = "\n\n".join(
+            f"Lead {i}:\n{self._format_lead_info(lead)}" for i, lead in enumerate(leads)
+        )
+        prompt = f"""Analyze each of the {len(leads)} leads below and provide JSON scores.
+
+{sections}
+
+{SCORING_RUBRIC}
+
+Respond ONLY with valid JSON containing one result per lead, using the lead number as "index":
+{{"results": [{{"index": 0, "interest_level": X, "budget_clarity": X, "urgency": X, "problem_clarity": X, "decision_authority": X, "tech_readiness": X}}]}}"""
+
+        max_tokens = 50 + BATCH_TOKENS_PER_LEAD * len(leads)
+        try:
+            response = await openai_guard.run(
+                lambda: self.openai.chat.completions.create(
+                    model=settings.openai_model,
+                    messages=[
+                        {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"},
+                ),
+                estimated_tokens=estimate_tokens(prompt, max_tokens),
+                operation="score_batch",
+                max_wait=max_wait,
+            )
+            payload = self._extract_json(response.choices[0].message.content or "{}")
+            items = payload.get("results", []) if isinstance(payload, dict) else payload
+        except GuardRejected as e:
+            logger.warning("AI batch scoring skipped", batch_size=len(leads), reason=str(e))
+            SCORING_FALLBACKS.labels(reason="rejected").inc(len(leads))
+            return [None] * len(leads)
+        except Exception as e:
+            logger.error("AI batch scoring failed", batch_size=len(leads), error=str(e))
+            SCORING_FALLBACKS.labels(reason="error").inc(len(leads))
+            return [None] * len(leads)
+
+        scores: list[Optional[LeadScore]] = [None] * len(leads)
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            if not isinstance(index, int) or not 0 <= index < len(leads):
+                continue
+            if scores[index] is None:
+                scores[index] = self._validated_score(item)
+
+        invalid = scores.count(None)
+        if invalid:
+            SCORING_FALLBACKS.labels(reason="invalid").inc(invalid)
+        return scores
+
+    @staticmethod
+    def _extract_json(content: str) -> Any:
+        """Parse a JSON completion, tolerating markdown code fences."""
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+        return json.loads(content.strip())
+
+    @staticmethod
+    def _score_from_dict(scores: dict) -> LeadScore:
+        """Build a LeadScore, capping each dimension at its maximum."""
+        total = sum(scores.get(dim, 0) for dim in SCORE_DIMENSIONS)
+        return LeadScore(
+            total=min(100, total),
+            **{
+                dim: min(limit, scores.get(dim, 0))
+                for dim, limit in SCORE_DIMENSIONS.items()
+            },
+        )
+
+    def _validated_score(self, item: dict) -> Optional[LeadScore]:
+        """Strictly validate one batch result; None if it is malformed."""
+        for dim in SCORE_DIMENSIONS:
+            value = item.get(dim)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                return None
+        try:
+            return self._score_from_dict({dim: int(item[dim]) for dim in SCORE_DIMENSIONS})
+        except Exception:
+            return None
+
+    @staticmethod
+    def _format_lead_info(lead: Lead) -> str:
+        """Lead fields as prompt bullet lines."""
+        return f"""- Name: {lead.name}
 - Company: {lead.company}
 - Role: {lead.role or 'Not provided'}
 - Industry: {lead.industry or 'Not provided'}
@@ -53,68 +438,20 @@ Lead Information:
 - Budget Range: {lead.budget_range or 'Not provided'}
 - Timeline: {lead.timeline or 'Not provided'}
 - Urgency: {lead.urgency or 'Not provided'}
-- Interest Level (self-reported): {lead.interest_level or 'Not provided'}
+- Interest Level (self-reported): {lead.interest_level or 'Not provided'}"""
 
-Score each dimension (be strict but fair):
+    def _build_prompt(self, lead: Lead) -> str:
+        """Build the scoring prompt. Bump PROMPT_VERSION when changing it."""
+        return f"""Analyze this lead and provide a JSON score.
 
-1. interest_level (0-20): Based on engagement, specificity of questions, follow-through
-2. budget_clarity (0-20): Clear budget = 20, vague = 5-10, no budget = 0-5
-3. urgency (0-15): "ASAP"/"urgent" = 15, specific date = 10-12, "flexible" = 5
-4. problem_clarity (0-20): Detailed problem = 20, generic = 5-10, none = 0
-5. decision_authority (0-15): Owner/C-level = 15, Manager = 10, Employee = 5
-6. tech_readiness (0-10): Uses modern tools = 10, basic = 5, none mentioned = 2
+Lead Information:
+{self._format_lead_info(lead)}
+
+{SCORING_RUBRIC}
 
 Respond ONLY with valid JSON:
 {{"interest_level": X, "budget_clarity": X, "urgency": X, "problem_clarity": X, "decision_authority": X, "tech_readiness": X}}"""
 
-        try:
-            response = await self.openai.chat.completions.create(
-                model=settings.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a lead scoring expert. Analyze leads objectively and return JSON scores.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-                max_tokens=200,
-            )
-
-            content = response.choices[0].message.content or "{}"
-            # Extract JSON from response
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            scores = json.loads(content.strip())
-
-            total = sum(
-                [
-                    scores.get("interest_level", 0),
-                    scores.get("budget_clarity", 0),
-                    scores.get("urgency", 0),
-                    scores.get("problem_clarity", 0),
-                    scores.get("decision_authority", 0),
-                    scores.get("tech_readiness", 0),
-                ]
-            )
-
-            return LeadScore(
-                total=min(100, total),
-                interest_level=min(20, scores.get("interest_level", 0)),
-                budget_clarity=min(20, scores.get("budget_clarity", 0)),
-                urgency=min(15, scores.get("urgency", 0)),
-                problem_clarity=min(20, scores.get("problem_clarity", 0)),
-                decision_authority=min(15, scores.get("decision_authority", 0)),
-                tech_readiness=min(10, scores.get("tech_readiness", 0)),
-            )
-
-        except Exception as e:
-            logger.error("AI scoring failed", error=str(e))
-            return self._rule_based_score(lead)
-
     def _rule_based_score(self, lead: Lead) -> LeadScore:
         """Fallback rule-based scoring when AI is unavailable."""
         scores = {
@@ -132,20 +469,20 @@ Respond ONLY with valid JSON:
 
         # Budget clarity
         if lead.budget_range:
-            budget = lead.budget_range.lower()
-            if "$" in budget or any(x in budget for x in ["k", "50", "100", "20"]):
+            budget = match_keywords("budget", lead.budget_range)
+            if "amount" in budget:
                 scores["budget_clarity"] = 15
-            elif "flexible" in budget or "discuss" in budget:
+            elif "flexible" in budget:
                 scores["budget_clarity"] = 10
             else:
                 scores["budget_clarity"] = 5
 
         # Urgency
         if lead.urgency or lead.timeline:
-            text = (lead.urgency or lead.timeline or "").lower()
-            if any(x in text for x in ["asap", "urgent", "immediately", "now"]):
+            urgency = match_keywords("urgency", lead.urgency or lead.timeline)
+            if "immediate" in urgency:
                 scores["urgency"] = 15
-            elif any(x in text for x in ["month", "week", "soon"]):
+            elif "soon" in urgency:
                 scores["urgency"] = 10
             else:
                 scores["urgency"] = 5
@@ -164,10 +501,10 @@ Respond ONLY with valid JSON:
 
         # Decision authority (based on role)
         if lead.role:
-            role = lead.role.lower()
-            if any(x in role for x in ["ceo", "cto", "founder", "owner", "director"]):
+            role = match_keywords("role", lead.role)
+            if "executive" in role:
                 scores["decision_authority"] = 15
-            elif any(x in role for x in ["manager", "head", "lead", "vp"]):
+            elif "manager" in role:
                 scores["decision_authority"] = 10
             else:
                 scores["decision_authority"] = 5
@@ -180,10 +517,14 @@ Respond ONLY with valid JSON:
 
         return LeadScore(total=total, **scores)
 
-    async def route_lead(self, lead: Lead, score: LeadScore) -> str:
+    @traced("route_lead")
+    async def route_lead(
+        self, lead: Lead, score: LeadScore, tx: Optional[Transaction] = None
+    ) -> str:
         """
         Route lead to appropriate workflow based on score.
 
+        With ``tx`` the score and status are written inside that transaction.
         Returns the workflow that was triggered.
         """
         logger.info(
@@ -194,8 +535,8 @@ Respond ONLY with valid JSON:
         )
 
         # Update lead score in database
-        if self.db:
-            await self._update_lead_score(lead.id, score)
+        if tx or self.db:
+            await self._update_lead_score(lead.id, score, tx)
 
         if score.quality == LeadQuality.HIGH:
             return await self._handle_qualified_lead(lead, score)
@@ -204,22 +545,36 @@ Respond ONLY with valid JSON:
         else:
             return await self._handle_low_quality_lead(lead, score)
 
-    async def _update_lead_score(self, lead_id: str, score: LeadScore) -> None:
-        """Update lead score in database."""
+    async def _update_lead_score(
+        self, lead_id: str, score: LeadScore, tx: Optional[Transaction] = None
+    ) -> None:
+        """
+        Update lead score in database.
+
+        A final score stamps ``scored_at``; a provisional one is skipped once
+        that is set, so a late provisional write can't undo the AI score.
+        """
         try:
             status = (
                 LeadStatus.QUALIFIED.value
                 if score.quality == LeadQuality.HIGH
                 else LeadStatus.NURTURE.value
             )
-            await self.db.update(
-                "leads",
-                {"lead_score": score.total, "status": status},
-                "id = %s",
-                (lead_id,),
-            )
+            if score.provisional:
+                query = (
+                    "UPDATE leads SET lead_score = %s, status = %s "
+                    "WHERE id = %s AND scored_at IS NULL"
+                )
+            else:
+                query = (
+                    "UPDATE leads SET lead_score = %s, status = %s, scored_at = NOW() "
+                    "WHERE id = %s"
+                )
+            await (tx or self.db).execute(query, (score.total, status, lead_id))
         except Exception as e:
             logger.error("Failed to update lead score", error=str(e))
+            if tx:
+                raise
 
     async def _handle_qualified_lead(self, lead: Lead, score: LeadScore) -> str:
         """Handle high-quality leads - generate quote and notify team."""
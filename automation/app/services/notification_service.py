@@ -9,15 +9,88 @@ import httpx
 import structlog
 
 from ..config import settings
+from ..utils.http import http_clients
+from ..utils.metrics import SLACK_SEND_SECONDS, timed
+from ..utils.tracing import span
 
 logger = structlog.get_logger()
 
 
+class NotificationError(Exception):
+    """Raised when Slack rejects a message or can't be reached."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after  # Seconds Slack asked us to wait (429 only)
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
 class NotificationService:
     """Sends notifications to various channels."""
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=10.0)
+        http_clients.register("slack")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return http_clients.get("slack")
+
+    def slack_payload(
+        self,
+        message: str,
+        channel: Optional[str] = None,
+        blocks: Optional[list] = None,
+    ) -> dict:
+        """Build an incoming-webhook payload."""
+        payload = {"text": message}
+
+        if channel:
+            payload["channel"] = channel
+
+        if blocks:
+            payload["blocks"] = blocks
+
+        return payload
+
+    async def deliver(self, payload: dict) -> None:
+        """
+        Post a prepared payload to the Slack webhook.
+
+        Raises:
+            NotificationError: On transport errors or a non-200 response
+        """
+        if not settings.is_slack_configured:
+            logger.warning("Slack not configured, skipping notification")
+            return
+
+        with timed(SLACK_SEND_SECONDS), span("slack.post"):
+            try:
+                response = await self.client.post(settings.slack_webhook_url, json=payload)
+            except httpx.HTTPError as e:
+                raise NotificationError(f"{type(e).__name__}: {e}") from e
+
+            if response.status_code != 200:
+                raise NotificationError(
+                    f"Slack returned {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code,
+                    retry_after=_retry_after(response),
+                )
 
     async def send_slack(
         self,
@@ -36,34 +109,22 @@ class NotificationService:
         Returns:
             bool: True if sent successfully
         """
+        return await self.send_payload(self.slack_payload(message, channel, blocks))
+
+    async def send_payload(self, payload: dict) -> bool:
+        """Deliver a prepared payload, logging instead of raising."""
         if not settings.is_slack_configured:
             logger.warning("Slack not configured, skipping notification")
             return False
 
         try:
-            payload = {"text": message}
-
-            if channel:
-                payload["channel"] = channel
+            await self.deliver(payload)
+            logger.info("Slack notification sent", message=payload.get("text", "")[:50])
+            return True
 
-            if blocks:
-                payload["blocks"] = blocks
-
-            response = await self.client.post(
-                settings.slack_webhook_url,
-                json=payload,
-            )
-
-            if response.status_code == 200:
-                logger.info("Slack notification sent", message=message[:50])
-                return True
-            else:
-                logger.error(
-                    "Slack notification failed",
-                    status=response.status_code,
-                    response=response.text,
-                )
-                return False
+        except NotificationError as e:
+            logger.error("Slack notification failed", status=e.status_code, error=str(e))
+            return False
 
         except Exception as e:
             logger.error("Slack notification error", error=str(e))
@@ -78,6 +139,19 @@ class NotificationService:
         automation_area: Optional[str] = None,
     ) -> bool:
         """Send notification for new qualified lead."""
+        return await self.send_payload(
+            self.new_lead_message(lead_name, lead_email, company, lead_score, automation_area)
+        )
+
+    def new_lead_message(
+        self,
+        lead_name: str,
+        lead_email: str,
+        company: Optional[str] = None,
+        lead_score: Optional[int] = None,
+        automation_area: Optional[str] = None,
+    ) -> dict:
+        """Slack payload for a new qualified lead."""
         score_emoji = "🟢" if (lead_score or 0) >= 70 else "🟡" if (lead_score or 0) >= 40 else "🔴"
 
         blocks = [
@@ -118,7 +192,7 @@ class NotificationService:
                         "type": "button",
                         "text": {"type": "plain_text", "text": "View in CRM", "emoji": True},
                         "style": "primary",
-                        "url": f"https://supabase.com/dashboard",
+                        "url": "https://supabase.com/dashboard",
                     },
                     {
                         "type": "button",
@@ -130,7 +204,7 @@ class NotificationService:
         )
 
         message = f"New lead: {lead_name} from {company or 'Unknown'} (Score: {lead_score or 'N/A'})"
-        return await self.send_slack(message, blocks=blocks)
+        return self.slack_payload(message, blocks=blocks)
 
     async def notify_quote_accepted(
         self,
@@ -140,6 +214,18 @@ class NotificationService:
         amount: float,
     ) -> bool:
         """Send notification when quote is accepted."""
+        return await self.send_payload(
+            self.quote_accepted_message(lead_name, company, project_title, amount)
+        )
+
+    def quote_accepted_message(
+        self,
+        lead_name: str,
+        company: Optional[str],
+        project_title: str,
+        amount: float,
+    ) -> dict:
+        """Slack payload for an accepted quote."""
         blocks = [
             {
                 "type": "header",
@@ -165,7 +251,7 @@ class NotificationService:
         ]
 
         message = f"Quote accepted! {lead_name} - {project_title} (${amount:,.2f})"
-        return await self.send_slack(message, blocks=blocks)
+        return self.slack_payload(message, blocks=blocks)
 
     async def notify_quote_declined(
         self,
@@ -175,6 +261,18 @@ class NotificationService:
         reason: Optional[str] = None,
     ) -> bool:
         """Send notification when quote is declined."""
+        return await self.send_payload(
+            self.quote_declined_message(lead_name, company, project_title, reason)
+        )
+
+    def quote_declined_message(
+        self,
+        lead_name: str,
+        company: Optional[str],
+        project_title: str,
+        reason: Optional[str] = None,
+    ) -> dict:
+        """Slack payload for a declined quote."""
         blocks = [
             {
                 "type": "header",
@@ -199,8 +297,8 @@ class NotificationService:
             )
 
         message = f"Quote declined: {lead_name} - {project_title}"
-        return await self.send_slack(message, blocks=blocks)
+        return self.slack_payload(message, blocks=blocks)
 
     async def close(self):
         """Close the HTTP client."""
-        await self.client.aclose()
+        await http_clients.close("slack")
@@ -0,0 +1,311 @@
+"""
+OpenAI Downstream Guard
+Rate limiting, concurrency cap and circuit breaker around chat completions
+"""
+
+import asyncio
+import math
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import structlog
+
+from ..config import settings
+from ..utils.metrics import OPENAI_REQUEST_SECONDS, OPENAI_TOKENS, timed
+from ..utils.tracing import span
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class GuardRejected(Exception):
+    """Raised when the guard refuses a call; callers should fall back."""
+
+
+class CircuitOpenError(GuardRejected):
+    """Raised while the circuit breaker is open."""
+
+
+class RateLimitExceeded(GuardRejected):
+    """Raised when capacity doesn't free up within the allowed wait."""
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate_per_minute``.
+
+    The balance may go negative when actual usage exceeds the estimate;
+    later callers then wait for the debt to be repaid.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= amount
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures.
+
+    After ``reset_timeout`` seconds a single trial call is let through
+    (half-open); success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        # Counters
+        self.times_opened = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if (
+            self._state == BreakerState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = BreakerState.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == BreakerState.CLOSED:
+            return True
+        if state == BreakerState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot that was never used."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        if self._state != BreakerState.CLOSED:
+            logger.info("OpenAI circuit breaker closed")
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._state == BreakerState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != BreakerState.OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    "OpenAI circuit breaker opened",
+                    failures=self._failures,
+                    reset_timeout=self.reset_timeout,
+                )
+            self._state = BreakerState.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, Any]:
+        state = self.state
+        return {
+            "state": state.value,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "retry_in_seconds": (
+                round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+                if state == BreakerState.OPEN
+                else None
+            ),
+        }
+
+
+class OpenAIGuard:
+    """Admission control for calls to the OpenAI API."""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200000,
+        max_in_flight: int = 8,
+        max_wait: float = 5.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+        # Counters
+        self.calls = 0
+        self.failures = 0
+        self.rejected_open = 0
+        self.rejected_rate = 0
+
+    @staticmethod
+    def _remaining(deadline: float) -> Optional[float]:
+        """Timeout left until ``deadline``; None when the wait is unbounded."""
+        if deadline == math.inf:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    async def _admit(self, estimated_tokens: int, deadline: float) -> None:
+        """Wait for rate-limit capacity, or raise if it won't come in time."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # Serialize reservations so waiters are served in order
+        await asyncio.wait_for(self._lock.acquire(), self._remaining(deadline))
+        try:
+            delay = max(
+                self.requests.delay_for(1) if self.requests else 0.0,
+                self.tokens.delay_for(estimated_tokens) if self.tokens else 0.0,
+            )
+            if time.monotonic() + delay > deadline:
+                self.rejected_rate += 1
+                raise RateLimitExceeded(f"OpenAI rate limit: {delay:.1f}s wait exceeds budget")
+            if delay:
+                await asyncio.sleep(delay)
+            if self.requests:
+                self.requests.consume(1)
+            if self.tokens:
+                self.tokens.consume(estimated_tokens)
+        finally:
+            self._lock.release()
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        operation: str = "chat",
+        max_wait: Optional[float] = None,
+    ) -> T:
+        """
+        Run ``call`` under the guard.
+
+        Args:
+            call: Zero-argument factory returning the API coroutine
+            estimated_tokens: Prompt plus completion tokens to reserve
+            operation: Label for the latency histogram
+            max_wait: Seconds to wait for capacity, overriding the guard's
+                default; ``math.inf`` waits as long as it takes (for
+                background work that would rather be late than degraded)
+
+        Raises:
+            CircuitOpenError: The breaker is open
+            RateLimitExceeded: No capacity within ``max_wait`` seconds
+        """
+        if not self.breaker.allow():
+            self.rejected_open += 1
+            raise CircuitOpenError("OpenAI circuit breaker is open")
+
+        deadline = time.monotonic() + (self.max_wait if max_wait is None else max_wait)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        try:
+            await self._admit(estimated_tokens, deadline)
+            await asyncio.wait_for(self._semaphore.acquire(), self._remaining(deadline))
+        except asyncio.TimeoutError:
+            self.rejected_rate += 1
+            self.breaker.release_trial()
+            raise RateLimitExceeded("OpenAI capacity: no slot within budget")
+        except GuardRejected:
+            self.breaker.release_trial()
+            raise
+
+        self._in_flight += 1
+        self.calls += 1
+        try:
+            with timed(OPENAI_REQUEST_SECONDS, operation=operation), span(f"openai.{operation}"):
+                result = await call()
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+        self.breaker.record_success()
+
+        # Settle the token reservation against actual usage
+        usage = getattr(result, "usage", None)
+        if self.tokens and usage is not None and getattr(usage, "total_tokens", None):
+            self.tokens.consume(usage.total_tokens - estimated_tokens)
+        if usage is not None:
+            OPENAI_TOKENS.labels(kind="prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+            OPENAI_TOKENS.labels(kind="completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "breaker": self.breaker.stats(),
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "requests_available": round(self.requests.available, 1) if self.requests else None,
+            "tokens_available": round(self.tokens.available) if self.tokens else None,
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected_open": self.rejected_open,
+            "rejected_rate": self.rejected_rate,
+        }
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token estimate (~4 characters per token) plus the completion cap."""
+    return len(prompt) // 4 + max_tokens
+
+
+# =============================================================================
+# GUARD SINGLETON
+# =============================================================================
+
+openai_guard = OpenAIGuard(
+    requests_per_minute=settings.openai_rpm_limit,
+    tokens_per_minute=settings.openai_tpm_limit,
+    max_in_flight=settings.openai_max_in_flight,
+    max_wait=settings.openai_max_wait,
+    failure_threshold=settings.openai_breaker_failure_threshold,
+    reset_timeout=settings.openai_breaker_reset_seconds,
+)
@@ -0,0 +1,316 @@
+"""
+Outbox
+Durable delivery of outbound emails and Slack messages. Messages are inserted
+in the same transaction as the status change that triggers them and drained
+by a pool of dispatcher workers.
+"""
+
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+from ..config import settings
+from ..utils.db import Transaction, get_db
+from ..utils.tracing import span
+
+logger = structlog.get_logger()
+
+OutboxHandler = Callable[[dict], Awaitable[Any]]
+
+EMAIL = "email"
+SLACK = "slack"
+
+# Headroom between a handler's longest run and the claim lease
+LEASE_MARGIN = 30.0
+
+
+@dataclass
+class OutboxMessage:
+    """
+    One outbound message; ``name`` labels it in logs and fan-out results.
+    Messages about a lead carry its ``lead_id`` so they can be withdrawn.
+    """
+
+    kind: str
+    payload: dict
+    name: str = ""
+    lead_id: Optional[str] = None
+
+
+async def enqueue(tx: Transaction, message: OutboxMessage) -> None:
+    """Insert a message as part of the caller's transaction."""
+    await tx.execute(
+        "INSERT INTO outbox (kind, name, lead_id, payload) VALUES (%s, %s, %s, %s::jsonb)",
+        (message.kind, message.name, message.lead_id, json.dumps(message.payload)),
+    )
+
+
+async def withdraw(lead_id: str, names: list[str]) -> int:
+    """
+    Stop pending messages about a lead from going out. Returns how many were
+    withdrawn; one a worker is delivering at that moment still goes out.
+    """
+    db = get_db()
+    if not db:
+        return 0
+    rows = await db.execute(
+        """
+        UPDATE outbox SET status = 'withdrawn'
+        WHERE lead_id = %s AND name = ANY(%s) AND status = 'pending'
+        RETURNING id
+        """,
+        (lead_id, names),
+    )
+    return len(rows)
+
+
+def backoff_delay(attempts: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempts)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempts)))
+
+
+class OutboxDispatcher:
+    """
+    Delivers pending outbox rows with ``concurrency`` workers.
+
+    Each worker claims up to ``batch_size`` due rows with ``FOR UPDATE SKIP
+    LOCKED``, so workers (and machines) never pick the same row. A claim
+    pushes ``available_at`` out by ``lease_seconds``; if the process dies
+    mid-delivery the row becomes due again after the lease, so the lease is
+    kept longer than any registered handler can run. Failures are retried
+    with jittered backoff until ``max_attempts``, then dead-lettered; if
+    recording the outcome fails, the row is simply picked up again once its
+    lease expires.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        max_attempts: int = 8,
+        backoff_base: float = 2.0,
+        backoff_max: float = 600.0,
+        lease_seconds: float = 60.0,
+    ):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.handlers: dict[str, OutboxHandler] = {}
+        self._workers: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+
+        # Counters
+        self.claimed = 0
+        self.delivered = 0
+        self.retried = 0
+        self.dead = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether messages should go through the outbox rather than be sent inline."""
+        return settings.outbox_enabled and settings.is_database_configured
+
+    def register(
+        self, kind: str, handler: OutboxHandler, max_duration: Optional[float] = None
+    ) -> None:
+        """
+        Set the delivery function for a message kind. It must raise on failure.
+
+        ``max_duration`` is the longest the handler can take (e.g. a queue's
+        wait limit); the lease is extended past it so a row is never
+        reclaimed, and sent twice, while its first delivery is still pending.
+        """
+        self.handlers[kind] = handler
+        if max_duration is not None and self.lease_seconds < max_duration + LEASE_MARGIN:
+            self.lease_seconds = max_duration + LEASE_MARGIN
+            logger.info("Outbox lease extended", kind=kind, lease_seconds=self.lease_seconds)
+
+    async def start(self) -> None:
+        if self._running or not self.enabled:
+            return
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"outbox-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info("Outbox dispatcher started", workers=self.concurrency)
+
+    async def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Outbox dispatcher stopped", **self.stats())
+
+    def wake(self) -> None:
+        """Poke idle workers after a commit instead of waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _worker(self, index: int) -> None:
+        while self._running:
+            try:
+                rows = await self.claim()
+            except Exception as e:
+                logger.error("Outbox claim failed", worker=index, error=str(e))
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if not rows:
+                await self._idle()
+                continue
+
+            # Deliver the batch together so Slack bursts can share a digest
+            results = await asyncio.gather(
+                *(self._deliver(row) for row in rows), return_exceptions=True
+            )
+            for row, result in zip(rows, results):
+                if isinstance(result, Exception):
+                    # The row keeps its lease and is claimed again when it expires
+                    logger.error(
+                        "Outbox delivery bookkeeping failed",
+                        worker=index,
+                        outbox_id=row["id"],
+                        kind=row["kind"],
+                        error=str(result),
+                    )
+
+    async def claim(self) -> list[dict]:
+        """Lease a batch of due rows for this worker."""
+        db = get_db()
+        if not db:
+            return []
+        rows = await db.execute(
+            """
+            WITH due AS (
+                SELECT id FROM outbox
+                WHERE status = 'pending' AND available_at <= NOW()
+                ORDER BY available_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE outbox o
+            SET attempts = o.attempts + 1,
+                available_at = NOW() + make_interval(secs => %s)
+            FROM due
+            WHERE o.id = due.id
+            RETURNING o.id, o.kind, o.payload, o.attempts
+            """,
+            (self.batch_size, self.lease_seconds),
+        )
+        self.claimed += len(rows)
+        return rows
+
+    async def _deliver(self, row: dict) -> None:
+        with span(
+            "outbox.deliver", kind=row["kind"], outbox_id=row["id"], attempt=row["attempts"]
+        ) as current:
+            db = get_db()
+            handler = self.handlers.get(row["kind"])
+
+            try:
+                if handler is None:
+                    raise ValueError(f"No outbox handler for {row['kind']!r}")
+                await handler(row["payload"])
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"[:500]
+                if current is not None:
+                    current.error = error
+                retryable = handler is not None and getattr(e, "retryable", True)
+
+                if not retryable or row["attempts"] >= self.max_attempts:
+                    self.dead += 1
+                    logger.error(
+                        "Outbox message dead-lettered",
+                        outbox_id=row["id"],
+                        kind=row["kind"],
+                        attempts=row["attempts"],
+                        error=error,
+                    )
+                    await db.execute(
+                        "UPDATE outbox SET status = 'dead', last_error = %s "
+                        "WHERE id = %s AND status = 'pending'",
+                        (error, row["id"]),
+                    )
+                    return
+
+                delay = backoff_delay(row["attempts"], self.backoff_base, self.backoff_max)
+                self.retried += 1
+                logger.warning(
+                    "Outbox delivery failed, will retry",
+                    outbox_id=row["id"],
+                    kind=row["kind"],
+                    attempts=row["attempts"],
+                    retry_in=round(delay, 1),
+                    error=error,
+                )
+                await db.execute(
+                    """
+                    UPDATE outbox
+                    SET available_at = NOW() + make_interval(secs => %s), last_error = %s
+                    WHERE id = %s AND status = 'pending'
+                    """,
+                    (delay, error, row["id"]),
+                )
+                return
+
+            self.delivered += 1
+            await db.execute(
+                "UPDATE outbox SET status = 'sent', sent_at = NOW(), last_error = NULL WHERE id = %s",
+                (row["id"],),
+            )
+
+    async def deliver_now(self, message: OutboxMessage) -> bool:
+        """Send a message inline, bypassing the table (used without a database)."""
+        try:
+            await self.handlers[message.kind](message.payload)
+            return True
+        except Exception as e:
+            logger.error("Direct delivery failed", kind=message.kind, name=message.name, error=str(e))
+            return False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._running,
+            "workers": len(self._workers),
+            "claimed": self.claimed,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
+
+
+# =============================================================================
+# DISPATCHER SINGLETON
+# =============================================================================
+
+outbox_dispatcher = OutboxDispatcher(
+    concurrency=settings.outbox_concurrency,
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval,
+    max_attempts=settings.outbox_max_attempts,
+    backoff_base=settings.outbox_backoff_base,
+    backoff_max=settings.outbox_backoff_max,
+    lease_seconds=settings.outbox_lease_seconds,
+)
@@ -0,0 +1,212 @@
+"""
+Quote PDF Cache
+Content-addressed cache of rendered quote PDFs: a small memory tier for hot
+entries in front of a size-bounded on-disk LRU store
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+import structlog
+
+from ..config import settings
+from ..models.lead import Lead
+from ..models.quote import Quote
+from ..utils.cache import TTLCache
+
+logger = structlog.get_logger()
+
+# Fields that appear in the rendered PDF; lifecycle fields (status, sent_at,
+# viewed_at, ...) are left out so they don't invalidate the cache
+QUOTE_PDF_FIELDS = (
+    "id",
+    "project_title",
+    "project_summary",
+    "scope_items",
+    "currency",
+    "valid_until",
+    "created_at",
+)
+LEAD_PDF_FIELDS = ("name", "company", "email")
+
+
+def pdf_cache_key(quote: Quote, lead: Lead, template_version: str) -> str:
+    """Hash everything that determines the bytes of a quote PDF."""
+    material = {
+        "quote": quote.model_dump(mode="json", include=set(QUOTE_PDF_FIELDS)),
+        "lead": lead.model_dump(mode="json", include=set(LEAD_PDF_FIELDS)),
+        "template": template_version,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    """
+    Two-tier cache of PDF bytes.
+
+    Files are stored as ``<quote_id>.<key>.pdf`` so every version of a
+    quote can be found and dropped when a newer one is stored. The disk
+    tier is evicted least-recently-used once it exceeds ``max_bytes``;
+    recency is kept in file mtimes so it survives restarts. The memory tier
+    is keyed by ``(quote_id, key)`` so storing a new version drops old ones
+    that never made it to disk too.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, memory_items: int = 32):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.memory = TTLCache(max_size=memory_items)
+        self._index: Optional[OrderedDict[str, int]] = None  # filename -> size, LRU first
+        self._bytes = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+        # Counters
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _filename(quote_id: str, key: str) -> str:
+        return f"{quote_id}.{key}.pdf"
+
+    def _load_index(self) -> None:
+        """Build the LRU index from the files already on disk."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.name, stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((name, size) for _, name, size in entries)
+        self._bytes = sum(self._index.values())
+
+    async def _ready(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._index is None:
+            async with self._lock:
+                if self._index is None:
+                    await asyncio.to_thread(self._load_index)
+        return self._lock
+
+    async def get(self, quote_id: str, key: str) -> Optional[bytes]:
+        pdf_bytes = self.memory.get((quote_id, key))
+        if pdf_bytes is not None:
+            return pdf_bytes
+
+        lock = await self._ready()
+        name = self._filename(quote_id, key)
+        async with lock:
+            if name not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(name)
+
+        path = self.directory / name
+        try:
+            pdf_bytes = await asyncio.to_thread(path.read_bytes)
+            await asyncio.to_thread(os.utime, path)
+        except OSError as e:
+            logger.warning("PDF cache read failed", quote_id=quote_id, error=str(e))
+            async with lock:
+                self._drop(name)
+            self.misses += 1
+            return None
+
+        self.memory.set((quote_id, key), pdf_bytes)
+        self.disk_hits += 1
+        return pdf_bytes
+
+    async def set(self, quote_id: str, key: str, pdf_bytes: bytes) -> None:
+        """Store a render and drop older versions of the same quote."""
+        await self._drop_versions(quote_id)
+        self.memory.set((quote_id, key), pdf_bytes)
+
+        if len(pdf_bytes) > self.max_bytes:
+            return
+
+        lock = await self._ready()
+        name = self._filename(quote_id, key)
+
+        try:
+            await asyncio.to_thread(self._write, name, pdf_bytes)
+        except OSError as e:
+            logger.warning("PDF cache write failed", quote_id=quote_id, error=str(e))
+            return
+
+        async with lock:
+            self._bytes += len(pdf_bytes) - self._index.pop(name, 0)
+            self._index[name] = len(pdf_bytes)
+            while self._bytes > self.max_bytes and self._index:
+                oldest = next(iter(self._index))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _write(self, name: str, pdf_bytes: bytes) -> None:
+        """Write a file atomically through a temp file unique to this writer."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp, self.directory / name)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    async def _drop_versions(self, quote_id: str) -> None:
+        """Remove every cached version of a quote from both tiers."""
+        for cached in self.memory.keys():
+            if cached[0] == quote_id:
+                self.memory.pop(cached)
+
+        lock = await self._ready()
+        prefix = f"{quote_id}."
+        async with lock:
+            for name in [name for name in self._index if name.startswith(prefix)]:
+                self._drop(name)
+
+    def _drop(self, name: str) -> None:
+        self._bytes -= self._index.pop(name, 0)
+        try:
+            (self.directory / name).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("PDF cache unlink failed", file=name, error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        memory = self.memory.stats()
+        hits = memory["hits"] + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_items": memory["size"],
+            "disk_items": len(self._index) if self._index is not None else None,
+            "disk_bytes": self._bytes,
+        }
+
+
+# =============================================================================
+# CACHE SINGLETON
+# =============================================================================
+
+pdf_cache = PdfCache(
+    directory=settings.pdf_cache_dir,
+    max_bytes=settings.pdf_cache_max_mb * 1024 * 1024,
+    memory_items=settings.pdf_cache_memory_items,
+)
@@ -0,0 +1,257 @@
+"""
+PDF Rendering Service
+Renders HTML to PDF in a bounded pool of pre-warmed worker processes so
+WeasyPrint's CPU work never blocks the event loop
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+import structlog
+
+from ..config import settings
+from ..utils.metrics import PDF_RENDER_SECONDS, timed
+from ..utils.tracing import span
+
+logger = structlog.get_logger()
+
+# Exercises the fonts used by the quote template during warm-up
+_WARMUP_HTML = """<!DOCTYPE html><html><head><meta charset="utf-8"><style>
+body { font-family: 'Helvetica Neue', Arial, sans-serif; }</style></head>
+<body><strong>Are You Human?</strong> <em>warm-up</em> $1,234.00</body></html>"""
+
+
+class RenderQueueFull(Exception):
+    """Raised when too many renders are already waiting."""
+
+
+class RenderTimeout(Exception):
+    """Raised when a render doesn't finish within the timeout."""
+
+
+# =============================================================================
+# WORKER PROCESS FUNCTIONS
+# =============================================================================
+
+
+def _init_worker() -> None:
+    """Import WeasyPrint and load fonts once per worker process."""
+    try:
+        from weasyprint import HTML
+
+        HTML(string=_WARMUP_HTML).write_pdf()
+    except Exception as e:
+        # Renders will raise the same error; the worker itself stays usable
+        logger.warning("PDF worker warm-up render failed", error=f"{type(e).__name__}: {e}")
+
+
+def _render(html: str) -> bytes:
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf()
+
+
+def _ping() -> bool:
+    return True
+
+
+# =============================================================================
+# RENDERER
+# =============================================================================
+
+
+class PdfRenderer:
+    """
+    Bounded process pool for HTML -> PDF rendering.
+
+    At most ``workers`` renders run at once and ``queue_size`` more may
+    wait; beyond that callers get RenderQueueFull. A render that exceeds
+    ``timeout`` is cancelled; if it was already running, the pool is
+    recycled: a fresh pool takes over and the old one is shut down, its
+    stuck worker exiting once the render returns (or terminated, where the
+    executor supports ``terminate_workers``). Only the pool a failure came
+    from is ever recycled, so a second failure from the same pool doesn't
+    tear down its replacement. After ``stop()`` renders raise until the
+    renderer is started again.
+    """
+
+    def __init__(self, workers: int = 1, queue_size: int = 8, timeout: float = 30.0):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._warming: Optional[asyncio.Task] = None
+        self._stopped = False
+
+        # Counters
+        self.renders = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._wait_seconds = 0.0
+        self._render_seconds = 0.0
+        self._max_render_seconds = 0.0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    async def start(self) -> None:
+        """Start and pre-warm the worker processes."""
+        self._stopped = False
+        if self.workers <= 0 or self._executor:
+            return
+
+        started = time.perf_counter()
+        self._executor = self._new_executor()
+        await self._warm(self._executor)
+        logger.info(
+            "PDF workers ready",
+            workers=self.workers,
+            warmup_ms=round((time.perf_counter() - started) * 1000),
+        )
+
+    async def _warm(self, executor: ProcessPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        # One call per worker forces every process to spawn and initialize
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, _ping) for _ in range(self.workers)),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            logger.warning("PDF worker warm-up failed", error=str(errors[0]))
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _recycle(self, executor: ProcessPoolExecutor, reason: str) -> None:
+        """Replace ``executor`` after one of its workers got stuck or died."""
+        if executor is not self._executor:
+            return  # Already replaced
+        self._executor = self._new_executor()
+        self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+        terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+        self._warming = asyncio.get_running_loop().create_task(self._warm(self._executor))
+        logger.warning("PDF worker pool recycled", reason=reason)
+
+    async def render(self, html: str) -> bytes:
+        """
+        Render HTML to PDF bytes.
+
+        Raises:
+            RenderQueueFull: Too many renders already waiting
+            RenderTimeout: Render didn't finish within ``timeout``
+            ImportError: WeasyPrint isn't installed
+            RuntimeError: The renderer has been stopped
+        """
+        if self._stopped:
+            raise RuntimeError("PDF renderer is stopped")
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(max(1, self.workers))
+
+        if self.workers > 0 and self._executor is None:
+            # Not started at boot (lazy_init): spawn the pool on first use
+            self._executor = self._new_executor()
+            self._warming = asyncio.get_running_loop().create_task(self._warm(self._executor))
+
+        if self._pending >= max(1, self.workers) + self.queue_size:
+            self.rejected += 1
+            raise RenderQueueFull("PDF render queue is full")
+
+        self._pending += 1
+        queued = time.perf_counter()
+        try:
+            async with self._slots:
+                if self._warming is not None:
+                    # A recycled pool is still spawning; don't bill that to the render
+                    await asyncio.shield(self._warming)
+                    self._warming = None
+                if self._stopped:
+                    raise RuntimeError("PDF renderer is stopped")
+                self._wait_seconds += time.perf_counter() - queued
+                with timed(PDF_RENDER_SECONDS), span("pdf.render"):
+                    return await self._render(html)
+        finally:
+            self._pending -= 1
+
+    async def _render(self, html: str) -> bytes:
+        started = time.perf_counter()
+
+        executor = self._executor
+        task: Optional[Future] = None
+        if executor is None:
+            # No process pool configured: still keep the work off the loop
+            future: Any = asyncio.ensure_future(asyncio.to_thread(_render, html))
+        else:
+            task = executor.submit(_render, html)
+            future = asyncio.wrap_future(task)
+
+        try:
+            pdf_bytes = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            # A task that never reached a worker is just dropped; one still
+            # running means its worker is stuck
+            if task is not None and not task.cancel() and task.running():
+                self._recycle(executor, "timeout")
+            raise RenderTimeout(f"PDF render exceeded {self.timeout}s")
+        except BrokenProcessPool:
+            self.failures += 1
+            self._recycle(executor, "worker died")
+            raise
+        except Exception:
+            self.failures += 1
+            raise
+
+        elapsed = time.perf_counter() - started
+        self.renders += 1
+        self._render_seconds += elapsed
+        self._max_render_seconds = max(self._max_render_seconds, elapsed)
+        return pdf_bytes
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "renders": self.renders,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "avg_render_ms": (
+                round(self._render_seconds / self.renders * 1000, 1) if self.renders else 0.0
+            ),
+            "max_render_ms": round(self._max_render_seconds * 1000, 1),
+            "avg_wait_ms": (
+                round(self._wait_seconds / self.renders * 1000, 1) if self.renders else 0.0
+            ),
+        }
+
+
+# =============================================================================
+# RENDERER SINGLETON
+# =============================================================================
+
+pdf_renderer = PdfRenderer(
+    workers=settings.pdf_render_workers,
+    queue_size=settings.pdf_render_queue_size,
+    timeout=settings.pdf_render_timeout,
+)
@@ -7,24 +7,25 @@ from datetime import datetime, timedelta
 from typing import List, Optional
 
 import structlog
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from ..config import settings
 from ..models.lead import Lead
 from ..models.quote import Quote, QuoteCreate, QuoteItem, QuoteStatus
+from ..utils.keywords import match_keywords
+from ..utils.tracing import traced
+from ..utils.templates import render_template, template_fingerprint
+from .pdf_cache import pdf_cache, pdf_cache_key
+from .pdf_renderer import pdf_renderer
 
 logger = structlog.get_logger()
 
+QUOTE_TEMPLATE = "quote.html"
+
 
 class QuoteGenerator:
     """Generates quotes and PDFs from lead data."""
 
-    def __init__(self):
-        self.template_env = Environment(
-            loader=FileSystemLoader(settings.pdf_template_dir),
-            autoescape=select_autoescape(["html", "xml"]),
-        )
-
+    @traced("generate_quote")
     async def generate_quote(self, lead: Lead) -> QuoteCreate:
         """
         Generate a quote based on lead information.
@@ -71,9 +72,9 @@ class QuoteGenerator:
 
         # Automation area specific items
         if lead.automation_area:
-            area = lead.automation_area.lower()
+            area = match_keywords("automation_area", lead.automation_area)
 
-            if any(x in area for x in ["chatbot", "ai", "assistant", "bot"]):
+            if "chatbot" in area:
                 items.append(
                     QuoteItem(
                         title="AI Chatbot Development",
@@ -83,7 +84,7 @@ class QuoteGenerator:
                     )
                 )
 
-            if any(x in area for x in ["workflow", "process", "automation"]):
+            if "workflow" in area:
                 items.append(
                     QuoteItem(
                         title="Workflow Automation",
@@ -93,7 +94,7 @@ class QuoteGenerator:
                     )
                 )
 
-            if any(x in area for x in ["integration", "api", "sync", "connect"]):
+            if "integration" in area:
                 items.append(
                     QuoteItem(
                         title="System Integration",
@@ -103,7 +104,7 @@ class QuoteGenerator:
                     )
                 )
 
-            if any(x in area for x in ["data", "report", "analytics", "dashboard"]):
+            if "data" in area:
                 items.append(
                     QuoteItem(
                         title="Data & Analytics",
@@ -156,21 +157,34 @@ class QuoteGenerator:
 
     async def generate_pdf(self, quote: Quote, lead: Lead) -> bytes:
         """Generate PDF from quote data."""
-        logger.info("Generating PDF", quote_id=quote.id)
+        # Editing the template changes its fingerprint, so cached PDFs re-render
+        cache_key = pdf_cache_key(quote, lead, template_fingerprint(QUOTE_TEMPLATE))
+        if settings.pdf_cache_enabled:
+            pdf_bytes = await pdf_cache.get(quote.id, cache_key)
+            if pdf_bytes is not None:
+                logger.info("PDF served from cache", quote_id=quote.id, size=len(pdf_bytes))
+                return pdf_bytes
 
-        try:
-            # Try to use weasyprint for PDF generation
-            from weasyprint import HTML
+        logger.info("Generating PDF", quote_id=quote.id)
 
-            html_content = self._render_quote_html(quote, lead)
-            pdf_bytes = HTML(string=html_content).write_pdf()
+        html_content = self._render_quote_html(quote, lead)
 
-            logger.info("PDF generated successfully", quote_id=quote.id, size=len(pdf_bytes))
+        try:
+            pdf_bytes = await pdf_renderer.render(html_content)
+            if settings.pdf_cache_enabled:
+                await pdf_cache.set(quote.id, cache_key, pdf_bytes)
+
+            logger.info(
+                "PDF generated successfully",
+                quote_id=quote.id,
+                size=len(pdf_bytes),
+                **pdf_renderer.stats(),
+            )
             return pdf_bytes
 
         except ImportError:
             logger.warning("weasyprint not available, returning HTML as fallback")
-            return self._render_quote_html(quote, lead).encode("utf-8")
+            return html_content.encode("utf-8")
 
         except Exception as e:
             logger.error("PDF generation failed", quote_id=quote.id, error=str(e))
@@ -178,120 +192,14 @@ class QuoteGenerator:
 
     def _render_quote_html(self, quote: Quote, lead: Lead) -> str:
         """Render quote as HTML."""
-        # Calculate totals
         subtotal = sum(item.amount for item in quote.scope_items)
         tax = subtotal * 0.1  # 10% GST
-        total = subtotal + tax
-
-        # Format dates
-        created_date = quote.created_at.strftime("%B %d, %Y")
-        valid_until = quote.valid_until.strftime("%B %d, %Y")
-
-        # Render items
-        items_html = ""
-        for item in quote.scope_items:
-            hours_text = f" ({item.hours} hours)" if item.hours else ""
-            items_html += f"""
-            <tr>
-                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
-                    <strong>{item.title}</strong><br>
-                    <span style="color: #6b7280; font-size: 14px;">{item.description}</span>
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb; text-align: right;">
-                    ${item.amount:,.2f}{hours_text}
-                </td>
-            </tr>
-            """
-
-        return f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Quote - {quote.project_title}</title>
-    <style>
-        @page {{ size: A4; margin: 2cm; }}
-        body {{ font-family: 'Helvetica Neue', Arial, sans-serif; color: #1f2937; line-height: 1.5; }}
-        .header {{ display: flex; justify-content: space-between; margin-bottom: 40px; }}
-        .logo {{ font-size: 24px; font-weight: bold; color: #fb6400; }}
-        .quote-info {{ text-align: right; }}
-        .client-info {{ margin-bottom: 30px; }}
-        .section {{ margin-bottom: 30px; }}
-        .section-title {{ font-size: 18px; font-weight: bold; margin-bottom: 15px; color: #374151; }}
-        table {{ width: 100%; border-collapse: collapse; }}
-        th {{ background: #f9fafb; padding: 12px; text-align: left; font-weight: 600; }}
-        .totals {{ margin-top: 20px; text-align: right; }}
-        .totals table {{ width: 300px; margin-left: auto; }}
-        .totals td {{ padding: 8px; }}
-        .total-row {{ font-size: 18px; font-weight: bold; background: #fb6400; color: white; }}
-        .footer {{ margin-top: 40px; padding-top: 20px; border-top: 1px solid #e5e7eb; font-size: 12px; color: #6b7280; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="logo">Are You Human?</div>
-        <div class="quote-info">
-            <strong>Quote</strong><br>
-            Date: {created_date}<br>
-            Valid Until: {valid_until}
-        </div>
-    </div>
-
-    <div class="client-info">
-        <strong>Prepared For:</strong><br>
-        {lead.name}<br>
-        {lead.company or ''}<br>
-        {lead.email}
-    </div>
-
-    <div class="section">
-        <div class="section-title">{quote.project_title}</div>
-        <p>{quote.project_summary}</p>
-    </div>
-
-    <div class="section">
-        <div class="section-title">Scope of Work</div>
-        <table>
-            <thead>
-                <tr>
-                    <th>Description</th>
-                    <th style="text-align: right;">Amount</th>
-                </tr>
-            </thead>
-            <tbody>
-                {items_html}
-            </tbody>
-        </table>
-    </div>
-
-    <div class="totals">
-        <table>
-            <tr>
-                <td>Subtotal:</td>
-                <td style="text-align: right;">${subtotal:,.2f}</td>
-            </tr>
-            <tr>
-                <td>GST (10%):</td>
-                <td style="text-align: right;">${tax:,.2f}</td>
-            </tr>
-            <tr class="total-row">
-                <td style="padding: 12px;">Total ({quote.currency}):</td>
-                <td style="text-align: right; padding: 12px;">${total:,.2f}</td>
-            </tr>
-        </table>
-    </div>
-
-    <div class="footer">
-        <p><strong>Terms & Conditions:</strong></p>
-        <ul>
-            <li>50% deposit required to commence work</li>
-            <li>Balance due upon project completion</li>
-            <li>Quote valid for 30 days</li>
-            <li>Prices exclude any third-party software licenses</li>
-        </ul>
-        <p style="margin-top: 20px;">
-            <strong>Are You Human?</strong> | AI-Powered Automation Consulting<br>
-            areyouhuman.com
-        </p>
-    </div>
-</body>
-</html>"""
+
+        return render_template(
+            QUOTE_TEMPLATE,
+            quote=quote,
+            lead=lead,
+            subtotal=subtotal,
+            tax=tax,
+            total=subtotal + tax,
+        )
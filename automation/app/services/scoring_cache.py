@@ -0,0 +1,157 @@
+"""
+Lead Scoring Cache
+Content-addressed cache of AI lead scores, so re-submitted or cosmetically
+changed leads don't pay for another chat completion
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Optional
+
+import structlog
+
+from ..config import settings
+from ..models.lead import Lead, LeadScore
+from ..utils.cache import TTLCache
+from ..utils.db import get_db
+
+logger = structlog.get_logger()
+
+# Lead fields that feed the scoring prompt
+SCORING_FIELDS = (
+    "name",
+    "company",
+    "role",
+    "industry",
+    "company_size",
+    "problem_text",
+    "automation_area",
+    "tools_used",
+    "budget_range",
+    "timeline",
+    "urgency",
+    "interest_level",
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = _WHITESPACE.sub(" ", value).strip().lower()
+        return value or None
+    if isinstance(value, (list, tuple)):
+        items = sorted(v for v in (_normalize(v) for v in value) if v is not None)
+        return items or None
+    return value
+
+
+def scoring_fingerprint(lead: Lead, model: str, prompt_version: str) -> str:
+    """
+    Hash the normalized scoring inputs of a lead.
+
+    Case, surrounding/repeated whitespace and tool order are ignored, so
+    cosmetic edits map to the same fingerprint.
+    """
+    material = {field: _normalize(getattr(lead, field)) for field in SCORING_FIELDS}
+    material["_model"] = model
+    material["_prompt"] = prompt_version
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ScoringCache:
+    """
+    LRU/TTL cache of LeadScore results with an optional Postgres tier.
+
+    The persistent tier (``lead_score_cache`` table) survives restarts and
+    is shared across machines; hits there are promoted to memory.
+    """
+
+    def __init__(self, max_size: int = 5000, ttl_seconds: int = 604800, persistent: bool = False):
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self.memory = TTLCache(max_size=max_size, ttl=ttl_seconds)
+
+        # Counters
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def _db(self):
+        if not self.persistent or not settings.is_database_configured:
+            return None
+        return get_db()
+
+    async def get(self, fingerprint: str) -> Optional[LeadScore]:
+        score = self.memory.get(fingerprint)
+        if score is not None:
+            return score
+
+        db = self._db()
+        if db:
+            try:
+                row = await db.execute_one(
+                    """
+                    SELECT scores FROM lead_score_cache
+                    WHERE fingerprint = %s AND expires_at > NOW()
+                    """,
+                    (fingerprint,),
+                )
+                if row:
+                    score = LeadScore(**row["scores"])
+                    self.memory.set(fingerprint, score)
+                    self.persistent_hits += 1
+                    return score
+            except Exception as e:
+                logger.warning("Scoring cache lookup failed", error=str(e))
+
+        self.misses += 1
+        return None
+
+    async def set(self, fingerprint: str, score: LeadScore) -> None:
+        self.memory.set(fingerprint, score)
+
+        db = self._db()
+        if not db:
+            return
+
+        try:
+            await db.execute(
+                """
+                INSERT INTO lead_score_cache (fingerprint, scores, expires_at)
+                VALUES (%s, %s::jsonb, NOW() + make_interval(secs => %s))
+                ON CONFLICT (fingerprint) DO UPDATE
+                SET scores = EXCLUDED.scores, expires_at = EXCLUDED.expires_at
+                """,
+                (fingerprint, score.model_dump_json(), self.ttl_seconds),
+            )
+        except Exception as e:
+            logger.warning("Failed to persist lead score", error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        memory = self.memory.stats()
+        hits = memory["hits"] + self.persistent_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": memory["hits"],
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "size": memory["size"],
+            "persistent": self.persistent,
+        }
+
+
+# =============================================================================
+# CACHE SINGLETON
+# =============================================================================
+
+scoring_cache = ScoringCache(
+    max_size=settings.scoring_cache_size,
+    ttl_seconds=settings.scoring_cache_ttl_seconds,
+    persistent=settings.scoring_cache_persistent,
+)
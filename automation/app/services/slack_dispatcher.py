@@ -0,0 +1,302 @@
+"""
+Slack Dispatcher
+Per-channel queues in front of the Slack webhook: paces posts to the rate
+limit, honours Retry-After, and merges bursts into digest messages
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+from ..config import settings
+from ..utils.metrics import SLACK_MESSAGES_DROPPED, SLACK_QUEUE_DEPTH
+from ..utils.tracing import current_span, span
+from .notification_service import NotificationError
+
+logger = structlog.get_logger()
+
+SlackSender = Callable[[dict], Awaitable[Any]]
+
+DEFAULT_CHANNEL = "default"
+
+# Slack rejects messages with more than 50 blocks
+MAX_DIGEST_BLOCKS = 50
+
+
+class SlackQueueFull(NotificationError):
+    """Raised when a channel's queue is at capacity; the message was not queued."""
+
+
+class SlackQueueTimeout(NotificationError):
+    """Raised when a message waited ``max_wait`` without being posted; it was withdrawn."""
+
+
+def digest_payload(payloads: list[dict]) -> dict:
+    """Merge several payloads into one message listing each of them."""
+    lines = [p.get("text", "") for p in payloads]
+    blocks: list[dict] = [
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": f"📬 {len(payloads)} notifications", "emoji": True},
+        }
+    ]
+    room = MAX_DIGEST_BLOCKS - len(blocks) - 1
+    for line in lines[:room]:
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": line or "_(no text)_"}})
+    if len(lines) > room:
+        blocks.append(
+            {
+                "type": "context",
+                "elements": [{"type": "mrkdwn", "text": f"…and {len(lines) - room} more"}],
+            }
+        )
+
+    digest = {"text": f"{len(payloads)} notifications:\n" + "\n".join(lines), "blocks": blocks}
+    if payloads[0].get("channel"):
+        digest["channel"] = payloads[0]["channel"]
+    return digest
+
+
+class _Channel:
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.queue: asyncio.Queue[tuple[dict, asyncio.Future]] = asyncio.Queue(max_size)
+        self.worker: Optional[asyncio.Task] = None
+        self.next_post_at = 0.0  # Monotonic time before which we don't post
+        self.posting: set[asyncio.Future] = set()  # Futures of the post in flight
+
+
+class SlackDispatcher:
+    """
+    Queues Slack payloads per channel and posts them from one worker each.
+
+    Posts on a channel are spaced at least ``min_interval`` apart, and a 429
+    pauses the channel for the ``Retry-After`` the response asked for before
+    the same post is retried (up to ``max_retries`` times). With a
+    ``coalesce_window`` the worker waits that long after the first message
+    of a burst and sends everything that arrived in one digest message.
+
+    ``send`` resolves once the message (or the digest holding it) has been
+    posted, and raises if it couldn't be, so callers such as the outbox can
+    still retry. A full queue raises ``SlackQueueFull`` straight away, and a
+    message whose post hasn't started after ``max_wait`` seconds is withdrawn
+    and raises ``SlackQueueTimeout``, so a ``send`` takes at most
+    ``max_wait`` plus one request.
+    """
+
+    def __init__(
+        self,
+        sender: Optional[SlackSender] = None,
+        min_interval: float = 1.0,
+        coalesce_window: float = 0.0,
+        max_digest: int = 20,
+        queue_size: int = 100,
+        max_retries: int = 3,
+        max_wait: float = 60.0,
+    ):
+        self.sender = sender
+        self.min_interval = min_interval
+        self.coalesce_window = coalesce_window
+        self.max_digest = max_digest
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.channels: dict[str, _Channel] = {}
+        self._running = False
+
+        # Counters
+        self.enqueued = 0
+        self.posted = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    def bind(self, sender: SlackSender) -> None:
+        """Set the function that posts one payload. It must raise on failure."""
+        self.sender = sender
+
+    async def start(self) -> None:
+        self._running = True
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Give queued messages ``timeout`` seconds to go out, then cancel the workers."""
+        if not self._running:
+            return
+        self._running = False
+
+        pending = [c.queue.join() for c in self.channels.values()]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Slack queue not drained before shutdown", queued=self.depth())
+
+        workers = [c.worker for c in self.channels.values() if c.worker]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for name in self.channels:
+            SLACK_QUEUE_DEPTH.labels(channel=name).set(0)
+        self.channels = {}
+        logger.info("Slack dispatcher stopped", **self.stats())
+
+    def _channel(self, name: str) -> _Channel:
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = self.channels[name] = _Channel(name, self.queue_size)
+        if channel.worker is None or channel.worker.done():
+            channel.worker = asyncio.create_task(self._worker(channel), name=f"slack-{name}")
+        return channel
+
+    async def send(self, payload: dict) -> None:
+        """
+        Queue a payload on its channel and wait until it has been posted.
+
+        Raises:
+            SlackQueueFull: If the channel's queue is at capacity
+            SlackQueueTimeout: If the message wasn't posted within ``max_wait``
+            NotificationError: If Slack rejected the post or retries ran out
+        """
+        if not self._running:
+            await self.sender(payload)
+            return
+
+        channel = self._channel(payload.get("channel") or DEFAULT_CHANNEL)
+        future = asyncio.get_running_loop().create_future()
+        try:
+            channel.queue.put_nowait((payload, future, current_span()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            SLACK_MESSAGES_DROPPED.labels(channel=channel.name, reason="queue_full").inc()
+            logger.warning("Slack queue full, message dropped", channel=channel.name)
+            raise SlackQueueFull(f"Slack queue for {channel.name} is full")
+
+        self.enqueued += 1
+        SLACK_QUEUE_DEPTH.labels(channel=channel.name).set(channel.queue.qsize())
+        try:
+            await asyncio.wait({future}, timeout=self.max_wait)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        # A post already on the wire is waited for; anything else is withdrawn
+        if not future.done() and future not in channel.posting:
+            future.cancel()
+            self.timed_out += 1
+            SLACK_MESSAGES_DROPPED.labels(channel=channel.name, reason="timed_out").inc()
+            logger.warning("Slack message timed out in queue", channel=channel.name)
+            raise SlackQueueTimeout(
+                f"Slack message for {channel.name} not posted within {self.max_wait}s"
+            )
+        await future
+
+    async def _worker(self, channel: _Channel) -> None:
+        while True:
+            batch = [await channel.queue.get()]
+            try:
+                if self.coalesce_window > 0:
+                    await asyncio.sleep(self.coalesce_window)
+                    while len(batch) < self.max_digest and not channel.queue.empty():
+                        batch.append(channel.queue.get_nowait())
+                SLACK_QUEUE_DEPTH.labels(channel=channel.name).set(channel.queue.qsize())
+
+                # Senders that gave up have had their futures cancelled
+                live = [item for item in batch if not item[1].done()]
+                if not live:
+                    continue
+                batch_size = len(live)
+
+                payloads = [payload for payload, _, _ in live]
+                payload = payloads[0] if len(payloads) == 1 else digest_payload(payloads)
+                # A digest is traced under the first message it includes
+                with span(
+                    "slack.dispatch", parent=live[0][2], channel=channel.name, messages=batch_size
+                ):
+                    error = await self._post(channel, payload, [f for _, f, _ in live])
+
+                for _, future, _ in live:
+                    if future.done():
+                        continue
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+
+                if error is None:
+                    self.delivered += batch_size
+                    if batch_size > 1:
+                        self.coalesced += batch_size
+                else:
+                    self.failed += batch_size
+            finally:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.cancel()
+                    channel.queue.task_done()
+
+    async def _post(
+        self, channel: _Channel, payload: dict, futures: list[asyncio.Future]
+    ) -> Optional[Exception]:
+        """
+        Post one payload, pacing and retrying 429s. Returns the final error, if any.
+        The post is abandoned if every sender waiting on it timed out meanwhile.
+        """
+        for attempt in range(self.max_retries + 1):
+            delay = channel.next_post_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if all(future.done() for future in futures):
+                return None
+            channel.next_post_at = time.monotonic() + self.min_interval
+
+            channel.posting.update(futures)
+            try:
+                await self.sender(payload)
+                self.posted += 1
+                return None
+            except NotificationError as e:
+                if e.status_code != 429 or attempt == self.max_retries:
+                    return e
+                self.rate_limited += 1
+                wait = e.retry_after if e.retry_after is not None else self.min_interval * 2 ** attempt
+                channel.next_post_at = time.monotonic() + wait
+                logger.warning("Slack rate limited", channel=channel.name, retry_after=wait)
+            except Exception as e:
+                return e
+            finally:
+                channel.posting.difference_update(futures)
+
+    def depth(self) -> int:
+        return sum(c.queue.qsize() for c in self.channels.values())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._running,
+            "queued": {name: c.queue.qsize() for name, c in self.channels.items()},
+            "enqueued": self.enqueued,
+            "posted": self.posted,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+        }
+
+
+# =============================================================================
+# DISPATCHER SINGLETON
+# =============================================================================
+
+slack_dispatcher = SlackDispatcher(
+    min_interval=settings.slack_min_interval,
+    coalesce_window=settings.slack_coalesce_window,
+    max_digest=settings.slack_max_digest,
+    queue_size=settings.slack_queue_size,
+    max_retries=settings.slack_max_retries,
+    max_wait=settings.slack_max_wait,
+)
@@ -2,6 +2,7 @@
 
 from .db import (
     get_db,
+    close_db,
     get_lead,
     update_lead,
     update_lead_status,
@@ -14,6 +15,7 @@ from .security import verify_signature, generate_signature
 
 __all__ = [
     "get_db",
+    "close_db",
     "get_lead",
     "update_lead",
     "update_lead_status",
@@ -3,51 +3,254 @@ Neon PostgreSQL Database Client
 Replaces Supabase with direct PostgreSQL connection
 """
 
-import os
-from functools import lru_cache
-from typing import Any, Optional
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
 
 import structlog
-import psycopg
-from psycopg.rows import dict_row
 
 from ..config import settings
+from .metrics import DB_QUERY_SECONDS, db_operation, timed
+from .tracing import span
+
+# psycopg is imported when the first connection is made, not at app import
+if TYPE_CHECKING:
+    import psycopg
 
 logger = structlog.get_logger()
 
 
-class DatabaseClient:
-    """PostgreSQL database client for Neon."""
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time."""
 
-    def __init__(self, connection_string: str):
-        self.connection_string = connection_string
-        self._conn: Optional[psycopg.Connection] = None
 
-    def _get_connection(self) -> psycopg.Connection:
-        """Get or create a database connection."""
-        if self._conn is None or self._conn.closed:
-            self._conn = psycopg.connect(
-                self.connection_string,
-                row_factory=dict_row,
-            )
-        return self._conn
+class AsyncConnectionPool:
+    """
+    Bounded pool of psycopg async connections.
 
+    Connections are opened lazily up to ``max_size``, optionally pinged on
+    checkout, and recycled after ``max_uses`` checkouts so long-lived
+    server-side state (and Neon proxy sessions) do not accumulate.
+    """
+
+    def __init__(
+        self,
+        conninfo: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        max_uses: int = 1000,
+        check_on_checkout: bool = True,
+        check_after_idle: float = 10.0,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size bounds")
+
+        self.conninfo = conninfo
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_uses = max_uses
+        self.check_on_checkout = check_on_checkout
+        self.check_after_idle = check_after_idle
+
+        self._idle: list[psycopg.AsyncConnection] = []
+        self._uses: dict[psycopg.AsyncConnection, int] = {}
+        self._last_used: dict[psycopg.AsyncConnection, float] = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond: Optional[asyncio.Condition] = None
+
+        # Counters
+        self.checkouts = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.failed_checks = 0
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        # Created on first use so the pool binds to the running event loop
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def _connect(self) -> psycopg.AsyncConnection:
+        import psycopg
+        from psycopg.rows import dict_row
+
+        conn = await psycopg.AsyncConnection.connect(
+            self.conninfo,
+            row_factory=dict_row,
+            autocommit=True,
+        )
+        self._uses[conn] = 0
+        self._last_used[conn] = time.monotonic()
+        return conn
+
+    async def open(self) -> None:
+        """Pre-open ``min_size`` connections."""
+        self._closed = False
+        while self._size < self.min_size:
+            self._size += 1
+            try:
+                conn = await self._connect()
+            except Exception:
+                await self._forget(None)
+                raise
+            async with self._condition:
+                self._idle.append(conn)
+                self._condition.notify()
+
+        logger.info("Database pool opened", size=self._size)
+
+    async def _check(self, conn: psycopg.AsyncConnection) -> bool:
+        """Return True if the connection is usable."""
+        if conn.closed or conn.broken:
+            return False
+        if not self.check_on_checkout:
+            return True
+        idle_for = time.monotonic() - self._last_used.get(conn, 0.0)
+        if idle_for < self.check_after_idle:
+            return True
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning("Pooled connection failed health check", error=str(e))
+            return False
+
+    async def _forget(self, conn: Optional[psycopg.AsyncConnection]) -> None:
+        """Drop a connection from the pool and free its slot."""
+        if conn is not None:
+            self._uses.pop(conn, None)
+            self._last_used.pop(conn, None)
+            if not conn.closed:
+                try:
+                    await conn.close()
+                except Exception:
+                    pass
+        async with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    async def acquire(self) -> psycopg.AsyncConnection:
+        """Check out a connection, waiting up to ``timeout`` seconds."""
+        if self._closed:
+            raise RuntimeError("Database pool is closed")
+
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            conn: Optional[psycopg.AsyncConnection] = None
+            async with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection available after {self.timeout}s"
+                        )
+                    self._waiting += 1
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    finally:
+                        self._waiting -= 1
+
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if conn is None:
+                try:
+                    conn = await self._connect()
+                except Exception:
+                    await self._forget(None)
+                    raise
+            elif not await self._check(conn):
+                self.failed_checks += 1
+                await self._forget(conn)
+                continue
+
+            self._uses[conn] += 1
+            self.checkouts += 1
+            return conn
+
+    async def release(self, conn: psycopg.AsyncConnection) -> None:
+        """Return a connection to the pool, recycling it if needed."""
+        if (
+            self._closed
+            or conn.closed
+            or conn.broken
+            or self._uses.get(conn, 0) >= self.max_uses
+        ):
+            if not conn.closed and self._uses.get(conn, 0) >= self.max_uses:
+                self.recycled += 1
+            await self._forget(conn)
+            return
+
+        from psycopg.pq import TransactionStatus
+
+        if conn.info.transaction_status != TransactionStatus.IDLE:
+            try:
+                await conn.rollback()
+            except Exception:
+                await self._forget(conn)
+                return
+
+        self._last_used[conn] = time.monotonic()
+        async with self._condition:
+            self._idle.append(conn)
+            self._condition.notify()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """Context manager that checks a connection out and back in."""
+        conn = await self.acquire()
+        try:
+            yield conn
+        finally:
+            await self.release(conn)
+
+    async def close(self) -> None:
+        """Close idle connections and refuse further checkouts."""
+        self._closed = True
+        async with self._condition:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._forget(conn)
+        logger.info("Database pool closed")
+
+    def stats(self) -> dict[str, int]:
+        """Pool counters for health and metrics endpoints."""
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._size - len(self._idle),
+            "waiting": self._waiting,
+            "max_size": self.max_size,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "recycled": self.recycled,
+            "failed_checks": self.failed_checks,
+        }
+
+
+class QueryHelpers(ABC):
+    """Table helpers built on ``execute``; shared by clients and transactions."""
+
+    @abstractmethod
     async def execute(
         self, query: str, params: Optional[tuple] = None
     ) -> list[dict[str, Any]]:
-        """Execute a query and return results."""
-        conn = self._get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-                if cur.description:
-                    return cur.fetchall()
-                conn.commit()
-                return []
-        except Exception as e:
-            conn.rollback()
-            logger.error("Database query failed", error=str(e), query=query[:100])
-            raise
+        """Execute a query and return all rows as dicts."""
 
     async def execute_one(
         self, query: str, params: Optional[tuple] = None
@@ -109,11 +312,132 @@ class DatabaseClient:
         results = await self.select(table, columns, where, where_params, limit=1)
         return results[0] if results else None
 
+
+class Transaction(QueryHelpers):
+    """Statements bound to one connection inside an open transaction."""
+
+    def __init__(self, conn: psycopg.AsyncConnection):
+        self.conn = conn
+
+    async def execute(
+        self, query: str, params: Optional[tuple] = None
+    ) -> list[dict[str, Any]]:
+        """Execute a query and return results."""
+        operation = db_operation(query)
+        with timed(DB_QUERY_SECONDS, operation=operation), span(f"db {operation}", child_only=True):
+            async with self.conn.cursor() as cur:
+                await cur.execute(query, params)
+                if cur.description:
+                    return await cur.fetchall()
+                return []
+
+
+class DatabaseClient(QueryHelpers):
+    """
+    PostgreSQL database client for Neon.
+
+    Runs on an :class:`AsyncConnectionPool` by default. With the pool
+    disabled it falls back to a single blocking connection.
+    """
+
+    def __init__(self, connection_string: str, use_pool: Optional[bool] = None):
+        self.connection_string = connection_string
+        self._conn: Optional[psycopg.Connection] = None
+        self.pool: Optional[AsyncConnectionPool] = None
+
+        if settings.db_pool_enabled if use_pool is None else use_pool:
+            self.pool = AsyncConnectionPool(
+                connection_string,
+                min_size=settings.db_pool_min_size,
+                max_size=settings.db_pool_max_size,
+                timeout=settings.db_pool_timeout,
+                max_uses=settings.db_pool_max_uses,
+                check_on_checkout=settings.db_pool_check_on_checkout,
+                check_after_idle=settings.db_pool_check_after_idle,
+            )
+
+    def _get_connection(self) -> psycopg.Connection:
+        """Get or create a database connection."""
+        if self._conn is None or self._conn.closed:
+            import psycopg
+            from psycopg.rows import dict_row
+
+            self._conn = psycopg.connect(
+                self.connection_string,
+                row_factory=dict_row,
+            )
+        return self._conn
+
+    async def execute(
+        self, query: str, params: Optional[tuple] = None
+    ) -> list[dict[str, Any]]:
+        """Execute a query and return results."""
+        operation = db_operation(query)
+        with timed(DB_QUERY_SECONDS, operation=operation), span(f"db {operation}", child_only=True):
+            if self.pool:
+                try:
+                    async with self.pool.connection() as conn:
+                        async with conn.cursor() as cur:
+                            await cur.execute(query, params)
+                            if cur.description:
+                                return await cur.fetchall()
+                            return []
+                except Exception as e:
+                    logger.error("Database query failed", error=str(e), query=query[:100])
+                    raise
+
+            conn = self._get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(query, params)
+                    if cur.description:
+                        return cur.fetchall()
+                    conn.commit()
+                    return []
+            except Exception as e:
+                conn.rollback()
+                logger.error("Database query failed", error=str(e), query=query[:100])
+                raise
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """
+        Run several statements atomically on one connection.
+
+        Commits when the block exits normally and rolls back on error.
+        """
+        if self.pool:
+            async with self.pool.connection() as conn:
+                async with conn.transaction():
+                    yield Transaction(conn)
+            return
+
+        import psycopg
+        from psycopg.rows import dict_row
+
+        conn = await psycopg.AsyncConnection.connect(self.connection_string, row_factory=dict_row)
+        try:
+            async with conn.transaction():
+                yield Transaction(conn)
+        finally:
+            await conn.close()
+
+    async def open(self) -> None:
+        """Warm up the connection pool."""
+        if self.pool:
+            await self.pool.open()
+
     def close(self):
         """Close the database connection."""
         if self._conn and not self._conn.closed:
             self._conn.close()
 
+    async def aclose(self) -> None:
+        """Close the pool and any direct connection."""
+        if self.pool:
+            await self.pool.close()
+        self.close()
+
 
 # =============================================================================
 # CLIENT SINGLETON
@@ -141,6 +465,15 @@ def get_db() -> Optional[DatabaseClient]:
     return _db_client
 
 
+async def close_db() -> None:
+    """Close the shared database client, if one was created."""
+    global _db_client
+
+    if _db_client is not None:
+        await _db_client.aclose()
+        _db_client = None
+
+
 # =============================================================================
 # LEAD OPERATIONS
 # =============================================================================
@@ -163,9 +496,11 @@ async def update_lead(lead_id: str, data: dict[str, Any]) -> Optional[dict[str,
     return await db.update("leads", data, "id = %s", (lead_id,))
 
 
-async def update_lead_status(lead_id: str, status: str) -> bool:
-    """Update lead status."""
-    db = get_db()
+async def update_lead_status(
+    lead_id: str, status: str, tx: Optional[Transaction] = None
+) -> bool:
+    """Update lead status. Inside ``tx`` errors propagate so the transaction rolls back."""
+    db = tx or get_db()
     if not db:
         return False
     try:
@@ -177,9 +512,52 @@ async def update_lead_status(lead_id: str, status: str) -> bool:
         )
         return True
     except Exception:
+        if tx:
+            raise
         return False
 
 
+async def iter_leads(
+    status: Optional[str] = None,
+    columns: str = "*",
+    chunk_size: int = 500,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yield leads one at a time, fetching ``chunk_size`` rows per query.
+
+    Uses keyset pagination on ``id`` so memory stays flat and each page is
+    an index scan, however large the table.
+    """
+    db = get_db()
+    if not db:
+        return
+
+    last_id = None
+    while True:
+        conditions, params = [], []
+        if status:
+            conditions.append("status = %s")
+            params.append(status)
+        if last_id:
+            conditions.append("id > %s")
+            params.append(last_id)
+
+        rows = await db.select(
+            "leads",
+            columns=columns,
+            where=" AND ".join(conditions) or None,
+            where_params=tuple(params) or None,
+            order_by="id",
+            limit=chunk_size,
+        )
+        for row in rows:
+            yield row
+
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]["id"]
+
+
 # =============================================================================
 # QUOTE OPERATIONS
 # =============================================================================
@@ -206,10 +584,13 @@ async def get_quote_with_lead(quote_id: str) -> Optional[dict[str, Any]]:
 
 
 async def update_quote_status(
-    quote_id: str, status: str, reason: Optional[str] = None
+    quote_id: str,
+    status: str,
+    reason: Optional[str] = None,
+    tx: Optional[Transaction] = None,
 ) -> bool:
-    """Update quote status."""
-    db = get_db()
+    """Update quote status. Inside ``tx`` errors propagate so the transaction rolls back."""
+    db = tx or get_db()
     if not db:
         return False
 
@@ -225,6 +606,8 @@ async def update_quote_status(
         await db.update("quotes", data, "id = %s", (quote_id,))
         return True
     except Exception:
+        if tx:
+            raise
         return False
 
 
@@ -0,0 +1,137 @@
+"""Concurrent fan-out of independent side effects, and bounded batch streaming."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BranchResult:
+    """Outcome of a single fan-out branch."""
+
+    name: str
+    ok: bool
+    duration_ms: float
+    result: Any = None
+    error: Optional[str] = None
+
+
+async def _run_branch(name: str, awaitable: Awaitable, timeout: float) -> BranchResult:
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(awaitable, timeout)
+        ok, error = True, None
+    except asyncio.TimeoutError:
+        result, ok, error = None, False, f"Timed out after {timeout}s"
+    except Exception as e:
+        result, ok, error = None, False, str(e)
+
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    if not ok:
+        logger.error("Fan-out branch failed", branch=name, error=error, duration_ms=duration_ms)
+    return BranchResult(name=name, ok=ok, duration_ms=duration_ms, result=result, error=error)
+
+
+async def fan_out(
+    branches: dict[str, Awaitable],
+    timeout: float = 30.0,
+    **log_context: Any,
+) -> dict[str, BranchResult]:
+    """
+    Run independent awaitables concurrently.
+
+    Each branch gets its own timeout and a failure in one branch never
+    cancels the others. A per-branch timing breakdown is logged once all
+    branches settle.
+
+    Args:
+        branches: Mapping of branch name to awaitable
+        timeout: Per-branch timeout in seconds
+        **log_context: Extra fields for the timing log line
+
+    Returns:
+        Mapping of branch name to its BranchResult
+    """
+    if not branches:
+        return {}
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_run_branch(name, aw, timeout) for name, aw in branches.items())
+    )
+
+    logger.info(
+        "Fan-out complete",
+        total_ms=round((time.perf_counter() - started) * 1000, 1),
+        timings={r.name: r.duration_ms for r in results},
+        failed=[r.name for r in results if not r.ok],
+        **log_context,
+    )
+    return {r.name: r for r in results}
+
+
+async def _iterate(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def stream_batches(
+    items: Union[Iterable[T], AsyncIterable[T]],
+    run: Callable[[list[T]], Awaitable[list[R]]],
+    batch_size: int,
+    concurrency: int,
+) -> AsyncIterator[R]:
+    """
+    Group a stream into batches and run them with bounded concurrency.
+
+    Items are pulled lazily and at most ``concurrency`` batches are in
+    flight, so memory stays bounded however long the stream is. ``run``
+    returns one result per item, and results are yielded in input order;
+    a slow batch holds back the yields after it, not the batches running
+    beside it. Batches still running when the consumer stops are cancelled.
+    """
+    pending: deque[asyncio.Task] = deque()
+    batch: list[T] = []
+    try:
+        async for item in _iterate(items):
+            batch.append(item)
+            if len(batch) < batch_size:
+                continue
+            pending.append(asyncio.create_task(run(batch)))
+            batch = []
+
+            if len(pending) >= concurrency:
+                for result in await pending.popleft():
+                    yield result
+
+        if batch:
+            pending.append(asyncio.create_task(run(batch)))
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,162 @@
+"""
+Outbound HTTP Clients
+One pooled ``httpx.AsyncClient`` per upstream host, shared by every
+integration, opened in the app lifespan and closed on shutdown
+"""
+
+import importlib.util
+import ssl
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional
+
+import httpx
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+# Optional dependency: HTTP/2 needs the h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class ClientConfig:
+    """Pool and timeout settings for one upstream."""
+
+    base_url: str = ""
+    headers: dict[str, str] = field(default_factory=dict)
+    timeout: float = 10.0
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    transport: Optional[httpx.AsyncBaseTransport] = None  # e.g. httpx.MockTransport in tests
+
+
+@dataclass
+class _ClientStats:
+    requests: int = 0
+    connections: int = 0  # New TCP connections opened
+    errors: int = 0
+
+
+class HttpClientRegistry:
+    """
+    Named, lazily created HTTP clients.
+
+    Integrations ``register`` their upstream at import time and call
+    ``get(name)`` per request; the client is built on first use (or by
+    ``open()`` at startup) and lives until ``aclose()``. Each name gets its
+    own connection pool, so limits are effectively per host. Requests and
+    newly opened connections are counted through httpcore's trace hook,
+    which gives the connection reuse ratio reported by ``stats()``.
+    """
+
+    def __init__(self, defaults: ClientConfig):
+        self.defaults = defaults
+        self.configs: dict[str, ClientConfig] = {}
+        self.clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, _ClientStats] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    def register(self, name: str, **options: Any) -> None:
+        """Declare an upstream; unspecified options fall back to the defaults."""
+        config = replace(self.defaults, **options)
+        if config.http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but h2 is not installed", client=name)
+            config.http2 = False
+        self.configs[name] = config
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        client = self.clients.get(name)
+        if client is None or client.is_closed:
+            if name not in self.configs:
+                self.register(name)
+            client = self.clients[name] = self._build(name, self.configs[name])
+        return client
+
+    def _build(self, name: str, config: ClientConfig) -> httpx.AsyncClient:
+        stats = self._stats.setdefault(name, _ClientStats())
+
+        async def trace(event: str, info: dict) -> None:
+            if event == "connection.connect_tcp.complete":
+                stats.connections += 1
+
+        async def on_request(request: httpx.Request) -> None:
+            request.extensions.setdefault("trace", trace)
+
+        async def on_response(response: httpx.Response) -> None:
+            stats.requests += 1
+            if response.status_code >= 500:
+                stats.errors += 1
+
+        if self._ssl_context is None:
+            # Loading the CA bundle costs ~70ms; do it once, not per client
+            self._ssl_context = httpx.create_ssl_context()
+
+        return httpx.AsyncClient(
+            base_url=config.base_url,
+            verify=self._ssl_context,
+            headers=config.headers,
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=config.http2,
+            transport=config.transport,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    async def close(self, name: str) -> None:
+        client = self.clients.pop(name, None)
+        if client is not None:
+            await client.aclose()
+
+    def open(self) -> None:
+        """Create every registered client up front."""
+        for name in self.configs:
+            self.get(name)
+        logger.info("HTTP clients ready", clients=list(self.configs))
+
+    async def aclose(self) -> None:
+        clients, self.clients = self.clients, {}
+        for client in clients.values():
+            await client.aclose()
+        if clients:
+            logger.info("HTTP clients closed", **self.stats())
+
+    def stats(self) -> dict[str, Any]:
+        result = {}
+        for name, stats in self._stats.items():
+            config = self.configs.get(name, self.defaults)
+            result[name] = {
+                "requests": stats.requests,
+                "connections": stats.connections,
+                "reuse_ratio": (
+                    round(1 - stats.connections / stats.requests, 3) if stats.requests else 0.0
+                ),
+                "server_errors": stats.errors,
+                "http2": config.http2,
+                "max_connections": config.max_connections,
+            }
+        return result
+
+
+# =============================================================================
+# REGISTRY SINGLETON
+# =============================================================================
+
+http_clients = HttpClientRegistry(
+    ClientConfig(
+        timeout=settings.http_timeout,
+        connect_timeout=settings.http_connect_timeout,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        http2=settings.http2_enabled,
+    )
+)
@@ -0,0 +1,207 @@
+"""
+Webhook Idempotency Store
+Suppresses duplicate webhook deliveries by replaying the stored response
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Optional
+
+import structlog
+
+from ..config import settings
+from .cache import TTLCache
+from .db import get_db
+
+logger = structlog.get_logger()
+
+# Expired rows are purged every N stored responses
+PURGE_EVERY = 500
+
+
+def idempotency_key(scope: str, raw_body: bytes, delivery_id: Optional[str] = None) -> str:
+    """
+    Build the idempotency key for a delivery.
+
+    Uses the sender's delivery id when provided, otherwise a SHA-256 of the
+    raw body. Keys are namespaced by endpoint so identical bodies sent to
+    different endpoints don't collide.
+    """
+    if delivery_id:
+        return f"{scope}:id:{delivery_id.strip()[:100]}"
+    return f"{scope}:sha256:{hashlib.sha256(raw_body).hexdigest()}"
+
+
+class IdempotencyStore:
+    """
+    Two-tier store of webhook responses keyed by idempotency key.
+
+    An in-memory LRU absorbs fast retries; the ``webhook_deliveries`` table
+    keeps responses across restarts and machines until they expire.
+    Concurrent duplicates of an in-flight delivery wait for the first one
+    to finish instead of processing the event twice.
+
+    A delivery handed to a background job is ``hold``-ed: duplicates replay
+    its 202 from memory while the job runs, and ``settle`` persists the
+    record once the job has succeeded, or forgets it after a failure so
+    the sender's retry runs the event again.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, memory_size: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(max_size=memory_size, ttl=ttl_seconds)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._held: dict[str, dict[str, Any]] = {}
+        self._stored = 0
+
+        # Counters
+        self.replays = 0
+
+    async def claim(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Look up a previous response for ``key``.
+
+        Returns the stored record ``{"status_code", "body"}`` for a duplicate.
+        Returns None when the caller owns the delivery; it must then call
+        :meth:`complete` once it has a response.
+        """
+        # Held records are checked on their own: the LRU may evict one while its job runs
+        record = self.memory.get(key) or self._held.get(key)
+        if record is not None:
+            self.replays += 1
+            return record
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            record = await asyncio.shield(inflight)
+            if record is not None:
+                self.replays += 1
+                return record
+            # First attempt failed; let this delivery try again
+            return await self.claim(key)
+
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+
+        try:
+            record = await self._load(key)
+        except BaseException:
+            # Cancelled (or failed) before the caller owned the claim: wake waiters
+            self._resolve(key, None)
+            raise
+        if record is not None:
+            self.memory.set(key, record)
+            self._resolve(key, record)
+            self.replays += 1
+            return record
+
+        return None
+
+    async def complete(
+        self, key: str, status_code: int, body: Optional[dict[str, Any]]
+    ) -> None:
+        """
+        Record the response for a claimed delivery.
+
+        Only successful responses are stored; pass ``body=None`` (or an
+        unsuccessful body) to release the claim so a retry can run again.
+        """
+        if body is None or not body.get("success"):
+            self._resolve(key, None)
+            return
+
+        record = {"status_code": status_code, "body": body}
+        self.memory.set(key, record)
+        self._resolve(key, record)
+        await self._save(key, record)
+
+    def hold(self, key: str, status_code: int, body: dict[str, Any]) -> None:
+        """
+        Replay this response to duplicates without persisting it yet, for a
+        delivery whose outcome is still pending. Follow with ``settle``.
+        """
+        record = {"status_code": status_code, "body": body}
+        self._held[key] = record
+        self.memory.set(key, record)
+        self._resolve(key, record)
+
+    async def settle(self, key: str, succeeded: bool) -> None:
+        """Persist a held response, or drop it so the next attempt runs again."""
+        record = self._held.pop(key, None)
+        if succeeded and record is not None:
+            self.memory.set(key, record)
+            await self._save(key, record)
+        else:
+            self.memory.pop(key)
+
+    def _resolve(self, key: str, record: Optional[dict[str, Any]]) -> None:
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(record)
+
+    async def _load(self, key: str) -> Optional[dict[str, Any]]:
+        db = get_db() if settings.is_database_configured else None
+        if not db:
+            return None
+
+        try:
+            row = await db.execute_one(
+                """
+                SELECT status_code, response
+                FROM webhook_deliveries
+                WHERE idempotency_key = %s AND expires_at > NOW()
+                """,
+                (key,),
+            )
+        except Exception as e:
+            logger.warning("Idempotency lookup failed", error=str(e))
+            return None
+
+        if not row:
+            return None
+        return {"status_code": row["status_code"], "body": row["response"]}
+
+    async def _save(self, key: str, record: dict[str, Any]) -> None:
+        db = get_db() if settings.is_database_configured else None
+        if not db:
+            return
+
+        try:
+            await db.execute(
+                """
+                INSERT INTO webhook_deliveries (idempotency_key, status_code, response, expires_at)
+                VALUES (%s, %s, %s::jsonb, NOW() + make_interval(secs => %s))
+                ON CONFLICT (idempotency_key) DO NOTHING
+                """,
+                (key, record["status_code"], json.dumps(record["body"]), self.ttl_seconds),
+            )
+            self._stored += 1
+            if self._stored % PURGE_EVERY == 0:
+                await self.purge_expired()
+        except Exception as e:
+            logger.warning("Failed to persist idempotency record", error=str(e))
+
+    async def purge_expired(self) -> None:
+        """Delete expired delivery records."""
+        db = get_db() if settings.is_database_configured else None
+        if not db:
+            return
+        await db.execute("DELETE FROM webhook_deliveries WHERE expires_at <= NOW()")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "replays": self.replays,
+            "inflight": len(self._inflight),
+            "held": len(self._held),
+            "memory": self.memory.stats(),
+        }
+
+
+# =============================================================================
+# STORE SINGLETON
+# =============================================================================
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.idempotency_ttl_seconds,
+    memory_size=settings.idempotency_memory_size,
+)
@@ -0,0 +1,100 @@
+"""
+Keyword Matching
+Precompiled multi-pattern matcher shared by lead scoring and quote scoping
+"""
+
+import re
+from typing import Optional, Sequence
+
+# =============================================================================
+# RULE TABLE
+# =============================================================================
+# field -> category -> keywords. Keywords are matched as lowercase substrings.
+
+KEYWORD_RULES: dict[str, dict[str, tuple[str, ...]]] = {
+    "budget": {
+        "amount": ("$", "k", "50", "100", "20"),
+        "flexible": ("flexible", "discuss"),
+    },
+    "urgency": {
+        "immediate": ("asap", "urgent", "immediately", "now"),
+        "soon": ("month", "week", "soon"),
+    },
+    "role": {
+        "executive": ("ceo", "cto", "founder", "owner", "director"),
+        "manager": ("manager", "head", "lead", "vp"),
+    },
+    "automation_area": {
+        "chatbot": ("chatbot", "ai", "assistant", "bot"),
+        "workflow": ("workflow", "process", "automation"),
+        "integration": ("integration", "api", "sync", "connect"),
+        "data": ("data", "report", "analytics", "dashboard"),
+    },
+}
+
+
+class KeywordMatcher:
+    """
+    Finds which keyword categories occur in a text with one regex scan.
+
+    Gives the same answer as ``any(k in text.lower() for k in keywords)``
+    for each category. All keywords are compiled into one alternation.
+    After each hit the scan resumes one character past the start of the
+    hit rather than its end, so overlapping keywords of another category
+    ("soonow" holds both "soon" and "now") are still found. The scan
+    stops early once every category has matched.
+    """
+
+    def __init__(self, categories: dict[str, Sequence[str]]):
+        self.categories = {name: tuple(k.lower() for k in kws) for name, kws in categories.items()}
+        self._category_of: dict[str, str] = {}
+
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                owner = self._category_of.setdefault(keyword, name)
+                if owner != name:
+                    raise ValueError(f"Keyword {keyword!r} is in both {owner!r} and {name!r}")
+
+        # At one position only the longest keyword is reported, so a shorter
+        # keyword it starts with must belong to the same category
+        for a, cat_a in self._category_of.items():
+            for b, cat_b in self._category_of.items():
+                if cat_a != cat_b and a.startswith(b):
+                    raise ValueError(f"Keyword {b!r} is a prefix of {a!r} in another category")
+
+        self._search = re.compile(
+            "|".join(re.escape(k) for k in sorted(self._category_of, key=len, reverse=True))
+        ).search
+
+    def match(self, text: Optional[str]) -> frozenset[str]:
+        """Return the categories with at least one keyword in ``text``."""
+        if not text:
+            return frozenset()
+
+        lowered = text.lower()
+        search = self._search
+        category_of = self._category_of
+        remaining = len(self.categories)
+        found: set[str] = set()
+
+        hit = search(lowered)
+        while hit is not None:
+            category = category_of[hit.group()]
+            if category not in found:
+                found.add(category)
+                remaining -= 1
+                if not remaining:
+                    break
+            hit = search(lowered, hit.start() + 1)
+        return frozenset(found)
+
+
+# Built once at import so request handlers only pay for the scan
+MATCHERS: dict[str, KeywordMatcher] = {
+    field: KeywordMatcher(categories) for field, categories in KEYWORD_RULES.items()
+}
+
+
+def match_keywords(field: str, text: Optional[str]) -> frozenset[str]:
+    """Categories of ``KEYWORD_RULES[field]`` found in ``text``."""
+    return MATCHERS[field].match(text)
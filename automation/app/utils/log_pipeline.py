@@ -0,0 +1,174 @@
+"""
+Logging Pipeline
+structlog configuration for the service. In queue mode the event loop only
+builds the event dict and enqueues it; a listener thread renders it and
+writes to stdout. Chatty info events can be sampled, while warnings and
+errors are always kept.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from typing import Any, Optional
+
+import structlog
+
+from ..config import settings
+from .metrics import LOG_EVENTS_DROPPED
+from .tracing import add_trace_ids
+
+
+class LogSampler:
+    """
+    structlog processor keeping only ``rate`` of the listed info events.
+
+    Debug and info events named in ``events`` are dropped at random;
+    anything logged at warning or above always goes through.
+    """
+
+    def __init__(self, rate: float = 1.0, events: Optional[list[str]] = None):
+        self.rate = rate
+        self.events = frozenset(events or ())
+        self.sampled_out = 0
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict) -> dict:
+        if (
+            self.rate < 1.0
+            and method_name in ("debug", "info")
+            and event_dict.get("event") in self.events
+            and random.random() >= self.rate
+        ):
+            self.sampled_out += 1
+            LOG_EVENTS_DROPPED.labels(reason="sampled").inc()
+            raise structlog.DropEvent
+        return event_dict
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a ``QueueListener`` without formatting them.
+
+    The stock ``QueueHandler`` renders each record before enqueueing it,
+    which would keep the JSON encoding on the event loop; here the
+    listener's formatter does it. When the queue is full the record is
+    dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_EVENTS_DROPPED.labels(reason="queue_full").inc()
+
+
+class LogPipeline:
+    """Owns the root handler, the optional queue listener, and the sampler."""
+
+    def __init__(self):
+        self.handler: Optional[logging.Handler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.sampler: Optional[LogSampler] = None
+
+    def configure(self) -> None:
+        """Configure structlog and the stdlib root logger from settings."""
+        self.sampler = LogSampler(settings.log_sample_rate, settings.log_sampled_events)
+        timestamper = structlog.processors.TimeStamper(fmt="iso")
+
+        structlog.configure(
+            processors=[
+                structlog.stdlib.filter_by_level,
+                self.sampler,
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                add_trace_ids,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+                timestamper,
+                structlog.processors.StackInfoRenderer(),
+                structlog.processors.format_exc_info,
+                structlog.processors.UnicodeDecoder(),
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ],
+            wrapper_class=structlog.stdlib.BoundLogger,
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            cache_logger_on_first_use=True,
+        )
+
+        # Rendering happens in the formatter, i.e. on the listener thread in queue mode
+        formatter = structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.JSONRenderer()
+                if not settings.debug
+                else structlog.dev.ConsoleRenderer(),
+            ],
+            foreign_pre_chain=[
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                timestamper,
+            ],
+        )
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(formatter)
+
+        self.stop()
+        root = logging.getLogger()
+        if self.handler is not None:
+            root.removeHandler(self.handler)
+
+        if settings.log_queue_enabled:
+            self.handler = BoundedQueueHandler(settings.log_queue_size)
+            self.listener = logging.handlers.QueueListener(
+                self.handler.queue, output, respect_handler_level=True
+            )
+            self.listener.start()
+            atexit.register(self.stop)
+        else:
+            self.handler = output
+
+        root.addHandler(self.handler)
+        root.setLevel(settings.log_level.upper())
+
+        if settings.log_lean_records:
+            # Record fields the renderer never prints (see the logging HOWTO's
+            # "Optimization" section); finding the caller walks the stack per
+            # record. These are logging module globals, so they apply to every
+            # handler in the process: funcName/lineno, thread and process
+            # fields come out empty. Set LOG_LEAN_RECORDS=false to keep them.
+            logging._srcfile = None
+            logging.logThreads = False
+            logging.logProcesses = False
+            logging.logMultiprocessing = False
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> dict[str, Any]:
+        handler = self.handler if isinstance(self.handler, BoundedQueueHandler) else None
+        return {
+            "mode": "queue" if handler else "sync",
+            "queued": handler.queue.qsize() if handler else 0,
+            "dropped": handler.dropped if handler else 0,
+            "sampled_out": self.sampler.sampled_out if self.sampler else 0,
+        }
+
+
+# =============================================================================
+# PIPELINE SINGLETON
+# =============================================================================
+
+log_pipeline = LogPipeline()
@@ -0,0 +1,141 @@
+"""
+Event Loop Monitor
+Continuously measures event-loop lag and reports callbacks that block the
+loop, with the stack they were blocked in
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Optional
+
+import structlog
+
+from ..config import settings
+from .metrics import EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_STALLS
+from .profiler import lag_stats, short_path
+
+logger = structlog.get_logger()
+
+
+class LoopMonitor:
+    """
+    Lag probe on the event loop plus a watchdog thread beside it.
+
+    The probe sleeps ``interval`` in a loop and records how late each
+    wake-up was in ``event_loop_lag_seconds``. The watchdog checks the
+    probe's heartbeat; once the loop has not come back for
+    ``slow_callback_ms`` it grabs the loop thread's stack, because by
+    the time the loop is free again the offending callback has returned.
+    When the probe next runs it logs one "Event loop blocked" warning per
+    stall with its full duration and that stack.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        slow_callback_ms: float = 100.0,
+        window: int = 3000,
+        max_frames: int = 30,
+    ):
+        self.interval = interval
+        self.slow_callback_ms = slow_callback_ms
+        self.max_frames = max_frames
+        self._lags: deque[float] = deque(maxlen=window)  # Recent samples, ms
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread: Optional[int] = None
+        self._heartbeat = 0.0
+        self._stall_stack: Optional[list[str]] = None
+
+        # Counters
+        self.stalls = 0
+        self.max_lag_ms = 0.0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._probe(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            "Event loop monitor started",
+            interval_ms=round(self.interval * 1000),
+            slow_callback_ms=self.slow_callback_ms,
+        )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _probe(self) -> None:
+        while True:
+            self._heartbeat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._heartbeat - self.interval)
+            lag_ms = lag * 1000
+
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            self._lags.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+            if lag_ms >= self.slow_callback_ms:
+                self.stalls += 1
+                EVENT_LOOP_STALLS.inc()
+                stack, self._stall_stack = self._stall_stack, None
+                logger.warning(
+                    "Event loop blocked",
+                    blocked_ms=round(lag_ms, 1),
+                    threshold_ms=self.slow_callback_ms,
+                    stack=stack,
+                )
+
+    def _watch(self) -> None:
+        threshold = self.slow_callback_ms / 1000
+        check_every = max(0.005, min(self.interval, threshold) / 2)
+        reported = 0.0
+
+        while not self._stop.wait(check_every):
+            heartbeat = self._heartbeat
+            overdue = time.perf_counter() - heartbeat - self.interval
+            if overdue < threshold or heartbeat == reported:
+                continue
+            reported = heartbeat  # One stack per stall
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)[-self.max_frames :]
+            self._stall_stack = [f"{short_path(f.filename)}:{f.lineno} {f.name}" for f in frames]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "stalls": self.stalls,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "recent_lag": lag_stats(list(self._lags)),
+        }
+
+
+# =============================================================================
+# MONITOR SINGLETON
+# =============================================================================
+
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor_interval,
+    slow_callback_ms=settings.loop_slow_callback_ms,
+)
@@ -0,0 +1,167 @@
+"""
+Prometheus Metrics
+Latency histograms for each stage of webhook handling (HTTP, database,
+OpenAI, PDF, email, Slack), exposed on ``/metrics``. Every histogram has an
+``outcome`` label, so its ``_count`` series are the success/failure counters.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets in seconds; external APIs get a longer tail than the database
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and webhook event",
+    ["method", "route", "event", "status", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+WEBHOOK_JOB_SECONDS = Histogram(
+    "webhook_job_duration_seconds",
+    "Background webhook handler run time by event",
+    ["event", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Database statement latency (including pool checkout) by operation",
+    ["operation", "outcome"],
+    buckets=FAST_BUCKETS,
+)
+OPENAI_REQUEST_SECONDS = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI chat completion latency",
+    ["operation", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "Tokens reported by OpenAI responses",
+    ["kind"],
+)
+SCORING_FALLBACKS = Counter(
+    "lead_scoring_fallbacks_total",
+    "Leads scored by the rule-based fallback instead of the model",
+    ["reason"],
+)
+PDF_RENDER_SECONDS = Histogram(
+    "pdf_render_duration_seconds",
+    "Quote PDF render time",
+    ["outcome"],
+    buckets=SLOW_BUCKETS,
+)
+EMAIL_SEND_SECONDS = Histogram(
+    "email_send_duration_seconds",
+    "Resend API request latency",
+    ["operation", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+SLACK_SEND_SECONDS = Histogram(
+    "slack_send_duration_seconds",
+    "Slack webhook post latency",
+    ["outcome"],
+    buckets=SLOW_BUCKETS,
+)
+SLACK_QUEUE_DEPTH = Gauge(
+    "slack_queue_depth",
+    "Slack messages waiting to be posted, per channel",
+    ["channel"],
+)
+SLACK_MESSAGES_DROPPED = Counter(
+    "slack_messages_dropped_total",
+    "Slack messages not posted: the channel queue was full or the wait timed out",
+    ["channel", "reason"],
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "job_queue_depth",
+    "Webhook jobs waiting for a worker",
+)
+JOBS_REJECTED = Counter(
+    "jobs_rejected_total",
+    "Webhook jobs refused because the job queue was full",
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke a periodic probe",
+    buckets=LAG_BUCKETS,
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Callbacks that held the event loop longer than the slow-callback threshold",
+)
+LOG_EVENTS_DROPPED = Counter(
+    "log_events_dropped_total",
+    "Log events not written: sampled out, or the log queue was full",
+    ["reason"],
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the block's duration, labelled ``outcome="ok"`` or ``"error"``."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        histogram.labels(outcome=outcome, **labels).observe(time.perf_counter() - started)
+
+
+_STATEMENT_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+([a-z_][a-z0-9_]*)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def db_operation(query: str) -> str:
+    """Low-cardinality label for a statement, e.g. ``select:leads``."""
+    words = query.split(None, 1)
+    verb = words[0].lower() if words else "unknown"
+    match = _STATEMENT_TABLE.search(query)
+    return f"{verb}:{match.group(1).lower()}" if match else verb
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording ``http_request_duration_seconds``.
+
+    Labels use the matched route template (not the raw path) and the
+    webhook event a handler stored in ``request.state.event_type``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            event = (scope.get("state") or {}).get("event_type", "")
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                event=str(event),
+                status=str(status),
+                outcome="ok" if status < 500 else "error",
+            ).observe(time.perf_counter() - started)
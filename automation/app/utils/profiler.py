@@ -0,0 +1,216 @@
+"""
+Sampling Profiler
+Samples the event-loop thread's stack from a background thread and folds
+the samples into collapsed stacks (the input format of flamegraph.pl and
+speedscope), alongside event-loop lag measured over the same window
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import FrameType
+from typing import Any, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Innermost frames that mean the loop is waiting for I/O, not running code
+_IDLE_FRAMES = {("selectors.py", "select"), ("selectors.py", "poll")}
+
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+@lru_cache(maxsize=4096)
+def short_path(filename: str) -> str:
+    """``app/api/webhooks.py`` or ``httpx/_client.py`` instead of an absolute path."""
+    for marker in ("site-packages" + os.sep, "dist-packages" + os.sep):
+        if marker in filename:
+            return filename.rsplit(marker, 1)[1]
+    if filename.startswith(_STDLIB):
+        return filename[len(_STDLIB) :]
+    try:
+        relative = os.path.relpath(filename)
+    except ValueError:
+        return filename
+    return filename if relative.startswith("..") else relative
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def lag_stats(samples_ms: list[float]) -> dict[str, Any]:
+    """Summary of event-loop lag samples, in milliseconds."""
+    if not samples_ms:
+        return {"samples": 0}
+    ordered = sorted(samples_ms)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+    return {
+        "samples": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def measure_lag(duration: float, interval: float = 0.01) -> list[float]:
+    """
+    Sleep ``interval`` repeatedly for ``duration`` seconds, recording how
+    late each wake-up was. A busy or blocked loop shows up as large lag.
+    """
+    samples: list[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, (time.perf_counter() - started - interval) * 1000))
+    return samples
+
+
+@dataclass
+class ProfileResult:
+    seconds: float
+    interval_ms: float
+    samples: int = 0
+    idle_samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    lag: dict[str, Any] = field(default_factory=dict)
+
+    def collapsed(self) -> str:
+        """One ``frame;frame;frame count`` line per distinct stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 20) -> dict[str, Any]:
+        """Sample counts, lag, and the functions most often on top of the stack."""
+        leaf: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaf[stack.rsplit(";", 1)[-1]] += count
+        busy = self.samples - self.idle_samples
+        return {
+            "seconds": self.seconds,
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "busy_ratio": round(busy / self.samples, 3) if self.samples else 0.0,
+            "event_loop_lag": self.lag,
+            "top_functions": [
+                {"function": name, "samples": count, "share": round(count / self.samples, 3)}
+                for name, count in leaf.most_common(top)
+            ],
+        }
+
+
+class LoopProfiler:
+    """
+    On-demand sampling profiler for the thread running the event loop.
+
+    A daemon thread reads the loop thread's current frame every
+    ``interval`` via ``sys._current_frames()``; nothing is hooked into the
+    interpreter, so the cost is one stack walk per sample and the loop is
+    never paused. Samples where the loop sits in ``select()`` waiting for
+    I/O are counted as idle and left out of the stacks unless requested.
+    A sample is only taken when the sampler gets the GIL, so C code that
+    holds it (rather than blocking in I/O) is attributed to the frame
+    that called it.
+    """
+
+    def __init__(self, max_depth: int = 128):
+        self.max_depth = max_depth
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def profile(
+        self,
+        seconds: float,
+        interval: float = 0.005,
+        include_idle: bool = False,
+    ) -> ProfileResult:
+        """
+        Profile the running loop for ``seconds``.
+
+        Raises:
+            ProfilerBusy: If a profile is already in progress
+        """
+        if self._running:
+            raise ProfilerBusy("A profile is already running")
+        self._running = True
+
+        result = ProfileResult(seconds=seconds, interval_ms=round(interval * 1000, 2))
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample,
+            args=(threading.get_ident(), interval, stop, result, include_idle),
+            name="loop-profiler",
+            daemon=True,
+        )
+
+        logger.info("Profiling event loop", seconds=seconds, interval_ms=result.interval_ms)
+        sampler.start()
+        try:
+            result.lag = lag_stats(await measure_lag(seconds))
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+            self._running = False
+
+        logger.info(
+            "Event loop profile finished",
+            samples=result.samples,
+            idle_samples=result.idle_samples,
+            lag_p99_ms=result.lag.get("p99_ms"),
+        )
+        return result
+
+    def _sample(
+        self,
+        thread_id: int,
+        interval: float,
+        stop: threading.Event,
+        result: ProfileResult,
+        include_idle: bool,
+    ) -> None:
+        while not stop.wait(interval):
+            frame: Optional[FrameType] = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            result.samples += 1
+
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                result.idle_samples += 1
+                if not include_idle:
+                    continue
+
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            result.stacks[";".join(reversed(labels))] += 1
+
+
+# =============================================================================
+# PROFILER SINGLETON
+# =============================================================================
+
+loop_profiler = LoopProfiler()
@@ -48,3 +48,24 @@ def verify_signature(
         return hmac.compare_digest(expected, signature)
     except (ValueError, TypeError):
         return False
+
+
+def verify_bearer_token(authorization: Optional[str], token: str) -> bool:
+    """
+    Check an ``Authorization: Bearer <token>`` header using timing-safe comparison.
+
+    Args:
+        authorization: The Authorization header value
+        token: The expected token
+
+    Returns:
+        True if the header carries the token
+    """
+    if not authorization or not token:
+        return False
+
+    scheme, _, credentials = authorization.partition(" ")
+    if scheme.lower() != "bearer":
+        return False
+
+    return hmac.compare_digest(credentials.strip().encode("utf-8"), token.encode("utf-8"))
@@ -0,0 +1,94 @@
+"""
+Startup Timing
+Per-phase initialization timings for the lifespan, and a per-module
+import-cost report built from ``python -X importtime``
+"""
+
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+import structlog
+
+from .. import IMPORT_STARTED
+
+logger = structlog.get_logger()
+
+
+class StartupTimer:
+    """Records how long each startup phase took, and when the app became ready."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.phases: dict[str, float] = {}
+        self.ready_ms: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def ready(self) -> None:
+        """Mark the point where the app starts accepting requests."""
+        self.ready_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        logger.info("Startup complete", ready_ms=self.ready_ms, phases=self.phases)
+
+    def report(self) -> dict[str, Any]:
+        return {"ready_ms": self.ready_ms, "phases": dict(self.phases)}
+
+
+# Measured from the moment the ``app`` package was first imported
+startup_timer = StartupTimer(IMPORT_STARTED)
+
+
+def import_report(module: str = "app.main", top: int = 15) -> dict[str, Any]:
+    """
+    Import ``module`` in a fresh interpreter and summarise where the time went.
+
+    Returns the total, the slowest ``app.*`` modules by cumulative time
+    (including what they pull in), and third-party packages by their own
+    import time.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,  # Checked below, so the error carries the child's stderr
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    app_modules: dict[str, int] = {}
+    packages: dict[str, int] = defaultdict(int)
+    total = 0
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if not own.isdigit():
+            continue  # Header row
+        own_us, cumulative_us = int(own), int(cumulative)
+        total += own_us
+
+        if name.split(".")[0] == "app":
+            app_modules[name] = max(app_modules.get(name, 0), cumulative_us)
+        else:
+            packages[name.split(".")[0]] += own_us
+
+    def ranked(times: dict[str, int]) -> list[tuple[str, float]]:
+        ordered = sorted(times.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [(name, round(us / 1000, 1)) for name, us in ordered]
+
+    return {
+        "module": module,
+        "total_ms": round(total / 1000, 1),
+        "app_modules": ranked(app_modules),
+        "packages": ranked(packages),
+    }
@@ -0,0 +1,324 @@
+"""
+Tracing
+Lightweight spans for following one webhook through every stage. The
+current span lives in a context variable, so it follows ``await`` and
+``asyncio.create_task``; finished spans are batched to a JSON-lines file
+or an OTLP/HTTP collector.
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+import structlog
+
+from ..config import settings
+from .http import http_clients
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str]]:
+    """``(trace_id, parent_span_id)`` from a W3C ``traceparent`` header."""
+    parts = (header or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+@contextmanager
+def span(
+    name: str,
+    parent: Optional[Span] = None,
+    remote_parent: Optional[tuple[str, str]] = None,
+    child_only: bool = False,
+    **attributes: Any,
+) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a span, child of ``parent`` or the current span.
+
+    Without a parent a new trace starts, unless ``child_only`` is set
+    (for low-level spans such as queries that are only worth recording
+    as part of a larger operation). ``remote_parent`` continues a trace
+    from another service (see ``parse_traceparent``). Exceptions mark
+    the span as failed and propagate.
+    """
+    parent = parent or _current.get()
+    if not settings.tracing_enabled or (child_only and parent is None):
+        yield None
+        return
+
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    elif remote_parent is not None:
+        trace_id, parent_id = remote_parent
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+
+    current = Span(name, trace_id, secrets.token_hex(8), parent_id, attributes=attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"[:300]
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current.reset(token)
+        span_exporter.export(current)
+
+
+def traced(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator running an async function inside a span."""
+
+    def decorate(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def add_trace_ids(logger: Any, method_name: str, event_dict: dict) -> dict:
+    """structlog processor: tag every event logged inside a span."""
+    current = _current.get()
+    if current is not None:
+        event_dict.setdefault("trace_id", current.trace_id)
+        event_dict.setdefault("span_id", current.span_id)
+    return event_dict
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening the root span for each HTTP request.
+
+    Continues the caller's trace when a ``traceparent`` header is sent,
+    and returns the trace id in ``X-Trace-Id``. Health and metrics
+    endpoints are not traced.
+    """
+
+    def __init__(self, app, skip_prefixes: tuple[str, ...] = ("/health", "/metrics")):
+        self.app = app
+        self.skip_prefixes = skip_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.skip_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        remote = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+
+        with span(f"{scope['method']} {scope['path']}", remote_parent=remote) as root:
+            status = 500
+
+            async def send_wrapper(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if root is not None:
+                        message.setdefault("headers", [])
+                        message["headers"] = [
+                            *message["headers"],
+                            (b"x-trace-id", root.trace_id.encode()),
+                        ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if root is not None:
+                    route = scope.get("route")
+                    if route is not None:
+                        root.name = f"{scope['method']} {route.path}"
+                    event = (scope.get("state") or {}).get("event_type")
+                    root.set(http_status=status, **({"event": event} if event else {}))
+
+
+class SpanExporter:
+    """
+    Buffers finished spans and writes them out in batches.
+
+    ``kind`` is ``"file"`` (JSON lines at ``path``), ``"otlp"`` (OTLP/HTTP
+    JSON to ``endpoint``) or ``""`` to discard. At most ``max_queue`` spans
+    are buffered; beyond that new spans are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        kind: str = "",
+        path: str = ".cache/traces.jsonl",
+        endpoint: str = "",
+        flush_interval: float = 2.0,
+        max_queue: int = 10000,
+    ):
+        self.kind = kind
+        self.path = Path(path)
+        self.endpoint = endpoint
+        self.flush_interval = flush_interval
+        self._queue: deque[Span] = deque()
+        self.max_queue = max_queue
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def export(self, finished: Span) -> None:
+        if not self.kind:
+            return
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(finished)
+
+    async def start(self) -> None:
+        if self.kind and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="span-exporter")
+            logger.info("Span exporter started", exporter=self.kind)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        batch = [self._queue.popleft() for _ in range(len(self._queue))]
+        if not batch:
+            return
+        try:
+            if self.kind == "file":
+                await asyncio.to_thread(self._write, batch)
+            elif self.kind == "otlp":
+                await self._post(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.warning("Span export failed", exporter=self.kind, spans=len(batch), error=str(e))
+
+    def _write(self, batch: list[Span]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in batch)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    async def _post(self, batch: list[Span]) -> None:
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": settings.app_name}},
+                            {"key": "host.name", "value": {"stringValue": os.uname().nodename}},
+                        ]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "app"}, "spans": [s.to_otlp() for s in batch]}
+                    ],
+                }
+            ]
+        }
+        response = await http_clients.get("otlp").post(self.endpoint, json=body)
+        response.raise_for_status()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "exporter": self.kind or None,
+            "queued": len(self._queue),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+# =============================================================================
+# EXPORTER SINGLETON
+# =============================================================================
+
+span_exporter = SpanExporter(
+    kind=settings.tracing_exporter,
+    path=settings.tracing_file,
+    endpoint=settings.tracing_otlp_endpoint,
+    flush_interval=settings.tracing_flush_interval,
+)
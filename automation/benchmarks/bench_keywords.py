@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: compiled keyword matcher vs. repeated ``in`` scans
+
+Usage (from the automation/ directory):
+    python -m benchmarks.bench_keywords [--number N]
+
+Checks that both implementations agree on every sample before timing.
+"""
+
+import argparse
+import random
+import timeit
+
+from app.utils.keywords import KEYWORD_RULES, match_keywords
+
+SAMPLES = {
+    "budget": ["$10k-20k", "flexible, happy to discuss", "around 50 thousand", "not sure yet", ""],
+    "urgency": ["ASAP please", "within the next month", "no rush", "Immediately", "soonow"],
+    "role": ["Founder & CEO", "Head of Operations", "Software engineer", "VP Sales", "headirector"],
+    "automation_area": [
+        "AI chatbot for customer support",
+        "Invoice processing workflow with Xero sync",
+        "Weekly reporting dashboard from our CRM data",
+        "Lead qualification",
+        "processync",
+    ],
+}
+
+
+def legacy_match(field: str, text: str) -> frozenset[str]:
+    """The pre-matcher approach: one ``any(x in text ...)`` per category."""
+    if not text:
+        return frozenset()
+    lowered = text.lower()
+    return frozenset(
+        category
+        for category, keywords in KEYWORD_RULES[field].items()
+        if any(x in lowered for x in keywords)
+    )
+
+
+def _long_text(rng: random.Random) -> str:
+    words = "we need help with our customer onboarding and billing operations".split()
+    return " ".join(rng.choice(words) for _ in range(80)) + " dashboard"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000, help="Iterations per sample")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    samples = {field: texts + [_long_text(rng)] for field, texts in SAMPLES.items()}
+
+    for field, texts in samples.items():
+        for text in texts:
+            assert legacy_match(field, text) == match_keywords(field, text), (field, text)
+
+    print(f"{'field':<16}{'legacy us':>12}{'matcher us':>12}{'speedup':>10}")
+    for field, texts in samples.items():
+        legacy = timeit.timeit(
+            lambda field=field, texts=texts: [legacy_match(field, t) for t in texts], number=args.number
+        )
+        compiled = timeit.timeit(
+            lambda field=field, texts=texts: [match_keywords(field, t) for t in texts], number=args.number
+        )
+        per_call = 1e6 / (args.number * len(texts))
+        print(
+            f"{field:<16}{legacy * per_call:>12.2f}{compiled * per_call:>12.2f}"
+            f"{legacy / compiled:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Micro-benchmark: precompiled Jinja templates vs. the old f-string renderer
+
+Usage (from the automation/ directory):
+    python -m benchmarks.bench_templates [--number N] [--items N]
+
+Renders the quote PDF HTML with the legacy f-string code, the precompiled
+template (with and without autoescaping), Jinja's native async mode, and a
+template compiled on every call. Reports time and peak allocation per render.
+
+The templates do not beat the f-strings. On the 6-item sample the legacy
+renderer takes ~12 us and peaks at 9 KiB; the precompiled template takes
+~45-50 us and 14 KiB. Autoescaping alone accounts for ~20 us of that (the
+template runs ~25-30 us with it off). The rest is Jinja's per-render context
+and attribute lookups. What precompiling buys is avoiding the ~3.7 ms,
+300 KiB compile a render would otherwise cost. The legacy renderer does no
+HTML escaping at all, which is why it was replaced. enable_async runs
+~2x slower than a sync render, so async code renders synchronously.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable
+
+from jinja2 import Environment
+
+from app.models.lead import Lead
+from app.models.quote import Quote, QuoteItem
+from app.utils.templates import get_template_env, preload_templates, render_template
+
+
+def legacy_quote_html(quote: Quote, lead: Lead) -> str:
+    """The pre-template f-string renderer, kept verbatim for comparison."""
+    # Calculate totals
+    subtotal = sum(item.amount for item in quote.scope_items)
+    tax = subtotal * 0.1  # 10% GST
+    total = subtotal + tax
+
+    # Format dates
+    created_date = quote.created_at.strftime("%B %d, %Y")
+    valid_until = quote.valid_until.strftime("%B %d, %Y")
+
+    # Render items
+    items_html = ""
+    for item in quote.scope_items:
+        hours_text = f" ({item.hours} hours)" if item.hours else ""
+        items_html += f"""
+        <tr>
+            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
+                <strong>{item.title}</strong><br>
+                <span style="color: #6b7280; font-size: 14px;">{item.description}</span>
+            </td>
+            <td style="padding: 12px; border-bottom: 1px solid #e5e7eb; text-align: right;">
+                ${item.amount:,.2f}{hours_text}
+            </td>
+        </tr>
+        """
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Quote - {quote.project_title}</title>
+    <style>
+        @page {{ size: A4; margin: 2cm; }}
+        body {{ font-family: 'Helvetica Neue', Arial, sans-serif; color: #1f2937; line-height: 1.5; }}
+        .header {{ display: flex; justify-content: space-between; margin-bottom: 40px; }}
+        .logo {{ font-size: 24px; font-weight: bold; color: #fb6400; }}
+        .quote-info {{ text-align: right; }}
+        .client-info {{ margin-bottom: 30px; }}
+        .section {{ margin-bottom: 30px; }}
+        .section-title {{ font-size: 18px; font-weight: bold; margin-bottom: 15px; color: #374151; }}
+        table {{ width: 100%; border-collapse: collapse; }}
+        th {{ background: #f9fafb; padding: 12px; text-align: left; font-weight: 600; }}
+        .totals {{ margin-top: 20px; text-align: right; }}
+        .totals table {{ width: 300px; margin-left: auto; }}
+        .totals td {{ padding: 8px; }}
+        .total-row {{ font-size: 18px; font-weight: bold; background: #fb6400; color: white; }}
+        .footer {{ margin-top: 40px; padding-top: 20px; border-top: 1px solid #e5e7eb; font-size: 12px; color: #6b7280; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <div class="logo">Are You Human?</div>
+        <div class="quote-info">
+            <strong>Quote</strong><br>
+            Date: {created_date}<br>
+            Valid Until: {valid_until}
+        </div>
+    </div>
+
+    <div class="client-info">
+        <strong>Prepared For:</strong><br>
+        {lead.name}<br>
+        {lead.company or ''}<br>
+        {lead.email}
+    </div>
+
+    <div class="section">
+        <div class="section-title">{quote.project_title}</div>
+        <p>{quote.project_summary}</p>
+    </div>
+
+    <div class="section">
+        <div class="section-title">Scope of Work</div>
+        <table>
+            <thead>
+                <tr>
+                    <th>Description</th>
+                    <th style="text-align: right;">Amount</th>
+                </tr>
+            </thead>
+            <tbody>
+                {items_html}
+            </tbody>
+        </table>
+    </div>
+
+    <div class="totals">
+        <table>
+            <tr>
+                <td>Subtotal:</td>
+                <td style="text-align: right;">${subtotal:,.2f}</td>
+            </tr>
+            <tr>
+                <td>GST (10%):</td>
+                <td style="text-align: right;">${tax:,.2f}</td>
+            </tr>
+            <tr class="total-row">
+                <td style="padding: 12px;">Total ({quote.currency}):</td>
+                <td style="text-align: right; padding: 12px;">${total:,.2f}</td>
+            </tr>
+        </table>
+    </div>
+
+    <div class="footer">
+        <p><strong>Terms & Conditions:</strong></p>
+        <ul>
+            <li>50% deposit required to commence work</li>
+            <li>Balance due upon project completion</li>
+            <li>Quote valid for 30 days</li>
+            <li>Prices exclude any third-party software licenses</li>
+        </ul>
+        <p style="margin-top: 20px;">
+            <strong>Are You Human?</strong> | AI-Powered Automation Consulting<br>
+            areyouhuman.com
+        </p>
+    </div>
+</body>
+</html>"""
+
+
+def _sample(items: int) -> tuple[Quote, Lead]:
+    scope = [
+        QuoteItem(
+            title=f"Workstream {i}",
+            description="Process automation with integrations, error handling & monitoring",
+            amount=1500.0 + i * 250,
+            hours=8 + i,
+        )
+        for i in range(items)
+    ]
+    subtotal = sum(item.amount for item in scope)
+    now = datetime(2026, 1, 15)
+    quote = Quote(
+        id="q_bench",
+        lead_id="l_bench",
+        project_title="Workflow Automation for Acme",
+        project_summary="Automate invoice intake and approvals",
+        scope_items=scope,
+        subtotal=subtotal,
+        total_amount=subtotal * 1.1,
+        valid_until=now,
+        created_at=now,
+    )
+    lead = Lead(id="l_bench", name="Ada Lovelace", email="ada@example.com", company="Acme", created_at=now)
+    return quote, lead
+
+
+def _context(quote: Quote, lead: Lead) -> dict:
+    subtotal = sum(item.amount for item in quote.scope_items)
+    tax = subtotal * 0.1
+    return {"quote": quote, "lead": lead, "subtotal": subtotal, "tax": tax, "total": subtotal + tax}
+
+
+def _measure(render: Callable[[], str], number: int) -> tuple[float, int]:
+    """Microseconds per render and peak bytes allocated by one render."""
+    render()
+    started = time.perf_counter()
+    for _ in range(number):
+        render()
+    per_call = (time.perf_counter() - started) / number * 1e6
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000, help="Renders per variant")
+    parser.add_argument("--items", type=int, default=6, help="Scope items in the sample quote")
+    args = parser.parse_args()
+
+    preload_templates()
+    quote, lead = _sample(args.items)
+    context = _context(quote, lead)
+    template_env = get_template_env()
+    source = template_env.loader.get_source(template_env, "quote.html")[0]
+    template = template_env.get_template("quote.html")
+    async_env = Environment(loader=template_env.loader, autoescape=True, enable_async=True)
+    async_env.filters.update(template_env.filters)
+    native_async = async_env.get_template("quote.html")
+    raw_env = Environment(loader=template_env.loader, autoescape=False)
+    raw_env.filters.update(template_env.filters)
+    unescaped = raw_env.get_template("quote.html")
+    loop = asyncio.new_event_loop()
+
+    variants = {
+        "f-string (legacy)": lambda: legacy_quote_html(quote, lead),
+        "jinja precompiled": lambda: template.render(**context),
+        "render_template()": lambda: render_template("quote.html", **context),
+        "jinja autoescape off": lambda: unescaped.render(**context),
+        "jinja enable_async": lambda: loop.run_until_complete(native_async.render_async(**context)),
+        "jinja per-call compile": lambda: template_env.from_string(source).render(**context),
+    }
+
+    print(f"{'variant':<26}{'us/render':>12}{'peak KiB':>12}")
+    for name, render in variants.items():
+        per_call, peak = _measure(render, args.number)
+        print(f"{name:<26}{per_call:>12.1f}{peak / 1024:>12.1f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Local stand-ins for OpenAI, Resend and Slack, used by the load test
+
+Usage (from the automation/ directory):
+    python -m benchmarks.fakes [--port N] [--latency openai=600,resend=150]
+        [--jitter 0.25] [--errors openai=0.02] [--error-status slack=429]
+
+Each upstream answers after its configured latency (+/- jitter) and fails
+the given share of requests with its error status. Point the app at:
+    OPENAI_BASE_URL=http://127.0.0.1:PORT/openai/v1
+    RESEND_BASE_URL=http://127.0.0.1:PORT/resend
+    SLACK_WEBHOOK_URL=http://127.0.0.1:PORT/slack/hook
+``GET /_stats`` returns per-upstream request and error counts.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+UPSTREAMS = ("openai", "resend", "slack")
+
+
+@dataclass
+class FakeUpstream:
+    latency_ms: float = 0.0
+    jitter: float = 0.0  # Fraction of latency_ms, applied uniformly +/-
+    error_rate: float = 0.0
+    error_status: int = 500
+    requests: int = 0
+    errors: int = 0
+
+    async def respond(self) -> Optional[int]:
+        """Wait out the latency; return an error status if this request should fail."""
+        self.requests += 1
+        delay = self.latency_ms * (1 + random.uniform(-self.jitter, self.jitter))
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors += 1
+            return self.error_status
+        return None
+
+
+def _error(status: int) -> JSONResponse:
+    headers = {"Retry-After": "1"} if status == 429 else None
+    return JSONResponse({"error": {"message": "injected failure"}}, status, headers=headers)
+
+
+def _chat_completion(model: str) -> dict:
+    scores = {
+        "interest_level": random.randint(8, 20),
+        "budget_clarity": random.randint(5, 20),
+        "urgency": random.randint(3, 15),
+        "problem_clarity": random.randint(8, 20),
+        "decision_authority": random.randint(3, 15),
+        "tech_readiness": random.randint(2, 10),
+    }
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(scores)},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 350, "completion_tokens": 60, "total_tokens": 410},
+    }
+
+
+def create_app(upstreams: dict[str, FakeUpstream]) -> FastAPI:
+    app = FastAPI(title="Load test fakes")
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if status := await upstreams["openai"].respond():
+            return _error(status)
+        return _chat_completion(body.get("model", "gpt-4o-mini"))
+
+    @app.post("/resend/emails")
+    async def send_email(request: Request):
+        await request.body()
+        if status := await upstreams["resend"].respond():
+            return _error(status)
+        return {"id": str(uuid.uuid4())}
+
+    @app.post("/resend/emails/batch")
+    async def send_batch(request: Request):
+        messages = await request.json()
+        if status := await upstreams["resend"].respond():
+            return _error(status)
+        return {"data": [{"id": str(uuid.uuid4())} for _ in messages]}
+
+    @app.post("/slack/hook")
+    async def slack_hook(request: Request):
+        await request.body()
+        if status := await upstreams["slack"].respond():
+            return _error(status)
+        return PlainTextResponse("ok")
+
+    @app.get("/_stats")
+    async def stats():
+        return {
+            name: {"requests": upstream.requests, "errors": upstream.errors}
+            for name, upstream in upstreams.items()
+        }
+
+    return app
+
+
+def parse_pairs(value: str) -> dict[str, float]:
+    """``"openai=600,slack=80"`` -> ``{"openai": 600.0, "slack": 80.0}``."""
+    pairs = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, number = item.partition("=")
+        if name not in UPSTREAMS:
+            raise argparse.ArgumentTypeError(f"Unknown upstream {name!r} (expected {UPSTREAMS})")
+        pairs[name] = float(number)
+    return pairs
+
+
+def build_upstreams(
+    latency: dict[str, float],
+    errors: dict[str, float],
+    error_status: dict[str, float],
+    jitter: float,
+) -> dict[str, FakeUpstream]:
+    return {
+        name: FakeUpstream(
+            latency_ms=latency.get(name, 0.0),
+            jitter=jitter,
+            error_rate=errors.get(name, 0.0),
+            error_status=int(error_status.get(name, 500)),
+        )
+        for name in UPSTREAMS
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--latency",
+        type=parse_pairs,
+        default=parse_pairs("openai=600,resend=150,slack=100"),
+        help="Mean response time in ms per upstream",
+    )
+    parser.add_argument("--jitter", type=float, default=0.25, help="Latency spread, +/- fraction")
+    parser.add_argument("--errors", type=parse_pairs, default={}, help="Failure rate per upstream")
+    parser.add_argument(
+        "--error-status", type=parse_pairs, default={}, help="HTTP status for injected failures"
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8801)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    upstreams = build_upstreams(args.latency, args.errors, args.error_status, args.jitter)
+    print(json.dumps({name: asdict(u) for name, u in upstreams.items()}), flush=True)
+    uvicorn.run(create_app(upstreams), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+"""
+End-to-end load test: the app under uvicorn against local fakes and Postgres
+
+Usage (from the automation/ directory):
+    python -m benchmarks.loadtest [--rate 20] [--duration 30] [--warmup 5]
+        [--mix lead.created=6,quote.accepted=2,conversation.completed=2]
+        [--database-url URL] [--latency openai=600] [--errors openai=0.02]
+        [--env KEY=VALUE ...] [--output report.json]
+        [--baseline benchmarks/loadtest_baseline.json] [--update-baseline]
+
+Starts the fakes (see ``benchmarks.fakes``) and the app as subprocesses,
+seeds the leads, quotes and conversations the webhooks refer to, and sends
+signed webhooks open-loop at ``--rate`` per second: requests go out on
+schedule whether or not earlier ones have answered, so a slow server shows
+up as latency instead of a lower send rate. Requests in the first
+``--warmup`` seconds are excluded from the report. After the run it waits
+for the job queue to drain and reports throughput, p50/p95/p99 and error
+rate per event, plus background job and upstream call counts.
+
+Without ``--database-url`` a throwaway Postgres is started with pgserver
+(pip install pgserver). With ``--baseline`` the results are compared with
+a previous run and the exit status is 1 if any event's latency or
+throughput regressed by more than ``--tolerance``, if the average job wait
+or run time or the queue drain time grew by more than that, or if an
+error rate or the job failure rate went up. Compare runs from
+the same machine; the driver warns when it could not keep to the rate.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+from app.utils.security import generate_signature
+
+from .fakes import add_arguments
+
+ROOT = Path(__file__).resolve().parent.parent
+EVENT_ROUTES = {
+    "lead.created": "/webhooks/lead",
+    "quote.accepted": "/webhooks/quote",
+    "conversation.completed": "/webhooks/conversation",
+}
+SEED_MARKER = "loadtest.example.com"  # Email domain of seeded rows, used for cleanup
+
+PROBLEMS = [
+    "We spend 20 hours a week copying invoices from email into Xero and need it automated ASAP",
+    "Our support team answers the same questions all day, we want an AI chatbot on the website",
+    "Weekly reporting takes two days; we need a dashboard pulling from HubSpot and Stripe",
+    "Looking to automate lead qualification and follow-up emails for our sales team",
+    "Not sure yet, exploring what automation could do for a small accounting firm",
+]
+
+
+@dataclass
+class Sample:
+    event: str
+    status: int
+    latency_ms: float
+    measured: bool
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+
+# =============================================================================
+# PROCESSES AND DATA
+# =============================================================================
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_postgres(data_dir: str) -> tuple[str, Any]:
+    try:
+        import pgserver
+    except ImportError:
+        sys.exit("No --database-url given and pgserver is not installed (pip install pgserver)")
+    server = pgserver.get_server(data_dir, cleanup_mode="stop")
+    return server.get_uri(), server
+
+
+def apply_schema(conn: Any) -> None:
+    """Run schema.sql, standing in for uuid-ossp where it is not installed (e.g. pgserver)."""
+    import psycopg
+
+    schema = (ROOT / "schema.sql").read_text()
+    try:
+        conn.execute(schema)
+    except psycopg.errors.FeatureNotSupported:
+        conn.execute(
+            "CREATE OR REPLACE FUNCTION uuid_generate_v4() RETURNS uuid "
+            "AS 'SELECT gen_random_uuid()' LANGUAGE SQL"
+        )
+        conn.execute(schema.replace('CREATE EXTENSION IF NOT EXISTS "uuid-ossp";', ""))
+
+
+def prepare_database(database_url: str, plan: dict[str, int]) -> dict[str, list[str]]:
+    """Apply schema.sql and insert the rows each planned webhook will refer to."""
+    import psycopg
+
+    ids: dict[str, list[str]] = {event: [] for event in EVENT_ROUTES}
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        apply_schema(conn)
+        with conn.cursor() as cur:
+            for i in range(max(plan.values())):
+                lead_id, quote_id, conversation_id = (str(uuid.uuid4()) for _ in range(3))
+                cur.execute(
+                    "INSERT INTO leads (id, name, email, company, problem_text) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    (lead_id, f"Lead {i}", f"lead{i}@{SEED_MARKER}", f"Company {i}", PROBLEMS[i % 5]),
+                )
+                cur.execute(
+                    "INSERT INTO quotes (id, lead_id, project_title, total_amount, status) "
+                    "VALUES (%s, %s, 'Load test project', 12000, 'sent')",
+                    (quote_id, lead_id),
+                )
+                cur.execute(
+                    "INSERT INTO conversations (id, lead_id) VALUES (%s, %s)",
+                    (conversation_id, lead_id),
+                )
+                ids["lead.created"].append(lead_id)
+                ids["quote.accepted"].append(quote_id)
+                ids["conversation.completed"].append(conversation_id)
+    return ids
+
+
+def cleanup_database(database_url: str) -> None:
+    """Delete the seeded leads and every quote, conversation and outbox row about them."""
+    import psycopg
+
+    seeded = "SELECT id FROM leads WHERE email LIKE %s"
+    marker = (f"%@{SEED_MARKER}",)
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        conn.execute(f"DELETE FROM quotes WHERE lead_id IN ({seeded})", marker)
+        conn.execute(f"DELETE FROM conversations WHERE lead_id IN ({seeded})", marker)
+        conn.execute(
+            "DELETE FROM outbox WHERE lead_id IN (SELECT id::text FROM leads WHERE email LIKE %s)",
+            marker,
+        )
+        conn.execute("DELETE FROM leads WHERE email LIKE %s", marker)
+
+
+def spawn(args: list[str], env: dict[str, str], log_path: Path) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        args, cwd=ROOT, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+async def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited with status {process.returncode}")
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+# =============================================================================
+# TRAFFIC
+# =============================================================================
+
+
+def build_payload(event: str, target_id: str, rng: random.Random) -> dict:
+    if event == "lead.created":
+        i = rng.randrange(1000)
+        data = {
+            "id": target_id,
+            "name": f"Lead {i}",
+            "email": f"lead{i}@{SEED_MARKER}",
+            "company": f"Company {i}",
+            "role": rng.choice(["Founder", "Head of Operations", "Engineer", "CFO"]),
+            "problem_text": rng.choice(PROBLEMS),
+            "budget_range": rng.choice(["$5k-10k", "$10k-25k", "$25k+", "not sure"]),
+            "urgency": rng.choice(["asap", "this quarter", "no rush"]),
+            "automation_area": rng.choice(["invoicing", "chatbot", "reporting", "sales"]),
+        }
+    elif event == "quote.accepted":
+        data = {"quote_id": target_id}
+    else:
+        data = {"conversation_id": target_id}
+    return {"event": event, "data": data}
+
+
+def schedule(plan: dict[str, int], rng: random.Random) -> list[str]:
+    events = [event for event, count in plan.items() for _ in range(count)]
+    rng.shuffle(events)
+    return events
+
+
+async def send(
+    client: httpx.AsyncClient, secret: str, event: str, payload: dict, measured: bool
+) -> Sample:
+    body = json.dumps(payload)
+    headers = {
+        "Content-Type": "application/json",
+        "X-Webhook-Signature": generate_signature(body, secret),
+        "X-Webhook-Delivery-Id": uuid.uuid4().hex,
+    }
+    started = time.perf_counter()
+    try:
+        response = await client.post(EVENT_ROUTES[event], content=body, headers=headers)
+        status, error = response.status_code, None
+    except httpx.HTTPError as e:
+        status, error = 0, type(e).__name__
+    return Sample(event, status, (time.perf_counter() - started) * 1000, measured, error)
+
+
+async def drive(
+    base_url: str, secret: str, events: list[str], ids: dict[str, list[str]], rate: float, warmup: float
+) -> tuple[list[Sample], float, int]:
+    """Send ``events`` open-loop at ``rate``/s. Returns samples, measured seconds, late sends."""
+    rng = random.Random(42)
+    cursors: dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    tasks: list[asyncio.Task] = []
+    late = 0
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        started = time.perf_counter()
+        for i, event in enumerate(events):
+            due = started + i / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -0.05:
+                late += 1  # The driver itself fell behind schedule
+            target = ids[event][cursors[event]]
+            cursors[event] += 1
+            payload = build_payload(event, target, rng)
+            tasks.append(asyncio.create_task(send(client, secret, event, payload, i / rate >= warmup)))
+        samples = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return list(samples), max(elapsed - warmup, 1e-9), late
+
+
+async def wait_drained(client: httpx.AsyncClient, timeout: float = 120.0) -> dict[str, Any]:
+    """Poll the job queue until nothing is queued or running."""
+    started = time.monotonic()
+    while True:
+        stats = (await client.get("/jobs")).json()
+        if stats["queue_depth"] == 0 and stats["running"] == 0:
+            break
+        if time.monotonic() - started > timeout:
+            break
+        await asyncio.sleep(0.25)
+    stats["drain_seconds"] = round(time.monotonic() - started, 2)
+    return stats
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def summarize(samples: list[Sample], seconds: float) -> dict[str, dict[str, float]]:
+    groups: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        if sample.measured:
+            groups[sample.event].append(sample)
+            groups["all"].append(sample)
+
+    report = {}
+    for event, group in groups.items():
+        latencies = sorted(s.latency_ms for s in group)
+        errors = sum(not s.ok for s in group)
+        report[event] = {
+            "requests": len(group),
+            "throughput": round(len(group) / seconds, 2),
+            "error_rate": round(errors / len(group), 4),
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p95_ms": round(percentile(latencies, 0.95), 1),
+            "p99_ms": round(percentile(latencies, 0.99), 1),
+            "max_ms": round(latencies[-1], 1),
+        }
+    return report
+
+
+def print_report(report: dict[str, dict[str, float]]) -> None:
+    print(
+        f"{'event':<24}{'requests':>9}{'req/s':>8}{'errors':>8}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    )
+    for event in sorted(report, key=lambda e: (e == "all", e)):
+        r = report[event]
+        print(
+            f"{event:<24}{r['requests']:>9}{r['throughput']:>8.1f}{r['error_rate']:>7.1%} "
+            f"{r['p50_ms']:>8.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}"
+        )
+
+
+def compare(
+    report: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+    slack_ms: float = 5.0,
+) -> list[str]:
+    """Regressions against the baseline: slower tails, more errors, or lower throughput."""
+    problems = []
+    for event, base in baseline.items():
+        current = report.get(event)
+        if current is None:
+            problems.append(f"{event}: no requests in this run")
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = base[metric] * (1 + tolerance) + slack_ms
+            if current[metric] > limit:
+                problems.append(f"{event}: {metric} {current[metric]} > {limit:.1f} (baseline {base[metric]})")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            problems.append(f"{event}: error_rate {current['error_rate']:.2%} (baseline {base['error_rate']:.2%})")
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            problems.append(f"{event}: throughput {current['throughput']} (baseline {base['throughput']})")
+    return problems
+
+
+def compare_jobs(
+    jobs: dict[str, float],
+    baseline: dict[str, float],
+    tolerance: float,
+    slack_ms: float = 5.0,
+) -> list[str]:
+    """Regressions in the job queue: longer waits, runs or drain, or more failures."""
+    problems = []
+    for metric, slack in (("avg_wait_ms", slack_ms), ("avg_run_ms", slack_ms), ("drain_seconds", 1.0)):
+        if metric not in baseline:
+            continue
+        limit = baseline[metric] * (1 + tolerance) + slack
+        if jobs[metric] > limit:
+            problems.append(f"jobs: {metric} {jobs[metric]} > {limit:.1f} (baseline {baseline[metric]})")
+    if jobs["failure_rate"] > baseline["failure_rate"] + 0.01:
+        problems.append(
+            f"jobs: failure_rate {jobs['failure_rate']:.2%} (baseline {baseline['failure_rate']:.2%})"
+        )
+    return problems
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        event, _, weight = item.partition("=")
+        if event not in EVENT_ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown event {event!r}")
+        mix[event] = float(weight)
+    return mix
+
+
+async def run(args: argparse.Namespace) -> int:
+    total = int(args.rate * (args.duration + args.warmup))
+    weights = sum(args.mix.values())
+    plan = {event: max(1, round(total * w / weights)) for event, w in args.mix.items()}
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-"))
+
+    postgres = None
+    database_url = args.database_url or os.environ.get("BENCH_DATABASE_URL", "")
+    if not database_url:
+        database_url, postgres = start_postgres(str(workdir / "pgdata"))
+    ids = prepare_database(database_url, plan)
+
+    fakes_port, app_port = free_port(), free_port()
+    fakes_url = f"http://127.0.0.1:{fakes_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+    secret = secrets.token_hex(16)
+
+    fake_args = ["--port", str(fakes_port), "--jitter", str(args.jitter)]
+    for flag, pairs in (("--latency", args.latency), ("--errors", args.errors), ("--error-status", args.error_status)):
+        if pairs:
+            fake_args += [flag, ",".join(f"{k}={v}" for k, v in pairs.items())]
+
+    app_env = {
+        "DATABASE_URL": database_url,
+        "WEBHOOK_SECRET": secret,
+        "OPENAI_API_KEY": "sk-loadtest",
+        "OPENAI_BASE_URL": f"{fakes_url}/openai/v1",
+        "RESEND_API_KEY": "re_loadtest",
+        "RESEND_BASE_URL": f"{fakes_url}/resend",
+        "SLACK_WEBHOOK_URL": f"{fakes_url}/slack/hook",
+        "TEAM_NOTIFICATION_EMAIL": f"team@{SEED_MARKER}",
+        "ENVIRONMENT": "loadtest",
+        "ADMIN_TOKEN": secrets.token_hex(16),
+        **dict(pair.split("=", 1) for pair in args.env),
+    }
+
+    processes = [
+        spawn([sys.executable, "-m", "benchmarks.fakes", *fake_args], {}, workdir / "fakes.log"),
+        spawn(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(app_port), "--log-level", "warning"],
+            app_env,
+            workdir / "app.log",
+        ),
+    ]
+    try:
+        await wait_ready(f"{fakes_url}/_stats", processes[0])
+        await wait_ready(f"{app_url}/health", processes[1])
+        print(f"Sending {sum(plan.values())} webhooks at {args.rate}/s ({plan}); logs in {workdir}")
+
+        samples, seconds, late = await drive(
+            app_url, secret, schedule(plan, random.Random(7)), ids, args.rate, args.warmup
+        )
+        admin = {"Authorization": f"Bearer {app_env['ADMIN_TOKEN']}"}
+        async with httpx.AsyncClient(base_url=app_url, headers=admin, timeout=10.0) as client:
+            jobs = await wait_drained(client)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            upstream_calls = (await client.get(f"{fakes_url}/_stats")).json()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+        if not args.keep_data:
+            cleanup_database(database_url)
+        if postgres is not None:
+            postgres.cleanup()
+
+    report = summarize(samples, seconds)
+    finished = jobs["succeeded"] + jobs["failed"]
+    jobs["failure_rate"] = round(jobs["failed"] / finished, 4) if finished else 0.0
+    print_report(report)
+    print(
+        f"\njobs: {jobs['succeeded']} succeeded, {jobs['failed']} failed, {jobs['rejected']} rejected, "
+        f"avg wait {jobs['avg_wait_ms']}ms, avg run {jobs['avg_run_ms']}ms, "
+        f"drained in {jobs['drain_seconds']}s"
+    )
+    print(f"upstream calls: {json.dumps(upstream_calls)}")
+    if late:
+        print(f"warning: the driver sent {late} requests more than 50ms late; results understate load")
+
+    config = {
+        "rate": args.rate,
+        "duration": args.duration,
+        "mix": args.mix,
+        "latency": args.latency,
+        "errors": args.errors,
+        "env": sorted(args.env),
+        "cpus": os.cpu_count(),  # Driver, app, fakes and Postgres share the machine
+    }
+    result = {"config": config, "events": report, "jobs": jobs, "upstream_calls": upstream_calls}
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + "\n")
+
+    if not args.baseline:
+        return 0
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(
+            json.dumps({"config": config, "events": report, "jobs": jobs}, indent=2) + "\n"
+        )
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline["config"] != config:
+        print(f"warning: baseline was recorded with a different config: {baseline['config']}")
+    problems = compare(report, baseline["events"], args.tolerance)
+    problems += compare_jobs(jobs, baseline["jobs"], args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    if not problems:
+        print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%})")
+    return 1 if problems else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=float, default=20.0, help="Webhooks per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds first")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix("lead.created=6,quote.accepted=2,conversation.completed=2"),
+        help="Relative weight per event",
+    )
+    parser.add_argument("--database-url", help="Postgres to use (default: BENCH_DATABASE_URL or pgserver)")
+    parser.add_argument("--keep-data", action="store_true", help="Leave seeded rows in the database")
+    parser.add_argument("--env", action="append", default=[], help="Extra app setting, KEY=VALUE")
+    parser.add_argument("--output", help="Write the full report as JSON")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against (or write)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,7 @@ CREATE TABLE IF NOT EXISTS leads (
     -- Scoring
     interest_level INTEGER CHECK (interest_level >= 1 AND interest_level <= 10),
     lead_score INTEGER CHECK (lead_score >= 0 AND lead_score <= 100),
+    scored_at TIMESTAMP WITH TIME ZONE, -- Set by the final score; provisional scores never overwrite it
 
     -- Status
     status VARCHAR(50) DEFAULT 'new' CHECK (status IN (
@@ -56,6 +57,9 @@ CREATE INDEX IF NOT EXISTS idx_leads_status ON leads(status);
 CREATE INDEX IF NOT EXISTS idx_leads_created_at ON leads(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_leads_lead_score ON leads(lead_score DESC);
 
+-- Columns added after the first release
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS scored_at TIMESTAMP WITH TIME ZONE;
+
 -- =============================================================================
 -- CONVERSATIONS TABLE
 -- =============================================================================
@@ -123,12 +127,65 @@ CREATE INDEX IF NOT EXISTS idx_quotes_lead_id ON quotes(lead_id);
 CREATE INDEX IF NOT EXISTS idx_quotes_status ON quotes(status);
 CREATE INDEX IF NOT EXISTS idx_quotes_created_at ON quotes(created_at DESC);
 
+-- =============================================================================
+-- WEBHOOK DELIVERIES TABLE (idempotency)
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS webhook_deliveries (
+    idempotency_key VARCHAR(160) PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    response JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_expires_at ON webhook_deliveries(expires_at);
+
+-- =============================================================================
+-- LEAD SCORE CACHE TABLE
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS lead_score_cache (
+    fingerprint CHAR(64) PRIMARY KEY, -- SHA-256 of normalized prompt inputs, model and prompt version
+    scores JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_lead_score_cache_expires_at ON lead_score_cache(expires_at);
+
+-- =============================================================================
+-- OUTBOX TABLE
+-- =============================================================================
+-- Outbound emails and Slack messages, written in the same transaction as the
+-- status change that triggers them and delivered by the outbox dispatcher.
+
+CREATE TABLE IF NOT EXISTS outbox (
+    id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL, -- email, slack
+    name TEXT NOT NULL DEFAULT '', -- e.g. team_email; lets pending messages be withdrawn
+    lead_id TEXT,
+    payload JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'sent', 'dead', 'withdrawn')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(), -- next attempt or lease expiry
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    sent_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox(available_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_outbox_lead_pending ON outbox(lead_id) WHERE status = 'pending';
+
 -- =============================================================================
 -- HELPFUL VIEWS
 -- =============================================================================
 
 -- View: Qualified leads ready for quotes
-CREATE OR REPLACE VIEW qualified_leads AS
+-- (dropped first: l.* changes shape whenever leads gains a column)
+DROP VIEW IF EXISTS qualified_leads;
+CREATE VIEW qualified_leads AS
 SELECT
     l.*,
     c.id as conversation_id,
@@ -0,0 +1,40 @@
+"""
+Shared fixtures. Tests that need Postgres run against TEST_DATABASE_URL and
+are skipped without it; each one gets its own schema, dropped afterwards.
+"""
+
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+
+
+@pytest.fixture
+def database_url() -> str:
+    url = os.environ.get("TEST_DATABASE_URL", "")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    return url
+
+
+@pytest_asyncio.fixture
+async def schema_url(database_url: str):
+    """Connection string whose search_path is a fresh schema holding schema.sql."""
+    import psycopg
+    from psycopg.conninfo import make_conninfo
+
+    from benchmarks.loadtest import apply_schema
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    url = make_conninfo(database_url, options=f"-csearch_path={schema},public")
+
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+    try:
+        with psycopg.connect(url, autocommit=True) as conn:
+            apply_schema(conn)
+        yield url
+    finally:
+        with psycopg.connect(database_url, autocommit=True) as conn:
+            conn.execute(f"DROP SCHEMA {schema} CASCADE")
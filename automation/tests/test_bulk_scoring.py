@@ -0,0 +1,65 @@
+"""Columnar scoring must agree with LeadProcessor._rule_based_score row for row."""
+
+import itertools
+from datetime import datetime, timezone
+
+from app.models.lead import Lead
+from app.services.bulk_scoring import score_leads
+from app.services.lead_processor import LeadProcessor
+
+# Edge cases for the text columns: empty, NUL-only and NUL-padded strings,
+# keywords that only match after lowercasing, and multi-character case mappings
+TEXTS = [
+    None,
+    "",
+    "\x00",
+    "\x00\x00",
+    "ASAP\x00",
+    "\x00now",
+    "Flexible",
+    "$50K",
+    "head of ops\x00",
+    "İ",
+    "Director",
+    "whenever",
+]
+
+
+def _leads() -> list[Lead]:
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    leads = []
+    for i, (budget, urgency, role) in enumerate(itertools.product(TEXTS, repeat=3)):
+        leads.append(
+            Lead(
+                id=str(i),
+                created_at=created,
+                budget_range=budget,
+                urgency=urgency,
+                timeline=TEXTS[i % len(TEXTS)],
+                role=role,
+                problem_text=(budget or "") * (i % 7),
+                interest_level=i % 11 or None,
+                tools_used=["x"] * (i % 5),
+            )
+        )
+    return leads
+
+
+def test_bulk_scores_match_rule_based_scorer():
+    leads = _leads()
+    processor = LeadProcessor()
+
+    expected = [processor._rule_based_score(lead) for lead in leads]
+    actual = score_leads(leads)
+
+    assert len(actual) == len(expected)
+    for lead, got, want in zip(leads, actual, expected):
+        assert got == want, lead
+
+
+def test_nul_only_field_is_not_treated_as_empty():
+    lead = Lead(id="1", created_at=datetime.now(timezone.utc), budget_range="\x00")
+
+    (score,) = score_leads([lead])
+
+    assert score.budget_clarity == LeadProcessor()._rule_based_score(lead).budget_clarity == 5
@@ -0,0 +1,114 @@
+"""AsyncConnectionPool: size bound, waiting, timeouts and recycling."""
+
+import asyncio
+
+import pytest
+
+from app.utils.db import AsyncConnectionPool, PoolTimeout
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_checkouts_never_exceed_max_size(database_url):
+    pool = AsyncConnectionPool(database_url, min_size=1, max_size=3, timeout=10.0)
+    await pool.open()
+    in_use = 0
+    peak = 0
+
+    async def query():
+        nonlocal in_use, peak
+        async with pool.connection() as conn:
+            in_use += 1
+            peak = max(peak, in_use)
+            await conn.execute("SELECT pg_sleep(0.02)")
+            in_use -= 1
+
+    try:
+        await asyncio.gather(*(query() for _ in range(20)))
+        assert peak == 3
+        assert pool.stats()["size"] <= 3
+        assert pool.checkouts == 20
+    finally:
+        await pool.close()
+
+
+async def test_waiter_gets_released_connection(database_url):
+    pool = AsyncConnectionPool(database_url, min_size=1, max_size=1, timeout=5.0)
+    await pool.open()
+    try:
+        held = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.05)
+        assert pool.stats()["waiting"] == 1
+
+        await pool.release(held)
+        assert await asyncio.wait_for(waiter, 1.0) is held
+        await pool.release(held)
+    finally:
+        await pool.close()
+
+
+async def test_exhausted_pool_times_out(database_url):
+    pool = AsyncConnectionPool(database_url, min_size=1, max_size=1, timeout=0.1)
+    await pool.open()
+    try:
+        held = await pool.acquire()
+        with pytest.raises(PoolTimeout):
+            await pool.acquire()
+        assert pool.timeouts == 1
+        assert pool.stats()["waiting"] == 0
+        await pool.release(held)
+    finally:
+        await pool.close()
+
+
+async def test_connection_recycled_after_max_uses(database_url):
+    pool = AsyncConnectionPool(database_url, min_size=1, max_size=1, max_uses=2)
+    await pool.open()
+    try:
+        first = await pool.acquire()
+        await pool.release(first)
+        assert await pool.acquire() is first
+        await pool.release(first)
+
+        assert first.closed
+        assert pool.recycled == 1
+        second = await pool.acquire()
+        assert second is not first
+        await pool.release(second)
+    finally:
+        await pool.close()
+
+
+async def test_closed_connection_frees_its_slot(database_url):
+    pool = AsyncConnectionPool(database_url, min_size=1, max_size=1, timeout=1.0)
+    await pool.open()
+    try:
+        conn = await pool.acquire()
+        await conn.close()
+        await pool.release(conn)
+        assert pool.stats()["size"] == 0
+
+        replacement = await pool.acquire()
+        assert replacement is not conn
+        await replacement.execute("SELECT 1")
+        await pool.release(replacement)
+    finally:
+        await pool.close()
+
+
+async def test_open_transaction_rolled_back_on_release(database_url):
+    pool = AsyncConnectionPool(database_url, min_size=1, max_size=1)
+    await pool.open()
+    try:
+        conn = await pool.acquire()
+        await conn.execute("BEGIN")
+        await conn.execute("CREATE TEMP TABLE pool_probe (id int)")
+        await pool.release(conn)
+
+        conn = await pool.acquire()
+        rows = await (await conn.execute("SELECT to_regclass('pg_temp.pool_probe') AS t")).fetchall()
+        assert rows[0]["t"] is None
+        await pool.release(conn)
+    finally:
+        await pool.close()
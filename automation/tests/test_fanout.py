@@ -0,0 +1,77 @@
+"""stream_batches: batching, bounded concurrency, ordering and cancellation."""
+
+import asyncio
+import random
+
+import pytest
+
+from app.utils.fanout import stream_batches
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _collect(stream) -> list:
+    return [item async for item in stream]
+
+
+async def test_results_in_input_order_with_bounded_concurrency():
+    running = 0
+    peak = 0
+    sizes = []
+
+    async def run(batch):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        sizes.append(len(batch))
+        await asyncio.sleep(random.uniform(0, 0.01))
+        running -= 1
+        return [item * 10 for item in batch]
+
+    results = await _collect(stream_batches(range(23), run, batch_size=5, concurrency=3))
+
+    assert results == [i * 10 for i in range(23)]
+    assert sorted(sizes) == [3, 5, 5, 5, 5]
+    assert peak == 3
+
+
+async def test_async_source_is_pulled_lazily():
+    pulled = 0
+
+    async def source():
+        nonlocal pulled
+        for i in range(1000):
+            pulled += 1
+            yield i
+
+    async def run(batch):
+        return batch
+
+    stream = stream_batches(source(), run, batch_size=10, concurrency=2)
+    first = await stream.__anext__()
+    await stream.aclose()
+
+    assert first == 0
+    assert pulled <= 30
+
+
+async def test_stopping_early_cancels_running_batches():
+    cancelled = 0
+
+    async def run(batch):
+        nonlocal cancelled
+        if batch[0] == 0:
+            return batch
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return batch
+
+    stream = stream_batches(range(20), run, batch_size=5, concurrency=4)
+    assert await stream.__anext__() == 0
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+    assert cancelled == 3
@@ -0,0 +1,53 @@
+"""IdempotencyStore: held responses for queued jobs and claim hand-off."""
+
+import asyncio
+
+import pytest
+
+from app.utils.idempotency import IdempotencyStore
+
+pytestmark = pytest.mark.asyncio
+
+ACCEPTED = {"success": True, "message": "Accepted for processing", "job_id": "j1"}
+
+
+async def test_held_response_survives_memory_eviction():
+    store = IdempotencyStore(memory_size=1)
+    assert await store.claim("a") is None
+    store.hold("a", 202, ACCEPTED)
+
+    # Another delivery pushes the held record out of the LRU
+    assert await store.claim("b") is None
+    await store.complete("b", 200, {"success": True})
+
+    assert await store.claim("a") == {"status_code": 202, "body": ACCEPTED}
+
+
+async def test_failed_job_lets_the_retry_run():
+    store = IdempotencyStore()
+    assert await store.claim("a") is None
+    store.hold("a", 202, ACCEPTED)
+
+    await store.settle("a", succeeded=False)
+
+    assert await store.claim("a") is None
+    assert store.stats()["held"] == 0
+
+
+async def test_cancelled_owner_releases_waiters(monkeypatch):
+    store = IdempotencyStore()
+    loading = asyncio.Event()
+
+    async def slow_load(key):
+        loading.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(store, "_load", slow_load)
+    owner = asyncio.create_task(store.claim("a"))
+    await loading.wait()
+    waiter = asyncio.create_task(store.claim("a"))
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    monkeypatch.setattr(store, "_load", lambda key: asyncio.sleep(0))
+    assert await asyncio.wait_for(waiter, 1.0) is None  # The waiter owns the delivery now
@@ -0,0 +1,136 @@
+"""JobQueue: bounded workers, backpressure, failures and draining."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+
+from app.models.job import JobStatus
+from app.services.job_queue import JobQueue, JobQueueFull
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def queue():
+    queue = JobQueue(workers=2, max_size=10, job_timeout=1.0)
+    await queue.start()
+    yield queue
+    await queue.stop(drain_timeout=1.0)
+
+
+async def test_workers_bound_concurrency(queue):
+    running = 0
+    peak = 0
+
+    async def handler(data):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    jobs = [queue.submit("test", handler, {}) for _ in range(8)]
+    await queue.stop()
+
+    assert peak == 2
+    assert all(job.status == JobStatus.SUCCEEDED for job in jobs)
+    assert queue.stats()["succeeded"] == 8
+
+
+async def test_full_queue_rejects_and_counts():
+    queue = JobQueue(workers=1, max_size=1)
+    await queue.start()
+    release = asyncio.Event()
+    rejected_before = REGISTRY.get_sample_value("jobs_rejected_total") or 0.0
+
+    async def blocked(data):
+        await release.wait()
+
+    try:
+        queue.submit("test", blocked, {})
+        await asyncio.sleep(0)  # The worker takes the first job off the queue
+        queue.submit("test", blocked, {})
+        assert REGISTRY.get_sample_value("job_queue_depth") == 1
+
+        with pytest.raises(JobQueueFull):
+            queue.submit("test", blocked, {})
+        assert queue.rejected == 1
+        assert REGISTRY.get_sample_value("jobs_rejected_total") == rejected_before + 1
+    finally:
+        release.set()
+        await queue.stop()
+
+
+async def test_failed_job_reports_generic_error_and_calls_back(queue):
+    finished = asyncio.Event()
+    seen = []
+
+    async def handler(data):
+        raise RuntimeError("password=hunter2")
+
+    async def on_done(job):
+        seen.append(job.status)
+        finished.set()
+
+    job = queue.submit("test", handler, {}, on_done)
+    await asyncio.wait_for(finished.wait(), 1.0)
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "Handler failed"
+    assert seen == [JobStatus.FAILED]
+
+
+async def test_job_timeout(queue):
+    queue.job_timeout = 0.05
+
+    async def handler(data):
+        await asyncio.sleep(1)
+
+    job = queue.submit("test", handler, {})
+    await queue.stop()
+
+    assert job.status == JobStatus.FAILED
+    assert job.error.startswith("Timed out")
+
+
+async def test_callback_errors_do_not_stop_worker(queue):
+    async def handler(data):
+        pass
+
+    async def broken(job):
+        raise RuntimeError("callback failed")
+
+    first = queue.submit("test", handler, {}, broken)
+    second = queue.submit("test", handler, {}, broken)
+    third = queue.submit("test", handler, {})
+    await queue.stop()
+
+    assert [j.status for j in (first, second, third)] == [JobStatus.SUCCEEDED] * 3
+
+
+async def test_submit_requires_started_queue():
+    with pytest.raises(RuntimeError):
+        JobQueue().submit("test", lambda data: None, {})
+
+
+async def test_stop_fails_unstarted_jobs_and_calls_back():
+    queue = JobQueue(workers=1, max_size=10)
+    await queue.start()
+    done = []
+
+    async def slow(data):
+        await asyncio.sleep(10)
+
+    async def on_done(job):
+        done.append((job.id, job.status))
+
+    running = queue.submit("test", slow, {}, on_done)
+    await asyncio.sleep(0)
+    queued = queue.submit("test", slow, {}, on_done)
+    await queue.stop(drain_timeout=0.05)
+
+    assert queued.status == JobStatus.FAILED
+    assert queued.error == "Not started before shutdown"
+    assert sorted(done) == sorted([(running.id, JobStatus.FAILED), (queued.id, JobStatus.FAILED)])
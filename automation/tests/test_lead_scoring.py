@@ -0,0 +1,137 @@
+"""LeadProcessor.score_lead: latency budget, provisional scores and deferred re-scoring."""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+
+from app.api import webhooks
+from app.config import settings
+from app.models.lead import Lead, LeadScore
+from app.services import outbox
+from app.services.lead_processor import LeadProcessor
+from app.services.outbox import OutboxMessage, enqueue
+from app.utils import db as db_module
+from app.utils.db import DatabaseClient
+
+pytestmark = pytest.mark.asyncio
+
+HIGH = LeadScore(
+    total=80, interest_level=20, budget_clarity=15, urgency=10,
+    problem_clarity=15, decision_authority=10, tech_readiness=10,
+)
+LOW = LeadScore(
+    total=20, interest_level=5, budget_clarity=5, urgency=0,
+    problem_clarity=5, decision_authority=5, tech_readiness=0,
+)
+
+
+def make_lead() -> Lead:
+    return Lead(
+        id=str(uuid.uuid4()),
+        name="Ada",
+        email="ada@example.com",
+        company="Analytical Engines",
+        problem_text=f"Invoices are re-keyed by hand every week ({uuid.uuid4()})",
+        created_at=datetime.utcnow(),
+    )
+
+
+@pytest.fixture
+def ai_release(monkeypatch) -> asyncio.Event:
+    """Held until set: the model answers with LOW while rules say HIGH."""
+    release = asyncio.Event()
+
+    async def slow_ai(self, lead, cache_key):
+        await release.wait()
+        return LOW.model_copy()
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(LeadProcessor, "_ai_score", slow_ai)
+    monkeypatch.setattr(LeadProcessor, "_rule_based_score", lambda self, lead: HIGH.model_copy())
+    return release
+
+
+async def test_provisional_score_returned_within_budget(ai_release):
+    processor = LeadProcessor()
+    processor.db = None
+    rescored = []
+
+    async def on_rescore(lead, provisional, score):
+        rescored.append((provisional.total, score.total))
+
+    started = time.perf_counter()
+    score = await processor.score_lead(make_lead(), budget_ms=50, on_rescore=on_rescore)
+
+    assert time.perf_counter() - started < 0.5
+    assert score.provisional
+    assert score.total == HIGH.total
+    assert rescored == []
+
+    ai_release.set()
+    await processor.drain(timeout=1.0)
+    assert rescored == [(HIGH.total, LOW.total)]
+
+
+async def test_ai_score_within_budget_is_final(ai_release):
+    processor = LeadProcessor()
+    processor.db = None
+    ai_release.set()
+
+    score = await processor.score_lead(make_lead(), budget_ms=1000)
+
+    assert not score.provisional
+    assert score.total == LOW.total
+
+
+@pytest_asyncio.fixture
+async def db(schema_url, monkeypatch):
+    client = DatabaseClient(schema_url, use_pool=True)
+    monkeypatch.setattr(settings, "database_url", schema_url)
+    monkeypatch.setattr(settings, "outbox_enabled", True)
+    monkeypatch.setattr(db_module, "_db_client", client)
+    yield client
+    await client.aclose()
+
+
+async def test_late_ai_downgrade_wins_and_withdraws_notifications(db, ai_release):
+    processor = LeadProcessor()
+    lead = make_lead()
+    await db.execute(
+        "INSERT INTO leads (id, name, email, company, problem_text) VALUES (%s, %s, %s, %s, %s)",
+        (lead.id, lead.name, lead.email, lead.company, lead.problem_text),
+    )
+
+    provisional = await processor.score_lead(
+        lead, budget_ms=20, on_rescore=webhooks._handle_lead_rescored
+    )
+    assert provisional.provisional
+
+    # What the webhook commits for a (provisionally) high lead
+    async with db.transaction() as tx:
+        await processor.route_lead(lead, provisional, tx=tx)
+        await enqueue(tx, OutboxMessage(outbox.SLACK, {}, name="slack", lead_id=lead.id))
+        await enqueue(tx, OutboxMessage(outbox.EMAIL, {}, name="team_email", lead_id=lead.id))
+        await enqueue(tx, OutboxMessage(outbox.EMAIL, {}, name="welcome_email", lead_id=lead.id))
+
+    ai_release.set()
+    await processor.drain(timeout=5.0)
+
+    row = await db.execute_one("SELECT lead_score, scored_at FROM leads WHERE id = %s", (lead.id,))
+    assert row["lead_score"] == LOW.total
+    assert row["scored_at"] is not None
+
+    rows = await db.execute("SELECT name, status FROM outbox ORDER BY id")
+    assert [(r["name"], r["status"]) for r in rows] == [
+        ("slack", "withdrawn"),
+        ("team_email", "withdrawn"),
+        ("welcome_email", "pending"),
+    ]
+
+    # A provisional write landing after the AI score leaves it alone
+    await processor.route_lead(lead, provisional)
+    row = await db.execute_one("SELECT lead_score FROM leads WHERE id = %s", (lead.id,))
+    assert row["lead_score"] == LOW.total
@@ -0,0 +1,166 @@
+"""OpenAIGuard: token buckets, circuit breaker and token settlement."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import openai_guard as guard_module
+from app.services.openai_guard import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenError,
+    OpenAIGuard,
+    RateLimitExceeded,
+    TokenBucket,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(guard_module, "time", clock)
+    return clock
+
+
+def completion(total_tokens: int):
+    return SimpleNamespace(
+        usage=SimpleNamespace(total_tokens=total_tokens, prompt_tokens=total_tokens, completion_tokens=0)
+    )
+
+
+async def failing():
+    raise RuntimeError("upstream error")
+
+
+async def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate_per_minute=60)  # One token per second
+    bucket.consume(60)
+    assert bucket.delay_for(1) == pytest.approx(1.0)
+
+    clock.now += 0.5
+    assert bucket.delay_for(1) == pytest.approx(0.5)
+
+    clock.now += 10
+    assert bucket.available == pytest.approx(10.5)
+
+    clock.now += 3600
+    assert bucket.available == 60
+
+
+async def test_bucket_debt_delays_later_callers(clock):
+    bucket = TokenBucket(rate_per_minute=60)
+    bucket.consume(70)  # Actual usage above the balance
+    assert bucket.available == pytest.approx(-10)
+    assert bucket.delay_for(5) == pytest.approx(15.0)
+
+
+async def test_guard_waits_for_capacity_within_budget():
+    guard = OpenAIGuard(requests_per_minute=0, tokens_per_minute=600)  # 10 tokens per second
+
+    async def call():
+        return None
+
+    await guard.run(call, estimated_tokens=600)
+
+    with pytest.raises(RateLimitExceeded):
+        await guard.run(call, estimated_tokens=5, max_wait=0.1)
+    assert guard.rejected_rate == 1
+
+    started = time.perf_counter()
+    await guard.run(call, estimated_tokens=2, max_wait=1.0)
+    assert 0.1 <= time.perf_counter() - started < 0.6
+
+
+async def test_breaker_opens_after_consecutive_failures():
+    guard = OpenAIGuard(failure_threshold=3)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("upstream error")
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await guard.run(call)
+
+    with pytest.raises(CircuitOpenError):
+        await guard.run(call)
+    assert calls == 3
+    assert guard.breaker.state == BreakerState.OPEN
+    assert guard.rejected_open == 1
+
+
+async def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+
+
+async def test_half_open_lets_one_trial_through(clock):
+    guard = OpenAIGuard(failure_threshold=1, reset_timeout=30.0)
+    with pytest.raises(RuntimeError):
+        await guard.run(failing)
+
+    clock.now += 30
+    assert guard.breaker.state == BreakerState.HALF_OPEN
+
+    release = asyncio.Event()
+
+    async def trial():
+        await release.wait()
+        return completion(10)
+
+    first = asyncio.create_task(guard.run(trial))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await guard.run(trial)
+
+    release.set()
+    await first
+    assert guard.breaker.state == BreakerState.CLOSED
+
+
+async def test_failed_trial_reopens_the_breaker(clock):
+    guard = OpenAIGuard(failure_threshold=1, reset_timeout=30.0)
+    with pytest.raises(RuntimeError):
+        await guard.run(failing)
+
+    clock.now += 30
+    with pytest.raises(RuntimeError):
+        await guard.run(failing)
+
+    assert guard.breaker.state == BreakerState.OPEN
+    assert guard.breaker.times_opened == 2
+
+
+async def test_tokens_settled_against_reported_usage(clock):
+    guard = OpenAIGuard(requests_per_minute=0, tokens_per_minute=1000)
+
+    async def call():
+        return completion(300)
+
+    await guard.run(call, estimated_tokens=100)
+    assert guard.tokens.available == pytest.approx(700)
+
+    async def heavy():
+        return completion(1500)
+
+    await guard.run(heavy, estimated_tokens=100)
+    assert guard.tokens.available == pytest.approx(-800)
+    with pytest.raises(RateLimitExceeded):
+        await guard.run(call, estimated_tokens=10, max_wait=1.0)
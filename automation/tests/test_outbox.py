@@ -0,0 +1,183 @@
+"""Outbox: exclusive claims, retries, dead letters, withdrawal and worker resilience."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.config import settings
+from app.services import outbox
+from app.services.outbox import OutboxDispatcher, OutboxMessage, enqueue, withdraw
+from app.utils import db as db_module
+from app.utils.db import DatabaseClient
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def db(schema_url, monkeypatch):
+    client = DatabaseClient(schema_url, use_pool=True)
+    monkeypatch.setattr(settings, "database_url", schema_url)
+    monkeypatch.setattr(settings, "outbox_enabled", True)
+    monkeypatch.setattr(db_module, "_db_client", client)
+    yield client
+    await client.aclose()
+
+
+def dispatcher(**kwargs) -> OutboxDispatcher:
+    options = {"poll_interval": 0.05, "backoff_base": 0.0, "backoff_max": 0.0}
+    return OutboxDispatcher(**{**options, **kwargs})
+
+
+async def add(db, count: int, kind: str = outbox.SLACK, **fields) -> None:
+    async with db.transaction() as tx:
+        for i in range(count):
+            await enqueue(tx, OutboxMessage(kind=kind, payload={"n": i}, **fields))
+
+
+async def statuses(db) -> dict[str, int]:
+    rows = await db.execute("SELECT status, COUNT(*) AS n FROM outbox GROUP BY status")
+    return {row["status"]: row["n"] for row in rows}
+
+
+async def wait_for_statuses(db, expected: dict[str, int], timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while (current := await statuses(db)) != expected:
+        assert asyncio.get_running_loop().time() < deadline, current
+        await asyncio.sleep(0.02)
+
+
+async def test_concurrent_claims_never_overlap(db):
+    await add(db, 50)
+    claimer = dispatcher(batch_size=10)
+
+    batches = await asyncio.gather(*(claimer.claim() for _ in range(8)))
+    ids = [row["id"] for batch in batches for row in batch]
+
+    assert len(ids) == 50
+    assert len(set(ids)) == 50
+    assert await claimer.claim() == []  # All leased
+
+
+async def test_workers_deliver_each_message_once(db):
+    await add(db, 30)
+    delivered = []
+    worker = dispatcher(concurrency=3, batch_size=4)
+
+    async def handler(payload):
+        await asyncio.sleep(0.01)
+        delivered.append(payload["n"])
+
+    worker.register(outbox.SLACK, handler)
+    await worker.start()
+    try:
+        await wait_for_statuses(db, {"sent": 30})
+    finally:
+        await worker.stop()
+
+    assert sorted(delivered) == list(range(30))
+
+
+async def test_failures_retry_then_dead_letter(db):
+    await add(db, 1)
+    worker = dispatcher(max_attempts=3)
+    attempts = 0
+
+    async def handler(payload):
+        nonlocal attempts
+        attempts += 1
+        raise RuntimeError("upstream down")
+
+    worker.register(outbox.SLACK, handler)
+    await worker.start()
+    try:
+        await wait_for_statuses(db, {"dead": 1})
+    finally:
+        await worker.stop()
+
+    assert attempts == 3
+    assert worker.retried == 2
+    row = await db.execute_one("SELECT attempts, last_error FROM outbox")
+    assert row["attempts"] == 3
+    assert "upstream down" in row["last_error"]
+
+
+async def test_non_retryable_error_dead_letters_at_once(db):
+    await add(db, 1)
+    worker = dispatcher()
+
+    class Rejected(Exception):
+        retryable = False
+
+    async def handler(payload):
+        raise Rejected("bad address")
+
+    worker.register(outbox.SLACK, handler)
+    await worker.start()
+    try:
+        await wait_for_statuses(db, {"dead": 1})
+    finally:
+        await worker.stop()
+    assert worker.retried == 0
+
+
+async def test_worker_survives_bookkeeping_errors(db, monkeypatch):
+    await add(db, 2)
+    worker = dispatcher(batch_size=1, lease_seconds=0.1)
+    delivered = []
+
+    async def handler(payload):
+        delivered.append(payload["n"])
+
+    real_execute = db.execute
+    failures = 1
+
+    async def flaky_execute(query, params=None):
+        nonlocal failures
+        if "status = 'sent'" in query and failures:
+            failures -= 1
+            raise ConnectionError("connection lost")
+        return await real_execute(query, params)
+
+    monkeypatch.setattr(db, "execute", flaky_execute)
+    worker.register(outbox.SLACK, handler)
+    await worker.start()
+    try:
+        await wait_for_statuses(db, {"sent": 2})
+        assert all(not task.done() for task in worker._workers)
+    finally:
+        await worker.stop()
+
+    # The row whose outcome was lost is delivered again after its lease
+    assert sorted(delivered) in ([0, 0, 1], [0, 1, 1])
+
+
+async def test_register_extends_lease_past_handler_limit():
+    worker = dispatcher(lease_seconds=60.0)
+
+    async def handler(payload):
+        pass
+
+    worker.register(outbox.SLACK, handler, max_duration=120.0)
+    assert worker.lease_seconds == 120.0 + outbox.LEASE_MARGIN
+
+    worker.register(outbox.EMAIL, handler, max_duration=5.0)
+    assert worker.lease_seconds == 120.0 + outbox.LEASE_MARGIN
+
+
+async def test_withdraw_only_touches_pending_named_messages(db):
+    await add(db, 1, name="slack", lead_id="lead-1")
+    await add(db, 1, kind=outbox.EMAIL, name="team_email", lead_id="lead-1")
+    await add(db, 1, kind=outbox.EMAIL, name="customer_email", lead_id="lead-1")
+    await add(db, 1, name="slack", lead_id="lead-2")
+    await db.execute("UPDATE outbox SET status = 'sent' WHERE name = 'team_email'")
+
+    assert await withdraw("lead-1", ["slack", "team_email"]) == 1
+
+    rows = await db.execute("SELECT name, lead_id, status FROM outbox ORDER BY id")
+    assert [(r["name"], r["lead_id"], r["status"]) for r in rows] == [
+        ("slack", "lead-1", "withdrawn"),
+        ("team_email", "lead-1", "sent"),
+        ("customer_email", "lead-1", "pending"),
+        ("slack", "lead-2", "pending"),
+    ]
@@ -0,0 +1,96 @@
+"""PdfCache: disk LRU eviction, version replacement and atomic writes."""
+
+import asyncio
+import os
+
+import pytest
+
+from app.services.pdf_cache import PdfCache
+
+pytestmark = pytest.mark.asyncio
+
+
+def files(directory) -> list[str]:
+    return sorted(path.name for path in directory.iterdir())
+
+
+async def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=25, memory_items=1)
+    await cache.set("q1", "k", b"1" * 10)
+    await cache.set("q2", "k", b"2" * 10)
+
+    # Served from disk (q1 left the one-item memory tier), so it becomes recent
+    assert await cache.get("q1", "k") == b"1" * 10
+    assert cache.disk_hits == 1
+
+    await cache.set("q3", "k", b"3" * 10)
+
+    assert files(tmp_path) == ["q1.k.pdf", "q3.k.pdf"]
+    assert cache.evictions == 1
+    assert cache.stats()["disk_bytes"] == 20
+    assert await cache.get("q2", "k") is None
+
+
+async def test_oversized_render_stays_in_memory_only(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=5)
+    await cache.set("q1", "k", b"x" * 10)
+
+    assert await cache.get("q1", "k") == b"x" * 10
+    assert not tmp_path.exists() or files(tmp_path) == []
+
+
+async def test_lru_order_survives_restart(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=25, memory_items=1)
+    await cache.set("q1", "k", b"1" * 10)
+    await cache.set("q2", "k", b"2" * 10)
+    os.utime(tmp_path / "q1.k.pdf", (1, 1))  # Oldest by mtime
+
+    restarted = PdfCache(str(tmp_path), max_bytes=25, memory_items=1)
+    await restarted.set("q3", "k", b"3" * 10)
+
+    assert files(tmp_path) == ["q2.k.pdf", "q3.k.pdf"]
+
+
+async def test_set_replaces_older_versions_in_both_tiers(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=1000, memory_items=4)
+    await cache.set("q1", "v1", b"old")
+    await cache.set("q2", "v1", b"other")
+    await cache.set("q1", "v2", b"new")
+
+    assert files(tmp_path) == ["q1.v2.pdf", "q2.v1.pdf"]
+    assert ("q1", "v1") not in cache.memory.keys()
+    assert await cache.get("q1", "v1") is None
+    assert await cache.get("q1", "v2") == b"new"
+    assert await cache.get("q2", "v1") == b"other"
+    assert cache.stats()["disk_bytes"] == len(b"new") + len(b"other")
+
+
+async def test_concurrent_writers_use_separate_temp_files(tmp_path, monkeypatch):
+    cache = PdfCache(str(tmp_path), max_bytes=1000)
+    temp_files = []
+    real_replace = os.replace
+
+    def recording_replace(src, dst):
+        temp_files.append(src)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", recording_replace)
+    await asyncio.gather(*(cache.set("q1", "k", b"%d" % i * 100) for i in range(5)))
+
+    assert len(set(temp_files)) == 5
+    assert files(tmp_path) == ["q1.k.pdf"]
+    assert len((tmp_path / "q1.k.pdf").read_bytes()) == 100
+
+
+async def test_failed_write_leaves_no_partial_file(tmp_path, monkeypatch):
+    cache = PdfCache(str(tmp_path), max_bytes=1000)
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    await cache.set("q1", "k", b"pdf")
+
+    assert files(tmp_path) == []
+    assert cache.stats()["disk_items"] == 0
+    assert await cache.get("q1", "k") == b"pdf"  # Still served from memory
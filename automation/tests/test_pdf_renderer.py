@@ -0,0 +1,41 @@
+"""PdfRenderer: pool recycling and stopping."""
+
+import asyncio
+
+import pytest
+
+from app.services.pdf_renderer import PdfRenderer, _ping
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_render_after_stop_raises_without_starting_a_pool():
+    renderer = PdfRenderer(workers=1)
+    await renderer.stop()
+
+    with pytest.raises(RuntimeError):
+        await renderer.render("<p>late</p>")
+    assert renderer._executor is None
+
+
+async def test_recycle_swaps_in_a_fresh_pool():
+    renderer = PdfRenderer(workers=1)
+    await renderer.start()
+    old = renderer._executor
+    try:
+        renderer._recycle(old, "test")
+        replacement = renderer._executor
+        assert replacement is not old
+        assert renderer.restarts == 1
+
+        # A second failure from the old pool leaves the replacement alone
+        renderer._recycle(old, "test")
+        assert renderer._executor is replacement
+        assert renderer.restarts == 1
+
+        with pytest.raises(RuntimeError):
+            old.submit(_ping)
+        loop = asyncio.get_running_loop()
+        assert await loop.run_in_executor(replacement, _ping)
+    finally:
+        await renderer.stop()